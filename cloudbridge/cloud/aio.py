@@ -0,0 +1,363 @@
+"""
+An asyncio facade over CloudBridge providers, for use from event loops.
+Requires Python 3.5 or later.
+
+Methods of the wrapped services, containers and resources return awaitables
+and run, without blocking the event loop, on a bounded pool of threads
+managed by the wrapper. Pageable services and containers support
+``async for``, and waiting for a resource to be ready only takes a thread
+while the resource is being refreshed. For example::
+
+    provider = CloudProviderFactory().create_provider(
+        ProviderList.AWS, {'cb_thread_safe': True})
+    aprovider = AsyncCloudProvider(provider)
+
+    inst = await aprovider.compute.instances.create(...)
+    await inst.wait_till_ready()
+    print(inst.id, await inst.aget('public_ips'))
+    async for bucket in aprovider.storage.buckets:
+        ...
+
+Other attributes are read on the event loop thread. Only ``id`` and ``name``
+are safe to read this way: reading other properties, such as the ``state``
+of a resource or the IPs of an instance, may make a request to the provider,
+so they should be read with ``aget()``.
+
+Providers should be created in thread-safe mode, as the pool threads use
+the provider at the same time.
+"""
+import asyncio
+import collections
+import copy
+import functools
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudbridge.cloud.base.resources import BaseObjectLifeCycleMixin
+from cloudbridge.cloud.interfaces.resources import BucketObject
+from cloudbridge.cloud.interfaces.resources import CloudResource
+from cloudbridge.cloud.interfaces.resources import PageableObjectMixin
+from cloudbridge.cloud.interfaces.resources import ResultList
+from cloudbridge.cloud.interfaces.services import CloudService
+
+import six
+
+log = logging.getLogger(__name__)
+
+# Not a builtin before Python 3.5, which this module requires
+StopAsyncIteration = getattr(six.moves.builtins, 'StopAsyncIteration', None)
+
+
+def _unwrap(value):
+    """
+    Return the CloudBridge objects wrapped by ``value``, so that they can be
+    passed on to the provider.
+    """
+    if isinstance(value, AsyncProxy):
+        return value.wrapped
+    if isinstance(value, (list, tuple)) and not isinstance(value, ResultList):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return dict((key, _unwrap(item)) for key, item in value.items())
+    return value
+
+
+def _then(loop, future, func):
+    """
+    Return a future that resolves to ``func(result)`` once ``future``
+    resolves, or fails as it does.
+    """
+    result = loop.create_future()
+
+    def done(f):
+        if result.done():
+            return
+        if f.cancelled():
+            result.cancel()
+        elif f.exception() is not None:
+            result.set_exception(f.exception())
+        else:
+            try:
+                result.set_result(func(f.result()))
+            except Exception as e:
+                result.set_exception(e)
+
+    future.add_done_callback(done)
+    return result
+
+
+class AsyncProxy(object):
+    """
+    Wraps a CloudBridge provider, service, container or resource. Methods
+    return awaitables, while other attributes are read on the event loop
+    thread and returned as they are, with any CloudBridge objects among them
+    wrapped in turn. Use :meth:`aget` to read attributes that may make a
+    request.
+    """
+
+    def __init__(self, aprovider, obj):
+        self._aprovider = aprovider
+        self._obj = obj
+
+    @property
+    def wrapped(self):
+        """
+        The wrapped CloudBridge object.
+        """
+        return self._obj
+
+    def aget(self, name):
+        """
+        Return an awaitable of the attribute ``name``, read on a pool thread.
+        """
+        return self._aprovider.run(getattr, self._obj, name)
+
+    def __getattr__(self, name):
+        value = getattr(self._obj, name)
+        if callable(value):
+            @functools.wraps(value)
+            def method(*args, **kwargs):
+                return self._aprovider.run(value, *args, **kwargs)
+            return method
+        return self._aprovider.wrap(value)
+
+    def __aiter__(self):
+        if not isinstance(self._obj, PageableObjectMixin):
+            raise TypeError("'{0}' object is not iterable".format(
+                type(self._obj).__name__))
+        return AsyncIterator(self._aprovider, lambda: iter(self._obj),
+                             self._aprovider.config.default_result_limit)
+
+    def __eq__(self, other):
+        return _unwrap(other) == self._obj
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __repr__(self):
+        return "<Async {0!r}>".format(self._obj)
+
+
+class AsyncResource(AsyncProxy):
+    """
+    Wraps a CloudBridge resource. Waiting for the resource to reach a state
+    only takes a pool thread while the resource is being refreshed.
+    """
+
+    def _polls(self, method):
+        """
+        Return whether the resource's ``method`` is the polling one of
+        :class:`.BaseObjectLifeCycleMixin`, rather than one that a provider
+        overrides, e.g., to use a waiter of its SDK.
+        """
+        return (isinstance(self._obj, BaseObjectLifeCycleMixin) and
+                six.get_unbound_function(getattr(type(self._obj), method)) is
+                six.get_unbound_function(
+                    getattr(BaseObjectLifeCycleMixin, method)))
+
+    def wait_for(self, target_states, terminal_states=None, timeout=None,
+                 interval=None):
+        if not self._polls('wait_for'):
+            return self._aprovider.run(self._obj.wait_for, target_states,
+                                       terminal_states, timeout, interval)
+        # pylint:disable=protected-access
+        return self._wait(self._obj._wait_steps(
+            target_states, terminal_states, timeout, interval))
+
+    def wait_till_ready(self, timeout=None, interval=None):
+        if not (self._polls('wait_till_ready') and self._obj.READY_STATES):
+            return self._aprovider.run(self._obj.wait_till_ready, timeout,
+                                       interval)
+        return self.wait_for(self._obj.READY_STATES,
+                             self._obj.READY_TERMINAL_STATES,
+                             timeout, interval)
+
+    def _wait(self, steps):
+        """
+        Sleep on the event loop for each of the ``steps`` of a wait. Steps
+        are taken on a pool thread, after refreshing the resource, as
+        reading its state may also make a request.
+        """
+        loop = self._aprovider.loop
+        result = loop.create_future()
+
+        def next_step(refresh):
+            if refresh:
+                self._obj.refresh()
+            return next(steps, None)
+
+        def step(future):
+            if result.done():
+                return
+            if future.cancelled():
+                result.cancel()
+            elif future.exception() is not None:
+                result.set_exception(future.exception())
+            elif future.result() is None:
+                result.set_result(True)
+            else:
+                loop.call_later(future.result(), poll, True)
+
+        def poll(refresh):
+            if not result.done():
+                self._aprovider.submit(next_step, refresh).add_done_callback(
+                    step)
+
+        poll(False)
+        return result
+
+
+class AsyncBucketObject(AsyncResource):
+    """
+    Wraps a CloudBridge bucket object, whose content can be streamed with
+    ``async for``.
+    """
+
+    def iter_content(self, chunk_size=None):
+        """
+        Return an asynchronous iterable of this object's content. Each chunk
+        is read on a pool thread.
+        """
+        return AsyncIterator(
+            self._aprovider,
+            lambda: iter(self._obj.iter_content(chunk_size)), 1, wrap=False)
+
+
+class AsyncIterator(object):
+    """
+    Iterates asynchronously over the blocking iterator returned by
+    ``make_iterator()``, fetching ``batch_size`` items at a time on a pool
+    thread.
+    """
+
+    def __init__(self, aprovider, make_iterator, batch_size, wrap=True):
+        self._aprovider = aprovider
+        self._make_iterator = make_iterator
+        self._iterator = None
+        self._batch_size = batch_size
+        self._wrap = wrap
+        self._batch = collections.deque()
+        self._exhausted = False
+
+    def _next_batch(self):
+        if self._iterator is None:
+            self._iterator = self._make_iterator()
+        batch = list(itertools.islice(self._iterator, self._batch_size))
+        if self._wrap:
+            batch = [self._aprovider.wrap(item) for item in batch]
+        return batch
+
+    def _pop(self, batch=None):
+        if batch is not None:
+            self._batch.extend(batch)
+            self._exhausted = len(batch) < self._batch_size
+        if not self._batch:
+            raise StopAsyncIteration()
+        return self._batch.popleft()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        loop = self._aprovider.loop
+        if self._batch or self._exhausted:
+            future = loop.create_future()
+            try:
+                future.set_result(self._pop())
+            except StopAsyncIteration as e:
+                future.set_exception(e)
+            return future
+        return _then(loop, self._aprovider.submit(self._next_batch),
+                     self._pop)
+
+
+class AsyncCloudProvider(AsyncProxy):
+    """
+    Wraps a CloudBridge provider for use from an asyncio event loop.
+
+    :type provider: :class:`.CloudProvider`
+    :param provider: The provider to wrap, which should be in thread-safe
+                     mode (see ``cb_thread_safe``).
+
+    :type max_workers: ``int``
+    :param max_workers: The number of threads on which provider calls run.
+                        Defaults to the provider's ``http_pool_size``, so
+                        that each thread can keep a connection alive.
+
+    :type loop: :class:`asyncio.AbstractEventLoop`
+    :param loop: The event loop to use. Defaults to the current event loop.
+    """
+
+    def __init__(self, provider, max_workers=None, loop=None):
+        super(AsyncCloudProvider, self).__init__(self, provider)
+        if max_workers is None:
+            max_workers = provider.config.http_pool_size
+        if max_workers > 1 and not provider.config.thread_safe:
+            log.warning("Provider %s is not in thread-safe mode, and its "
+                        "clients will be shared by %s threads",
+                        provider.name, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._loop = loop
+
+    @property
+    def loop(self):
+        return self._loop or asyncio.get_event_loop()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` on a pool thread, and return a future
+        of its result.
+        """
+        return self.loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    def run(self, func, *args, **kwargs):
+        """
+        Run ``func`` on a pool thread with any wrapped arguments unwrapped,
+        and return a future of its result, wrapped.
+        """
+        args = _unwrap(args)
+        kwargs = _unwrap(kwargs)
+        return self.submit(lambda: self.wrap(func(*args, **kwargs)))
+
+    def wrap(self, value):
+        """
+        Wrap the CloudBridge objects in ``value``.
+        """
+        if isinstance(value, AsyncProxy):
+            return value
+        if isinstance(value, BucketObject):
+            return AsyncBucketObject(self, value)
+        if isinstance(value, CloudResource):
+            return AsyncResource(self, value)
+        if isinstance(value, (CloudService, PageableObjectMixin)):
+            return AsyncProxy(self, value)
+        if isinstance(value, ResultList):
+            # Keep the paging attributes of the list
+            wrapped = copy.copy(value)
+            wrapped[:] = [self.wrap(item) for item in value]
+            return wrapped
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.wrap(item) for item in value)
+        return value
+
+    def close(self):
+        """
+        Stop the pool threads once they have finished their current calls.
+        """
+        self._executor.shutdown(wait=False)
+
+    def __aenter__(self):
+        future = self.loop.create_future()
+        future.set_result(self)
+        return future
+
+    def __aexit__(self, exc_type, exc, tb):
+        self.close()
+        future = self.loop.create_future()
+        future.set_result(False)
+        return future
@@ -0,0 +1,285 @@
+"""
+Caching helpers shared by provider implementations.
+"""
+import errno
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import cloudbridge.cloud.base.helpers as cb_helpers
+
+log = logging.getLogger(__name__)
+
+
+class TTLCache(object):
+    """
+    A minimal, thread-safe, in-memory key/value cache whose entries expire
+    ``ttl`` seconds after they were stored.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires is not None and expires < time.time():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+
+    def invalidate(self, key=None):
+        """
+        Drop a single entry or, if no ``key`` is given, the whole cache.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class ClientPool(object):
+    """
+    A thread-safe pool of clients keyed by, e.g., region name. A client is
+    created with ``factory(key)`` the first time it is requested, and
+    dropped once it has not been requested for ``idle_timeout`` seconds.
+
+    Clients for different keys are created in parallel, so ``factory`` must
+    be thread-safe, while each client is only created once.
+    """
+
+    def __init__(self, factory, idle_timeout=300):
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self._clients = {}
+        # Held while the client of a key is being created
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, now):
+        with self._lock:
+            for idle_key in [k for k, (used, _) in self._clients.items()
+                             if used + self.idle_timeout < now]:
+                log.debug("Dropping idle client for %s", idle_key)
+                del self._clients[idle_key]
+            entry = self._clients.get(key)
+            if entry:
+                self._clients[key] = (now, entry[1])
+                return entry[1], None
+            return None, self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key):
+        client, key_lock = self._lookup(key, time.time())
+        if key_lock is None:
+            return client
+        with key_lock:
+            # The client may have been created while waiting for the lock
+            client, _ = self._lookup(key, time.time())
+            if client is None:
+                client = self.factory(key)
+                with self._lock:
+                    self._clients[key] = (time.time(), client)
+            return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
+
+
+class ClientStore(object):
+    """
+    Lazily created clients, keyed by name. A client is created with
+    ``connect()`` the first time it is requested. If ``per_thread`` is set,
+    each thread gets clients of its own, as most SDK clients must not be
+    shared across threads.
+    """
+
+    def __init__(self, per_thread=False):
+        self.per_thread = per_thread
+        self._shared = {}
+        self._local = threading.local()
+        # Reentrant, as creating a client may require another one (e.g., a
+        # session)
+        self._lock = threading.RLock()
+
+    def _clients(self):
+        if not self.per_thread:
+            return self._shared
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = self._local.clients = {}
+        return clients
+
+    def get(self, name, connect):
+        clients = self._clients()
+        client = clients.get(name)
+        if client is None:
+            if self.per_thread:
+                client = clients[name] = connect()
+            else:
+                with self._lock:
+                    client = clients.get(name)
+                    if client is None:
+                        client = clients[name] = connect()
+        return client
+
+    def clear(self):
+        """
+        Drop the shared clients or, if ``per_thread`` is set, those of the
+        calling thread.
+        """
+        with self._lock:
+            self._clients().clear()
+
+
+class MetadataCache(object):
+    """
+    A cache for provider metadata documents (e.g., instance type catalogues)
+    that are published as JSON at a well-known URL.
+
+    Documents are kept in memory for ``ttl`` seconds and, if a ``cache_dir``
+    is supplied, persisted to disk so that other processes can reuse them.
+    Once an entry expires, the document is revalidated with a conditional
+    request (``If-None-Match``/``If-Modified-Since``) so an unchanged document
+    is not downloaded again. If revalidation fails, a stale copy is served
+    rather than failing the caller.
+
+    A single, process-wide instance is available as
+    ``cloudbridge.cloud.base.cache.metadata_cache``.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, url, ttl, cache_dir=None):
+        """
+        Return the parsed JSON document found at ``url``.
+
+        :type url: ``str``
+        :param url: The location of the document.
+
+        :type ttl: ``int``
+        :param ttl: Number of seconds a fetched document is considered fresh.
+
+        :type cache_dir: ``str``
+        :param cache_dir: Directory in which to persist the document. If
+                          ``None``, the document is only cached in memory.
+        """
+        with self._lock:
+            now = time.time()
+            entry = self._entries.get(url)
+            if entry and entry['fetched'] + ttl > now:
+                return entry['data']
+            if not entry and cache_dir:
+                entry = self._load(url, cache_dir)
+                if entry and entry['fetched'] + ttl > now:
+                    log.debug("Using on-disk metadata cache for %s", url)
+                    self._entries[url] = entry
+                    return entry['data']
+            entry = self._fetch(url, entry, cache_dir)
+            self._entries[url] = entry
+            return entry['data']
+
+    def invalidate(self, url=None):
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+
+    @staticmethod
+    def _paths(url, cache_dir):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(cache_dir, digest)
+        return base + '.json', base + '.meta'
+
+    def _load(self, url, cache_dir):
+        data_path, meta_path = self._paths(url, cache_dir)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(data_path) as f:
+                meta['data'] = json.load(f)
+            return meta
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _store(self, url, cache_dir, content, entry):
+        data_path, meta_path = self._paths(url, cache_dir)
+        meta = dict((k, v) for k, v in entry.items() if k != 'data')
+        try:
+            os.makedirs(cache_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                log.warning("Cannot create metadata cache dir %s: %s",
+                            cache_dir, e)
+                return
+        try:
+            if content is not None:
+                cb_helpers.atomic_write(data_path, content)
+            cb_helpers.atomic_write(meta_path,
+                                    json.dumps(meta).encode('utf-8'))
+        except (IOError, OSError) as e:
+            log.warning("Cannot persist metadata cache for %s: %s", url, e)
+
+    def _fetch(self, url, entry, cache_dir):
+        import requests
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            log.debug("Fetching metadata document %s", url)
+            r = requests.get(url, headers=headers)
+            if r.status_code == 304 and entry:
+                entry = dict(entry, fetched=time.time())
+                if cache_dir:
+                    self._store(url, cache_dir, None, entry)
+                return entry
+            r.raise_for_status()
+            new_entry = {'fetched': time.time(),
+                         'etag': r.headers.get('ETag'),
+                         'last_modified': r.headers.get('Last-Modified'),
+                         'data': r.json()}
+        except Exception as e:
+            if entry:
+                log.warning("Could not refresh metadata from %s, using a "
+                            "stale copy: %s", url, e)
+                return entry
+            raise
+        if cache_dir:
+            self._store(url, cache_dir, r.content, new_entry)
+        return new_entry
+
+
+metadata_cache = MetadataCache()
@@ -1,11 +1,9 @@
+import os
 import sys
+import tempfile
 import traceback
 from contextlib import contextmanager
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization as crypt_serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-
 from six import reraise
 
 
@@ -15,6 +13,11 @@ def generate_key_pair():
     of (public, private) keys.
     The public key format is OpenSSH and private key format is PEM.
     """
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import serialization as \
+        crypt_serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
     key_pair = rsa.generate_private_key(
         backend=default_backend(),
         public_exponent=65537,
@@ -29,6 +32,21 @@ def generate_key_pair():
     return public_key, private_key
 
 
+def http_session(pool_size):
+    """
+    Return a ``requests`` session that keeps up to ``pool_size`` keep-alive
+    connections open to each host.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
 def filter_by(prop_name, kwargs, objs):
     """
     Utility method for filtering a list of objects by a property.
@@ -93,3 +111,25 @@ def cleanup_action(cleanup_func):
     except Exception as e:
         print("Error during cleanup: {0}".format(e))
         traceback.print_exc()
+
+
+def atomic_write(path, data):
+    """
+    Write ``data`` (bytes) to ``path`` so that readers never observe a
+    partially written file.
+    """
+    dirname = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            os.replace(tmp_path, path)
+        except AttributeError:  # Python 2
+            os.rename(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,168 @@
+"""
+Strategies that determine how long to sleep between state refreshes while
+waiting for an object to reach a desired state.
+"""
+import logging
+import random
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class PollingStrategy(object):
+    """
+    Base class for polling strategies.
+
+    A strategy hands out the sequence of delays to sleep between successive
+    refreshes of an object (see :meth:`intervals`) and is told how each wait
+    went (see :meth:`record`). It also keeps per resource type statistics on
+    the number of polls made, which are available through :attr:`stats`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def intervals(self, key, interval):
+        """
+        Return an iterator over the delays (in seconds) to sleep between
+        polls.
+
+        :type key: ``str``
+        :param key: The kind of object being waited on, e.g. ``AWSInstance``.
+
+        :type interval: ``int``
+        :param interval: The interval requested by the caller or configured as
+                         ``default_wait_interval``.
+        """
+        raise NotImplementedError()
+
+    def record(self, key, polls, elapsed, succeeded):
+        """
+        Record the outcome of a wait.
+
+        :type key: ``str``
+        :param key: The kind of object that was waited on.
+
+        :type polls: ``int``
+        :param polls: The number of times the object was refreshed.
+
+        :type elapsed: ``float``
+        :param elapsed: How long (in seconds) the wait took.
+
+        :type succeeded: ``bool``
+        :param succeeded: Whether the object reached a target state.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(
+                key, {'waits': 0, 'polls': 0, 'last_polls': 0})
+            stats['waits'] += 1
+            stats['polls'] += polls
+            stats['last_polls'] = polls
+        log.debug("Wait for %s finished after %s poll(s) in %.1f seconds",
+                  key, polls, elapsed)
+
+    @property
+    def stats(self):
+        """
+        Poll statistics, keyed by the kind of object waited on. Each value is
+        a dict with the number of ``waits``, the total number of ``polls``
+        made across them and the number of polls made by the most recent wait
+        (``last_polls``).
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return dict((k, dict(v)) for k, v in self._stats.items())
+
+
+class FixedPollingStrategy(PollingStrategy):
+    """
+    Sleep for the same interval between every poll. This is the default.
+    """
+
+    def intervals(self, key, interval):
+        while True:
+            yield interval
+
+
+class ExponentialBackoffPollingStrategy(PollingStrategy):
+    """
+    Exponentially back off between polls, using "full jitter": the n-th
+    delay is drawn uniformly between zero and
+    ``min(max_interval, interval * multiplier ** n)``. Quick operations are
+    therefore noticed quickly, while long running ones are polled
+    progressively less often.
+    """
+
+    def __init__(self, max_interval=60, multiplier=2):
+        super(ExponentialBackoffPollingStrategy, self).__init__()
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+
+    def _backoff(self, base, start=0):
+        attempt = start
+        while True:
+            ceiling = min(self.max_interval,
+                          base * self.multiplier ** attempt)
+            yield random.uniform(0, ceiling)
+            attempt += 1
+
+    def intervals(self, key, interval):
+        # A small floor ensures that an interval of 0 still backs off
+        return self._backoff(max(interval, 0.5))
+
+
+class AdaptivePollingStrategy(ExponentialBackoffPollingStrategy):
+    """
+    Learn how long transitions take for each kind of object and schedule
+    polls accordingly. The first poll is made shortly before a transition is
+    expected to complete, after which the strategy backs off exponentially
+    (with full jitter) from a fraction of the expected duration. Until a
+    kind of object has been seen, it behaves like
+    :class:`ExponentialBackoffPollingStrategy`.
+
+    Expected durations are an exponentially weighted moving average of past
+    successful waits, with weight ``alpha`` given to the latest one.
+    """
+
+    def __init__(self, max_interval=60, multiplier=2, alpha=0.3):
+        super(AdaptivePollingStrategy, self).__init__(max_interval,
+                                                      multiplier)
+        self.alpha = alpha
+        self._expected = {}
+
+    def expected_duration(self, key):
+        with self._lock:
+            return self._expected.get(key)
+
+    def intervals(self, key, interval):
+        expected = self.expected_duration(key)
+        if expected is None:
+            return super(AdaptivePollingStrategy, self).intervals(
+                key, interval)
+        return self._adaptive(expected, max(interval, 0.5))
+
+    def _adaptive(self, expected, floor):
+        yield max(floor, 0.8 * expected)
+        for delay in self._backoff(max(floor, 0.1 * expected)):
+            yield delay
+
+    def record(self, key, polls, elapsed, succeeded):
+        super(AdaptivePollingStrategy, self).record(key, polls, elapsed,
+                                                    succeeded)
+        # Only learn from waits that actually observed a transition
+        if not succeeded or not polls:
+            return
+        with self._lock:
+            previous = self._expected.get(key)
+            self._expected[key] = (
+                elapsed if previous is None
+                else self.alpha * elapsed + (1 - self.alpha) * previous)
+
+
+POLLING_STRATEGIES = {
+    'fixed': FixedPollingStrategy,
+    'exponential': ExponentialBackoffPollingStrategy,
+    'adaptive': AdaptivePollingStrategy
+}
@@ -1,14 +1,21 @@
 """Base implementation of a provider interface."""
+import collections
 import functools
 import logging
 import os
+import time
 from os.path import expanduser
 try:
     from configparser import ConfigParser
 except ImportError:  # Python 2
     from ConfigParser import SafeConfigParser as ConfigParser
 
+from cloudbridge.cloud.base.cache import ClientStore
+from cloudbridge.cloud.base.polling import POLLING_STRATEGIES
+from cloudbridge.cloud.base.polling import PollingStrategy
 from cloudbridge.cloud.interfaces import CloudProvider
+from cloudbridge.cloud.interfaces.exceptions \
+    import InvalidConfigurationException
 from cloudbridge.cloud.interfaces.exceptions import ProviderConnectionException
 from cloudbridge.cloud.interfaces.resources import Configuration
 
@@ -17,6 +24,17 @@ log = logging.getLogger(__name__)
 DEFAULT_RESULT_LIMIT = 50
 DEFAULT_WAIT_TIMEOUT = 600
 DEFAULT_WAIT_INTERVAL = 5
+DEFAULT_POLLING_STRATEGY = 'fixed'
+DEFAULT_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_READ_CHUNK_SIZE = 1024 * 1024
+DEFAULT_TRANSFER_CONCURRENCY = 4
+DEFAULT_TRANSFER_RETRIES = 3
+DEFAULT_METADATA_CACHE_TTL = 86400
+DEFAULT_LISTING_CACHE_TTL = 30
+DEFAULT_CACHE_DIR = os.path.join(expanduser('~'), '.cache', 'cloudbridge')
+DEFAULT_HTTP_POOL_SIZE = 10
+DEFAULT_PAGE_PREFETCH = 0
 
 # By default, use two locations for CloudBridge configuration
 CloudBridgeConfigPath = '/etc/cloudbridge.ini'
@@ -24,11 +42,16 @@ CloudBridgeConfigLocations = [CloudBridgeConfigPath]
 UserConfigPath = os.path.join(expanduser('~'), '.cloudbridge')
 CloudBridgeConfigLocations.append(UserConfigPath)
 
+# Outcome of a ``wait_for_all`` call
+WaitForAllResult = collections.namedtuple(
+    'WaitForAllResult', ['ready', 'terminal', 'timed_out'])
+
 
 class BaseConfiguration(Configuration):
 
     def __init__(self, user_config):
         self.update(user_config)
+        self._polling_strategy = None
 
     @property
     def default_result_limit(self):
@@ -61,6 +84,161 @@ class BaseConfiguration(Configuration):
                   DEFAULT_WAIT_INTERVAL)
         return self.get('default_wait_interval', DEFAULT_WAIT_INTERVAL)
 
+    @property
+    def default_upload_part_size(self):
+        """
+        Gets the default part size, in bytes, for multipart uploads.
+        """
+        return self.get('default_upload_part_size', DEFAULT_UPLOAD_PART_SIZE)
+
+    @property
+    def default_download_chunk_size(self):
+        """
+        Gets the default size, in bytes, of the ranges fetched by parallel
+        downloads.
+        """
+        return self.get('default_download_chunk_size',
+                        DEFAULT_DOWNLOAD_CHUNK_SIZE)
+
+    @property
+    def default_read_chunk_size(self):
+        """
+        Gets the default size, in bytes, of the chunks in which object content
+        is read from a stream.
+        """
+        return self.get('default_read_chunk_size', DEFAULT_READ_CHUNK_SIZE)
+
+    @property
+    def default_transfer_concurrency(self):
+        """
+        Gets the default number of parallel threads used to transfer the parts
+        of an object.
+        """
+        return self.get('default_transfer_concurrency',
+                        DEFAULT_TRANSFER_CONCURRENCY)
+
+    @property
+    def default_transfer_retries(self):
+        """
+        Gets the number of times the transfer of a single part of an object
+        is attempted before the whole transfer is abandoned.
+        """
+        return self.get('default_transfer_retries', DEFAULT_TRANSFER_RETRIES)
+
+    @property
+    def polling_strategy(self):
+        """
+        Gets the strategy used to space out state refreshes while waiting for
+        LifeCycleObjects. Set ``cb_polling_strategy`` (or the
+        ``CB_POLLING_STRATEGY`` environment variable) to one of ``fixed``
+        (poll every ``default_wait_interval`` seconds), ``exponential``
+        (exponential backoff with full jitter) or ``adaptive`` (a schedule
+        learned from past transitions of each resource type), or supply
+        a :class:`.PollingStrategy` instance.
+
+        The strategy also keeps track of how many polls each wait made.
+
+        :rtype: :class:`.PollingStrategy`
+        :return: The polling strategy in use.
+        """
+        if not self._polling_strategy:
+            strategy = self.get('cb_polling_strategy',
+                                os.environ.get('CB_POLLING_STRATEGY',
+                                               DEFAULT_POLLING_STRATEGY))
+            if not isinstance(strategy, PollingStrategy):
+                if strategy not in POLLING_STRATEGIES:
+                    raise InvalidConfigurationException(
+                        "Unknown polling strategy '{0}'. Must be one of: {1}"
+                        .format(strategy, ", ".join(POLLING_STRATEGIES)))
+                strategy = POLLING_STRATEGIES[strategy]()
+            self._polling_strategy = strategy
+        return self._polling_strategy
+
+    @property
+    def metadata_cache_ttl(self):
+        """
+        Gets the number of seconds that provider metadata (e.g., the catalogue
+        of available VM types) is cached before being revalidated.
+
+        :rtype: ``int``
+        :return: The metadata cache lifetime, in seconds.
+        """
+        return int(self.get('cb_metadata_cache_ttl',
+                            os.environ.get('CB_METADATA_CACHE_TTL',
+                                           DEFAULT_METADATA_CACHE_TTL)))
+
+    @property
+    def listing_cache_ttl(self):
+        """
+        Gets the number of seconds for which a catalogue listing (e.g., of
+        VM types) that is paged on the client is reused to serve further
+        pages of it. A value of 0 disables this.
+
+        :rtype: ``int``
+        :return: The listing cache lifetime, in seconds.
+        """
+        return int(self.get('cb_listing_cache_ttl',
+                            os.environ.get('CB_LISTING_CACHE_TTL',
+                                           DEFAULT_LISTING_CACHE_TTL)))
+
+    @property
+    def cache_dir(self):
+        """
+        Gets the directory in which CloudBridge persists cached data between
+        processes. Set ``cb_cache_dir`` (or the ``CB_CACHE_DIR`` environment
+        variable) to an empty value to keep caches in memory only.
+
+        :rtype: ``str``
+        :return: Path to the cache directory or ``None``.
+        """
+        return self.get('cb_cache_dir',
+                        os.environ.get('CB_CACHE_DIR',
+                                       DEFAULT_CACHE_DIR)) or None
+
+    @property
+    def thread_safe(self):
+        """
+        A flag indicating whether the provider gives each thread SDK clients
+        of its own, built from the same credentials, so that a single
+        provider can be used from a pool of threads. Set ``cb_thread_safe``
+        (or the ``CB_THREAD_SAFE`` environment variable) to enable this.
+
+        :rtype: ``bool``
+        :return: Whether clients are private to each thread.
+        """
+        value = self.get('cb_thread_safe',
+                         os.environ.get('CB_THREAD_SAFE', False))
+        return str(value).lower() in ('1', 'true', 'yes')
+
+    @property
+    def http_pool_size(self):
+        """
+        Gets the maximum number of keep-alive connections that each client
+        keeps open to a host. This should be at least the number of threads
+        that use a client at the same time.
+
+        :rtype: ``int``
+        :return: The size of the HTTP connection pools.
+        """
+        return int(self.get('cb_http_pool_size',
+                            os.environ.get('CB_HTTP_POOL_SIZE',
+                                           DEFAULT_HTTP_POOL_SIZE)))
+
+    @property
+    def page_prefetch(self):
+        """
+        Gets the number of pages that iterating over a server-paged listing
+        fetches ahead, on a background thread, of the page being consumed.
+        A value of 0 (the default) fetches each page only once the previous
+        one has been consumed.
+
+        :rtype: ``int``
+        :return: The number of pages fetched ahead.
+        """
+        return int(self.get('cb_page_prefetch',
+                            os.environ.get('CB_PAGE_PREFETCH',
+                                           DEFAULT_PAGE_PREFETCH)))
+
     @property
     def debug_mode(self):
         """
@@ -83,6 +261,11 @@ class BaseCloudProvider(CloudProvider):
         self._config = BaseConfiguration(config)
         self._config_parser = ConfigParser()
         self._config_parser.read(CloudBridgeConfigLocations)
+        # SDK clients, which are private to each thread in thread-safe mode
+        self._clients = ClientStore(per_thread=self.config.thread_safe)
+        # Clients that are always private to each thread, e.g., for the
+        # parts of parallel transfers
+        self._thread_clients = ClientStore(per_thread=True)
 
     @property
     def config(self):
@@ -107,6 +290,90 @@ class BaseCloudProvider(CloudProvider):
             raise ProviderConnectionException(
                 "Authentication with cloud provider failed: %s" % (e,))
 
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        if timeout is None:
+            timeout = self.config.default_wait_timeout
+        if interval is None:
+            interval = self.config.default_wait_interval
+        resources = list(resources)
+        if isinstance(timeout, (list, tuple)):
+            timeouts = list(timeout)
+            assert len(timeouts) == len(resources)
+        else:
+            assert timeout >= interval
+            timeouts = [timeout] * len(resources)
+
+        assert all(obj_timeout >= 0 for obj_timeout in timeouts)
+        assert interval >= 0
+
+        start_time = time.time()
+        terminal_states = terminal_states or []
+        # Each object is waited for until its own deadline
+        pending = [(obj, start_time + obj_timeout)
+                   for obj, obj_timeout in zip(resources, timeouts)]
+        ready = []
+        terminal = []
+        timed_out = []
+        strategy = self.config.polling_strategy
+        key = type(resources[0]).__name__ if resources else None
+        intervals = strategy.intervals(key, interval)
+        polls = 0
+
+        while True:
+            waiting = []
+            for obj, deadline in pending:
+                if obj.state in target_states:
+                    ready.append(obj)
+                elif obj.state in terminal_states:
+                    log.debug("Object %s reached terminal state: %s",
+                              obj, obj.state)
+                    terminal.append(obj)
+                else:
+                    waiting.append((obj, deadline))
+            pending = waiting
+            if not pending:
+                break
+            end_time = max(deadline for _, deadline in pending)
+            log.debug("%s object(s) have not reached target state(s): %s. "
+                      "Waiting up to another %s seconds...", len(pending),
+                      target_states, int(end_time - time.time()))
+            next_deadline = min(deadline for _, deadline in pending)
+            time.sleep(min(next(intervals),
+                           max(next_deadline - time.time(), 0)))
+            now = time.time()
+            expired = [obj for obj, deadline in pending if deadline <= now]
+            if expired:
+                log.debug("Waited too long for objects: %s", expired)
+                timed_out.extend(expired)
+                pending = [(obj, deadline) for obj, deadline in pending
+                           if deadline > now]
+                if not pending:
+                    break
+            self._refresh_all([obj for obj, _ in pending])
+            polls += 1
+
+        if key:
+            strategy.record(key, polls, time.time() - start_time,
+                            not (terminal or timed_out))
+        return WaitForAllResult(ready, terminal, timed_out)
+
+    def _refresh_all(self, objects):
+        """
+        Refresh a heterogeneous list of objects, grouping them by type so
+        that each group can be refreshed with a single batched call.
+        """
+        groups = collections.OrderedDict()
+        for obj in objects:
+            groups.setdefault(type(obj), []).append(obj)
+        for obj_type, group in groups.items():
+            refresh_many = getattr(obj_type, '_refresh_many', None)
+            if refresh_many:
+                refresh_many(self, group)
+            else:
+                for obj in group:
+                    obj.refresh()
+
     def _deepgetattr(self, obj, attr):
         """Recurses through an attribute chain to get the ultimate value."""
         return functools.reduce(getattr, attr.split('.'), obj)
@@ -1,18 +1,33 @@
 """
 Base implementation for data objects exposed through a provider or service
 """
+import bisect
+import collections
+import functools
+import hashlib
 import inspect
 import itertools
+import json
 import logging
 import os
 import re
 import shutil
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.cache import TTLCache
+from cloudbridge.cloud.interfaces.exceptions \
+    import CloudBridgeBaseException
 from cloudbridge.cloud.interfaces.exceptions \
     import InvalidConfigurationException
 from cloudbridge.cloud.interfaces.exceptions import InvalidNameException
+from cloudbridge.cloud.interfaces.exceptions \
+    import ProviderInternalException
+from cloudbridge.cloud.interfaces.exceptions \
+    import TransferIntegrityException
 from cloudbridge.cloud.interfaces.exceptions import WaitStateException
 from cloudbridge.cloud.interfaces.resources import AttachmentInfo
 from cloudbridge.cloud.interfaces.resources import Bucket
@@ -50,10 +65,16 @@ from cloudbridge.cloud.interfaces.resources import VMType
 from cloudbridge.cloud.interfaces.resources import Volume
 from cloudbridge.cloud.interfaces.resources import VolumeState
 
+from retrying import Retrying
+
 import six
 
 log = logging.getLogger(__name__)
 
+# Outcome of a ``BucketContainer.list_prefixes`` call
+PrefixListing = collections.namedtuple('PrefixListing',
+                                       ['prefixes', 'objects'])
+
 
 class BaseCloudResource(CloudResource):
     """
@@ -224,12 +245,38 @@ class BaseObjectLifeCycleMixin(ObjectLifeCycleMixin):
     A base implementation of an ObjectLifeCycleMixin.
     This base implementation has an implementation of wait_for
     which refreshes the object's state till the desired ready states
-    are reached. Subclasses must still implement the wait_till_ready
-    method, since the desired ready states are object specific.
+    are reached. Subclasses must still declare the READY_STATES used by
+    wait_till_ready, since the desired ready states are object specific.
     """
 
+    # The states in which ``wait_till_ready`` stops waiting, successfully
+    # or not
+    READY_STATES = ()
+    READY_TERMINAL_STATES = ()
+
+    def wait_till_ready(self, timeout=None, interval=None):
+        self.wait_for(
+            self.READY_STATES,
+            terminal_states=self.READY_TERMINAL_STATES,
+            timeout=timeout,
+            interval=interval)
+
     def wait_for(self, target_states, terminal_states=None, timeout=None,
                  interval=None):
+        for delay in self._wait_steps(target_states, terminal_states,
+                                      timeout, interval):
+            time.sleep(delay)
+            self.refresh()
+        return True
+
+    def _wait_steps(self, target_states, terminal_states=None, timeout=None,
+                    interval=None):
+        """
+        Yield the number of seconds to wait before each refresh of this
+        object, until it reaches one of ``target_states``. The caller
+        refreshes the object after each wait, which lets waits be driven
+        without blocking, e.g., from an event loop.
+        """
         if timeout is None:
             timeout = self._provider.config.default_wait_timeout
         if interval is None:
@@ -239,30 +286,48 @@ class BaseObjectLifeCycleMixin(ObjectLifeCycleMixin):
         assert interval >= 0
         assert timeout >= interval
 
-        end_time = time.time() + timeout
+        start_time = time.time()
+        end_time = start_time + timeout
+        strategy = self._provider.config.polling_strategy
+        key = type(self).__name__
+        intervals = strategy.intervals(key, interval)
+        polls = 0
 
         while self.state not in target_states:
             if self.state in (terminal_states or []):
+                strategy.record(key, polls, time.time() - start_time, False)
                 raise WaitStateException(
                     "Object: {0} is in state: {1} which is a terminal state"
                     " and cannot be waited on.".format(self, self.state))
-            else:
-                log.debug(
-                    "Object %s is in state: %s. Waiting another %s"
-                    " seconds to reach target state(s): %s...",
-                    self,
-                    self.state,
-                    int(end_time - time.time()),
-                    target_states)
-                time.sleep(interval)
-                if time.time() > end_time:
-                    raise WaitStateException(
-                        "Waited too long for object: {0} to become ready. It's"
-                        " still in state: {1}".format(self, self.state))
-            self.refresh()
+            if polls and time.time() > end_time:
+                strategy.record(key, polls, time.time() - start_time, False)
+                raise WaitStateException(
+                    "Waited too long for object: {0} to become ready. It's"
+                    " still in state: {1}".format(self, self.state))
+            log.debug(
+                "Object %s is in state: %s. Waiting another %s"
+                " seconds to reach target state(s): %s...",
+                self,
+                self.state,
+                int(end_time - time.time()),
+                target_states)
+            yield min(next(intervals), max(end_time - time.time(), 0))
+            polls += 1
+        strategy.record(key, polls, time.time() - start_time, True)
         log.debug("Object: %s successfully reached target state: %s",
                   self, self.state)
-        return True
+
+    @classmethod
+    def _refresh_many(cls, provider, objects):
+        """
+        Refresh the state of several objects of this type. Used by
+        ``provider.wait_for_all`` to refresh a whole group of pending
+        objects at once. This default implementation refreshes each object
+        in turn; providers should override it to use a single batched
+        request where the underlying API allows it.
+        """
+        for obj in objects:
+            obj.refresh()
 
 
 class BaseResultList(ResultList):
@@ -312,6 +377,27 @@ class ServerPagedResultList(BaseResultList):
             "ServerPagedResultLists do not support the data property")
 
 
+class IndexedList(list):
+    """
+    A list of cloud objects that finds the position of an object by its id in
+    constant time. The index is built the first time it is needed.
+    """
+
+    _index = None
+
+    def position(self, obj_id):
+        """
+        Return the position of the first object with the given id, or
+        ``None`` if there is no such object.
+        """
+        if self._index is None:
+            index = {}
+            for position, obj in enumerate(self):
+                index.setdefault(obj.id, position)
+            self._index = index
+        return self._index.get(obj_id)
+
+
 class ClientPagedResultList(BaseResultList):
     """
     This is a convenience class that extends the :class:`BaseResultList` class
@@ -323,17 +409,18 @@ class ClientPagedResultList(BaseResultList):
     """
 
     def __init__(self, provider, objects, limit=None, marker=None):
+        if not isinstance(objects, IndexedList):
+            objects = IndexedList(objects)
         self._objects = objects
         limit = limit or provider.config.default_result_limit
         total_size = len(objects)
+        start = 0
         if marker:
-            from_marker = itertools.dropwhile(
-                lambda obj: not obj.id == marker, objects)
+            position = objects.position(marker)
             # skip one past the marker
-            next(from_marker, None)
-            objects = list(from_marker)
-        is_truncated = len(objects) > limit
-        results = list(itertools.islice(objects, limit))
+            start = total_size if position is None else position + 1
+        is_truncated = total_size - start > limit
+        results = objects[start:start + limit]
         super(ClientPagedResultList, self).__init__(
             is_truncated,
             results[-1].id if is_truncated else None,
@@ -349,25 +436,269 @@ class ClientPagedResultList(BaseResultList):
         return self._objects
 
 
+def cached_listing(func):
+    """
+    A decorator for ``list(..., limit, marker)`` methods of pageable services
+    that page through a full listing on the client, using a
+    :class:`ClientPagedResultList`.
+
+    The listing fetched for a first page (i.e., when no marker is given) is
+    kept for ``config.listing_cache_ttl`` seconds. Requests for subsequent
+    pages of it are served as slices of that listing, instead of listing all
+    objects again and scanning for the marker.
+
+    As objects created or deleted meanwhile are not reflected in those pages,
+    this is only meant for catalogues that rarely change, such as regions, VM
+    types and images.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        # pylint:disable=deprecated-method
+        callargs = inspect.getcallargs(func, self, *args, **kwargs)
+        callargs.pop('self', None)
+        marker = callargs.pop('marker', None)
+        limit = callargs.pop('limit', None)
+        key = repr(sorted(callargs.items()))
+        # pylint:disable=protected-access
+        ttl = self._provider.config.listing_cache_ttl
+        cache = self.__dict__.setdefault('_listing_cache', TTLCache(ttl))
+        objects = cache.get(key) if marker and ttl else None
+        if objects is not None:
+            return ClientPagedResultList(self._provider, objects,
+                                         limit=limit, marker=marker)
+        result = func(self, *args, **kwargs)
+        if ttl and not result.supports_server_paging:
+            cache.set(key, result.data, ttl)
+        return result
+    return wrapper
+
+
+class ListingIndex(object):
+    """
+    Hash indexes over the attributes of a listing of cloud objects, used to
+    answer ``find()`` queries without scanning the listing. The index of an
+    attribute is built the first time it is filtered on.
+
+    When ``globs`` are enabled, a ``name`` filter containing the wildcards
+    ``*`` or ``?`` matches names as a glob pattern. The names starting with
+    the literal prefix of the pattern are located in a sorted index, so that
+    a query such as ``find(globs=True, name='m5.*')`` only examines the
+    matching range.
+    """
+    WILDCARDS = re.compile(r'[*?]')
+    # Indexes are keyed by this for attributes with unhashable values
+    UNHASHABLE = object()
+
+    def __init__(self, objects):
+        self.objects = list(objects)
+        self._positions = dict((id(obj), position)
+                               for position, obj in enumerate(self.objects))
+        self._indexes = {}
+        self._names = None
+        self._lock = threading.Lock()
+
+    def _index(self, attr):
+        with self._lock:
+            index = self._indexes.get(attr)
+            if index is None:
+                index = collections.defaultdict(list)
+                try:
+                    for obj in self.objects:
+                        index[getattr(obj, attr)].append(obj)
+                except TypeError:
+                    index = self.UNHASHABLE
+                self._indexes[attr] = index
+            return index
+
+    def _lookup(self, attr, value):
+        index = self._index(attr)
+        if index is not self.UNHASHABLE:
+            try:
+                return index.get(value, [])
+            except TypeError:
+                pass
+        return [obj for obj in self.objects if getattr(obj, attr) == value]
+
+    def _match_name(self, pattern):
+        with self._lock:
+            if self._names is None:
+                self._names = sorted(
+                    (obj.name, self._positions[id(obj)], obj)
+                    for obj in self.objects
+                    if isinstance(obj.name, six.string_types))
+            names = self._names
+        prefix = self.WILDCARDS.split(pattern, 1)[0]
+        regex = re.compile('^%s$' % ''.join(
+            '.*' if char == '*' else '.' if char == '?' else re.escape(char)
+            for char in pattern), re.DOTALL)
+        matches = []
+        start = bisect.bisect_left(names, (prefix,))
+        for name, _, obj in itertools.islice(names, start, None):
+            if not name.startswith(prefix):
+                break
+            # A literal match allows names that contain wildcards
+            if name == pattern or regex.match(name):
+                matches.append(obj)
+        return matches
+
+    def find(self, globs=False, **filters):
+        """
+        Return the objects whose attributes equal all of the given
+        ``filters``, in listing order. If ``globs`` is set, the ``name``
+        filter may be a glob pattern.
+        """
+        matches = None
+        for attr, value in filters.items():
+            if (globs and attr == 'name' and
+                    isinstance(value, six.string_types) and
+                    self.WILDCARDS.search(value)):
+                found = self._match_name(value)
+            else:
+                found = self._lookup(attr, value)
+            if matches is None:
+                matches = found
+            else:
+                ids = set(id(obj) for obj in found)
+                matches = [obj for obj in matches if id(obj) in ids]
+            if not matches:
+                return []
+        if matches is None:
+            return list(self.objects)
+        return sorted(matches, key=lambda obj: self._positions[id(obj)])
+
+
 class BasePageableObjectMixin(PageableObjectMixin):
     """
     A mixin to provide iteration capability for a class
     that support a list(limit, marker) method.
     """
 
+    # Whether the index built to answer ``find()`` is kept for
+    # ``config.metadata_cache_ttl`` seconds. This is only safe for listings
+    # that rarely change, such as catalogues of VM types, because objects
+    # may be created or deleted without going through the service.
+    CACHE_FIND_INDEX = False
+
     def __iter__(self):
-        result_list = self.list()
+        return self._iter_pages()
+
+    def _find(self, filter_names, kwargs):
+        """
+        Return a :class:`ClientPagedResultList` of the objects matching the
+        ``filter_names`` given in ``kwargs``, which are looked up in a
+        :class:`ListingIndex`. As with ``filter_by``, filters with an empty
+        value are ignored. Names are matched exactly, unless ``glob=True`` is
+        given to match them as glob patterns.
+        """
+        globs = kwargs.pop('glob', False)
+        filters = dict((name, kwargs.pop(name)) for name in filter_names
+                       if name in kwargs)
+        # All kwargs should have been popped at this time.
+        if len(kwargs) > 0:
+            raise TypeError(
+                "Unrecognised parameters for search: %s. Supported "
+                "attributes: %s" % (kwargs, filter_names))
+        filters = dict((name, value) for name, value in filters.items()
+                       if value)
+        matches = self._find_index().find(globs=globs, **filters)
+        return ClientPagedResultList(self._provider, matches)
+
+    def _find_index(self):
+        if not self.CACHE_FIND_INDEX:
+            return ListingIndex(self)
+        # pylint:disable=protected-access
+        ttl = self._provider.config.metadata_cache_ttl
+        cache = self.__dict__.setdefault('_find_index_cache', TTLCache(ttl))
+        index = cache.get('index')
+        if index is None:
+            index = ListingIndex(self)
+            cache.set('index', index)
+        return index
+
+    def _invalidate_listings(self):
+        """
+        Drop the listings and the find index cached for this service, so that
+        they reflect objects created or deleted through it.
+        """
+        for attr in ('_listing_cache', '_find_index_cache'):
+            cache = self.__dict__.get(attr)
+            if cache is not None:
+                cache.invalidate()
+
+    def _iter_pages(self, **kwargs):
+        """
+        Iterate through all results of ``list(**kwargs)``, fetching one page
+        at a time. Server-paged results are fetched up to
+        ``config.page_prefetch`` pages ahead of the page being consumed.
+        """
+        result_list = self.list(**kwargs)
         if result_list.supports_server_paging:
-            for result in result_list:
-                yield result
-            while result_list.is_truncated:
-                result_list = self.list(marker=result_list.marker)
-                for result in result_list:
+            prefetch = self._provider.config.page_prefetch
+            if prefetch > 0 and result_list.is_truncated:
+                pages = self._prefetch_pages(result_list, prefetch, kwargs)
+            else:
+                pages = self._fetch_pages(result_list, kwargs)
+            for page in pages:
+                for result in page:
                     yield result
         else:
             for result in result_list.data:
                 yield result
 
+    def _fetch_pages(self, result_list, kwargs):
+        """
+        Iterate through ``result_list`` and the pages that follow it.
+        """
+        yield result_list
+        while result_list.is_truncated:
+            result_list = self.list(marker=result_list.marker, **kwargs)
+            yield result_list
+
+    def _prefetch_pages(self, result_list, depth, kwargs):
+        """
+        Iterate through ``result_list`` and the pages that follow it, which
+        are fetched on a background thread up to ``depth`` pages ahead of the
+        page being consumed. Fetching stops once the iterator is closed.
+        """
+        pages = six.moves.queue.Queue()
+        # One slot per page fetched but not yet consumed
+        slots = threading.Semaphore(depth)
+        closed = threading.Event()
+
+        def fetch(result_list):
+            try:
+                while result_list.is_truncated:
+                    slots.acquire()
+                    if closed.is_set():
+                        return
+                    result_list = self.list(marker=result_list.marker,
+                                            **kwargs)
+                    pages.put((result_list, None))
+            except Exception:
+                pages.put((None, sys.exc_info()))
+            else:
+                pages.put((None, None))
+
+        # A daemon thread, so that an iterator that is never finished or
+        # closed does not keep the interpreter from exiting, as an idle
+        # executor worker would
+        fetcher = threading.Thread(target=fetch, args=(result_list,))
+        fetcher.daemon = True
+        fetcher.start()
+        try:
+            yield result_list
+            while True:
+                page, exc_info = pages.get()
+                if exc_info:
+                    six.reraise(*exc_info)
+                if page is None:
+                    break
+                slots.release()
+                yield page
+        finally:
+            closed.set()
+            slots.release()
+
 
 class BaseVMType(BaseCloudResource, VMType):
 
@@ -391,9 +722,84 @@ class BaseVMType(BaseCloudResource, VMType):
 
 class BaseInstance(BaseCloudResource, BaseObjectLifeCycleMixin, Instance):
 
+    READY_STATES = (InstanceState.RUNNING,)
+    READY_TERMINAL_STATES = (InstanceState.DELETED, InstanceState.ERROR)
+
+    # Related objects that ``instances.list(expand=...)`` can prefetch
+    EXPANDABLE = ('vm_firewalls', 'vm_type', 'subnet')
+
     def __init__(self, provider):
         super(BaseInstance, self).__init__(provider)
 
+    def _related(self, name, fetch):
+        """
+        Return the related object(s) ``name`` prefetched for this instance,
+        or the result of calling ``fetch`` if they have not been.
+        """
+        related = self.__dict__.get('_prefetched', {})
+        if name in related:
+            return related[name]
+        return fetch()
+
+    def _set_related(self, name, value):
+        self.__dict__.setdefault('_prefetched', {})[name] = value
+
+    def _clear_related(self):
+        """
+        Forget the related objects prefetched for this instance, e.g., once
+        it has been refreshed.
+        """
+        self.__dict__.pop('_prefetched', None)
+
+    @property
+    def subnet(self):
+        return self._related('subnet', lambda: (
+            self._provider.networking.subnets.get(self.subnet_id)
+            if self.subnet_id else None))
+
+    @classmethod
+    def _expand_many(cls, provider, instances, expand):
+        """
+        Prefetch the related objects named in ``expand`` for a page of
+        instances, fetching each type of related object in a single pass.
+        """
+        if 'vm_firewalls' in expand:
+            firewalls = cls._get_vm_firewalls(provider, set(
+                fw_id for inst in instances for fw_id in inst.vm_firewall_ids))
+            for inst in instances:
+                inst._set_related('vm_firewalls', [
+                    firewalls[fw_id] for fw_id in inst.vm_firewall_ids
+                    if firewalls.get(fw_id)])
+        if 'vm_type' in expand:
+            vm_types = cls._get_vm_types(provider, set(
+                inst.vm_type_id for inst in instances))
+            for inst in instances:
+                inst._set_related('vm_type', vm_types.get(inst.vm_type_id))
+        if 'subnet' in expand:
+            subnets = cls._get_subnets(provider, set(
+                inst.subnet_id for inst in instances if inst.subnet_id))
+            for inst in instances:
+                inst._set_related('subnet', subnets.get(inst.subnet_id))
+
+    # The following return a dict of the related objects with the given ids.
+    # These default implementations get each object in turn; providers
+    # should override them to use a single batched request.
+
+    @classmethod
+    def _get_vm_firewalls(cls, provider, fw_ids):
+        return dict((fw_id, provider.security.vm_firewalls.get(fw_id))
+                    for fw_id in fw_ids)
+
+    @classmethod
+    def _get_vm_types(cls, provider, vm_type_ids):
+        return dict((vm_type_id, provider.compute.vm_types.get(vm_type_id))
+                    for vm_type_id in vm_type_ids)
+
+    @classmethod
+    def _get_subnets(cls, provider, subnet_ids):
+        return dict((subnet_id, provider.networking.subnets.get(subnet_id))
+                    for subnet_id in subnet_ids)
+
     def __eq__(self, other):
         return (isinstance(other, Instance) and
                 # pylint:disable=protected-access
@@ -407,13 +813,6 @@ class BaseInstance(BaseCloudResource, BaseObjectLifeCycleMixin, Instance):
                 self.private_ips == other.private_ips and
                 self.image_id == other.image_id)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [InstanceState.RUNNING],
-            terminal_states=[InstanceState.DELETED, InstanceState.ERROR],
-            timeout=timeout,
-            interval=interval)
-
     def __repr__(self):
         return "<CB-{0}: {1} ({2})>".format(self.__class__.__name__,
                                             self.name, self.id)
@@ -495,6 +894,9 @@ class BaseLaunchConfig(LaunchConfig):
 class BaseMachineImage(
         BaseCloudResource, BaseObjectLifeCycleMixin, MachineImage):
 
+    READY_STATES = (MachineImageState.AVAILABLE,)
+    READY_TERMINAL_STATES = (MachineImageState.ERROR,)
+
     def __init__(self, provider):
         super(BaseMachineImage, self).__init__(provider)
 
@@ -508,13 +910,6 @@ class BaseMachineImage(
                 self.name == other.name and
                 self.description == other.description)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [MachineImageState.AVAILABLE],
-            terminal_states=[MachineImageState.ERROR],
-            timeout=timeout,
-            interval=interval)
-
     def __repr__(self):
         return "<CB-{0}: {1} ({2})>".format(self.__class__.__name__,
                                             self.name, self.id)
@@ -542,6 +937,9 @@ class BaseAttachmentInfo(AttachmentInfo):
 
 class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
 
+    READY_STATES = (VolumeState.AVAILABLE,)
+    READY_TERMINAL_STATES = (VolumeState.ERROR, VolumeState.DELETED)
+
     def __init__(self, provider):
         super(BaseVolume, self).__init__(provider)
 
@@ -554,13 +952,6 @@ class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
                 self.state == other.state and
                 self.name == other.name)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [VolumeState.AVAILABLE],
-            terminal_states=[VolumeState.ERROR, VolumeState.DELETED],
-            timeout=timeout,
-            interval=interval)
-
     def __repr__(self):
         return "<CB-{0}: {1} ({2})>".format(self.__class__.__name__,
                                             self.name, self.id)
@@ -568,6 +959,9 @@ class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
 
 class BaseSnapshot(BaseCloudResource, BaseObjectLifeCycleMixin, Snapshot):
 
+    READY_STATES = (SnapshotState.AVAILABLE,)
+    READY_TERMINAL_STATES = (SnapshotState.ERROR,)
+
     def __init__(self, provider):
         super(BaseSnapshot, self).__init__(provider)
 
@@ -580,13 +974,6 @@ class BaseSnapshot(BaseCloudResource, BaseObjectLifeCycleMixin, Snapshot):
                 self.state == other.state and
                 self.name == other.name)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [SnapshotState.AVAILABLE],
-            terminal_states=[SnapshotState.ERROR],
-            timeout=timeout,
-            interval=interval)
-
     def __repr__(self):
         return "<CB-{0}: {1} ({2})>".format(self.__class__.__name__,
                                             self.name, self.id)
@@ -715,11 +1102,9 @@ class BaseVMFirewallRuleContainer(BasePageableObjectMixin,
             return None
 
     def find(self, **kwargs):
-        obj_list = self
         filters = ['name', 'direction', 'protocol', 'from_port', 'to_port',
                    'cidr', 'src_dest_fw', 'src_dest_fw_id']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(filters, kwargs)
 
     def delete(self, rule_id):
         rule = self.get(rule_id)
@@ -803,6 +1188,20 @@ class BaseRegion(BaseCloudResource, Region):
 
     def __init__(self, provider):
         super(BaseRegion, self).__init__(provider)
+        self._zones = None
+
+    @property
+    def zones(self):
+        if self._zones is not None:
+            return self._zones
+        return self._fetch_zones()
+
+    def _fetch_zones(self):
+        """
+        Fetch the placement zones of this region from the provider.
+        """
+        raise NotImplementedError(
+            "_fetch_zones not implemented by this provider")
 
     def __repr__(self):
         return "<CB-{0}: {1}>".format(self.__class__.__name__,
@@ -821,6 +1220,82 @@ class BaseRegion(BaseCloudResource, Region):
         return js
 
 
+class RangedReader(object):
+    """
+    A read-only, file-like view of the content of a bucket object, backed by
+    ranged reads of ``chunk_size`` bytes. Up to ``prefetch`` ranges beyond
+    the one being consumed are fetched ahead on background threads, so at
+    most ``prefetch + 1`` ranges are held in memory.
+
+    The object must implement ``_read_range``, as required by
+    :meth:`.BucketObject.download_to`.
+    """
+
+    def __init__(self, obj, chunk_size, prefetch=1):
+        self._obj = obj
+        self._size = obj.size
+        self._chunk_size = chunk_size
+        self._prefetch = prefetch
+        # pylint:disable=protected-access
+        self._retryer = obj._transfer_retryer()
+        self._offset = 0
+        self._buffer = b''
+        self._pending = collections.deque()
+        self._executor = ThreadPoolExecutor(max_workers=prefetch) \
+            if prefetch else None
+
+    def _read_range(self, start, end):
+        # pylint:disable=protected-access
+        return self._retryer.call(self._obj._read_range, start, end)
+
+    def _next_range(self):
+        start = self._offset
+        end = min(start + self._chunk_size, self._size) - 1
+        self._offset = end + 1
+        return start, end
+
+    def _next_chunk(self):
+        if not self._executor:
+            if self._offset >= self._size:
+                return b''
+            return self._read_range(*self._next_range())
+        while (self._offset < self._size and
+               len(self._pending) <= self._prefetch):
+            self._pending.append(
+                self._executor.submit(self._read_range, *self._next_range()))
+        if not self._pending:
+            return b''
+        return self._pending.popleft().result()
+
+    def __iter__(self):
+        if self._buffer:
+            data, self._buffer = self._buffer, b''
+            yield data
+        while True:
+            data = self._next_chunk()
+            if not data:
+                break
+            yield data
+
+    def read(self, length=-1):
+        if length is None or length < 0:
+            return b''.join(self)
+        while len(self._buffer) < length:
+            data = self._next_chunk()
+            if not data:
+                break
+            self._buffer += data
+        data = self._buffer[:length]
+        self._buffer = self._buffer[length:]
+        return data
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        self._pending.clear()
+        self._offset = self._size
+
+
 class BaseBucketObject(BaseCloudResource, BucketObject):
 
     # Regular expression for valid bucket keys.
@@ -848,7 +1323,293 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
                 "data.html#object-key-guidelines" % name)
 
     def save_content(self, target_stream):
-        shutil.copyfileobj(self.iter_content(), target_stream)
+        # The content is read in the provider's own default chunks, which
+        # may be larger ranges, and copied through a smaller local buffer
+        chunk_size = self._provider.config.default_read_chunk_size
+        content = self.iter_content()
+        if not hasattr(content, 'readinto'):
+            shutil.copyfileobj(content, target_stream, chunk_size)
+            return
+        # Fill a single, reusable buffer rather than allocating per chunk
+        buf = memoryview(bytearray(chunk_size))
+        while True:
+            length = content.readinto(buf)
+            if not length:
+                break
+            target_stream.write(buf[:length])
+
+    def _transfer_retryer(self):
+        """
+        Return a ``Retrying`` instance for the parts of a multipart transfer.
+        """
+        return Retrying(
+            stop_max_attempt_number=self._provider.config
+            .default_transfer_retries,
+            wait_exponential_multiplier=500, wait_exponential_max=10000,
+            # Only transient (i.e. provider or network) errors are retried
+            retry_on_exception=lambda e: not isinstance(
+                e, CloudBridgeBaseException))
+
+    @staticmethod
+    def _read_part(fileobj, part_size):
+        """
+        Read up to ``part_size`` bytes, tolerating short reads from pipes and
+        sockets. Returns fewer bytes only at the end of the stream.
+        """
+        chunks = []
+        remaining = part_size
+        while remaining > 0:
+            chunk = fileobj.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    def upload_stream(self, fileobj, part_size=None, concurrency=None):
+        config = self._provider.config
+        part_size = part_size or config.default_upload_part_size
+        concurrency = concurrency or config.default_transfer_concurrency
+
+        first = self._read_part(fileobj, part_size)
+        if len(first) < part_size:
+            # The whole object fits in a single part
+            return self.upload(first)
+
+        retryer = self._transfer_retryer()
+        # Bounds the number of parts held in memory at any one time
+        slots = threading.BoundedSemaphore(concurrency)
+
+        def send(upload, part_number, data):
+            try:
+                return retryer.call(self._upload_part, upload, part_number,
+                                    data)
+            finally:
+                slots.release()
+
+        upload = self._start_multipart_upload()
+        try:
+            futures = []
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                slots.acquire()
+                data = first
+                part_number = 1
+                while data:
+                    futures.append(
+                        executor.submit(send, upload, part_number, data))
+                    if any(f.done() and f.exception() for f in futures):
+                        break
+                    slots.acquire()
+                    data = self._read_part(fileobj, part_size)
+                    part_number += 1
+                else:
+                    slots.release()
+            parts = [f.result() for f in futures]
+            self._complete_multipart_upload(upload, parts)
+        except Exception:
+            log.exception("Multipart upload of %s failed", self.name)
+            self._abort_multipart_upload(upload)
+            raise
+        return True
+
+    def _start_multipart_upload(self):
+        """
+        Start a multipart upload of this object. Providers supporting
+        :meth:`upload_stream` must implement this method along with
+        :meth:`_upload_part`, :meth:`_complete_multipart_upload` and
+        :meth:`_abort_multipart_upload`.
+
+        :return: A provider specific handle identifying the upload.
+        """
+        raise NotImplementedError(
+            "Multipart uploads are not supported by this provider")
+
+    def _upload_part(self, upload, part_number, data):
+        """
+        Upload a single part. May be called concurrently from several threads.
+
+        :return: A provider specific description of the uploaded part, which
+                 is handed to :meth:`_complete_multipart_upload`.
+        """
+        raise NotImplementedError(
+            "Multipart uploads are not supported by this provider")
+
+    def _complete_multipart_upload(self, upload, parts):
+        raise NotImplementedError(
+            "Multipart uploads are not supported by this provider")
+
+    def _abort_multipart_upload(self, upload):
+        pass
+
+    # Suffix of the file recording the progress of a download to a path
+    DOWNLOAD_STATE_SUFFIX = '.cbpart'
+
+    def download_to(self, target, concurrency=None, chunk_size=None):
+        config = self._provider.config
+        concurrency = concurrency or config.default_transfer_concurrency
+        chunk_size = chunk_size or config.default_download_chunk_size
+        size = self.size
+        ranges = [(start, min(start + chunk_size, size) - 1)
+                  for start in range(0, size, chunk_size)]
+        if isinstance(target, six.string_types):
+            digest = self._download_to_path(target, ranges, concurrency,
+                                            chunk_size)
+        else:
+            digest = self._download_to_stream(target, ranges, concurrency)
+        expected = self._content_md5()
+        if expected and expected != digest:
+            raise TransferIntegrityException(
+                "Checksum mismatch for {0}: expected {1}, got {2}".format(
+                    self.name, expected, digest))
+        return True
+
+    def _download_to_stream(self, target, ranges, concurrency):
+        retryer = self._transfer_retryer()
+        md5 = hashlib.md5()
+        pending = collections.deque()
+
+        def write_next():
+            data = pending.popleft().result()
+            target.write(data)
+            md5.update(data)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for start, end in ranges:
+                pending.append(
+                    executor.submit(retryer.call, self._read_range, start,
+                                    end))
+                # Fetch ahead, but hold at most ``concurrency`` ranges
+                if len(pending) >= concurrency:
+                    write_next()
+            while pending:
+                write_next()
+        return md5.hexdigest()
+
+    def _download_to_path(self, path, ranges, concurrency, chunk_size):
+        state_path = path + self.DOWNLOAD_STATE_SUFFIX
+        # Identifies the version of the object being downloaded, so that a
+        # download is not resumed against an object that has since changed
+        fingerprint = {'size': self.size, 'last_modified': self.last_modified,
+                       'chunk_size': chunk_size}
+        state = dict(fingerprint, done=[])
+        try:
+            with open(state_path) as f:
+                saved = json.load(f)
+            if (all(saved.get(k) == v for k, v in fingerprint.items()) and
+                    os.path.getsize(path) == self.size):
+                state = saved
+                log.debug("Resuming download of %s to %s (%s of %s ranges "
+                          "done)", self.name, path, len(saved['done']),
+                          len(ranges))
+        except (IOError, OSError, ValueError):
+            pass
+        done = set(state['done'])
+
+        retryer = self._transfer_retryer()
+        lock = threading.Lock()
+        last_saved = [time.time()]
+
+        def save_state(force=False):
+            # Progress is persisted at most once a second
+            if force or time.time() - last_saved[0] > 1:
+                state['done'] = sorted(done)
+                cb_helpers.atomic_write(state_path,
+                                        json.dumps(state).encode('utf-8'))
+                last_saved[0] = time.time()
+
+        with open(path, 'r+b' if state['done'] else 'wb') as f:
+            f.truncate(self.size)
+
+            def fetch(index, start, end):
+                data = retryer.call(self._read_range, start, end)
+                if hasattr(os, 'pwrite'):
+                    os.pwrite(f.fileno(), data, start)
+                    with lock:
+                        done.add(index)
+                        save_state()
+                else:
+                    with lock:
+                        f.seek(start)
+                        f.write(data)
+                        f.flush()
+                        done.add(index)
+                        save_state()
+
+            try:
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    futures = [executor.submit(fetch, index, start, end)
+                               for index, (start, end) in enumerate(ranges)
+                               if index not in done]
+                    for future in futures:
+                        future.result()
+            finally:
+                with lock:
+                    save_state(force=True)
+
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(1024 * 1024), b''):
+                md5.update(data)
+        os.remove(state_path)
+        return md5.hexdigest()
+
+    def copy_to(self, target_bucket, name=None, concurrency=None):
+        name = name or self.name
+        # pylint:disable=protected-access
+        if (target_bucket._provider is self._provider and
+                self._server_side_copy(target_bucket, name)):
+            log.debug("Copied %s to %s/%s on the server", self.name,
+                      target_bucket.name, name)
+            return target_bucket.objects.get(name)
+
+        # Pipe ranged reads of this object into a multipart upload, so that
+        # at most a few parts are held in memory at any one time
+        config = target_bucket._provider.config
+        concurrency = concurrency or config.default_transfer_concurrency
+        part_size = config.default_upload_part_size
+        reader = RangedReader(self, part_size, prefetch=concurrency)
+        try:
+            target_bucket.objects.create(name).upload_stream(
+                reader, part_size=part_size, concurrency=concurrency)
+        finally:
+            reader.close()
+        return target_bucket.objects.get(name)
+
+    def _server_side_copy(self, target_bucket, name):
+        """
+        Copy this object to ``target_bucket``, on the same provider, without
+        transferring its content through the client.
+
+        :rtype: ``bool``
+        :return: ``True`` if the object was copied, ``False`` if the provider
+                 does not support server side copies, in which case the
+                 content is streamed instead.
+        """
+        return False
+
+    def _read_range(self, start, end):
+        """
+        Return the bytes of this object from ``start`` to ``end``
+        (inclusive). May be called concurrently from several threads.
+        Providers supporting :meth:`download_to` must implement this method.
+        """
+        raise NotImplementedError(
+            "Ranged downloads are not supported by this provider")
+
+    def _content_md5(self):
+        """
+        Return the hex encoded MD5 digest of this object's contents, as
+        reported by the provider, or ``None`` if it is not known.
+        """
+        return None
+
+    def _listing_md5(self):
+        """
+        Return the hex encoded MD5 digest of this object's contents if it is
+        known without making further requests to the provider (e.g., from
+        the listing the object was returned by), or ``None``.
+        """
+        return None
 
     def __eq__(self, other):
         return (isinstance(other, BucketObject) and
@@ -876,6 +1637,14 @@ class BaseBucket(BaseCloudResource, Bucket):
     def __init__(self, provider):
         super(BaseBucket, self).__init__(provider)
 
+    def _delete_contents(self):
+        failures = self.objects.delete_many('')
+        if failures:
+            raise ProviderInternalException(
+                "Could not delete {0} object(s) from bucket {1}, e.g. {2}"
+                .format(len(failures), self.name,
+                        next(iter(failures.items()))))
+
     @staticmethod
     def is_valid_resource_name(name):
         return True if BaseBucket.CB_NAME_PATTERN.match(name) else False
@@ -912,6 +1681,73 @@ class BaseBucketContainer(BasePageableObjectMixin, BucketContainer):
     def _provider(self):
         return self.__provider
 
+    # Number of objects listed per request by iter_objects, which defaults
+    # to config.default_result_limit. Providers set it to the maximum page
+    # size of their listings, as bulk operations iterate through all objects.
+    ITER_PAGE_SIZE = None
+
+    def iter_objects(self, prefix=None):
+        return self._iter_pages(limit=self.ITER_PAGE_SIZE, prefix=prefix)
+
+    # Number of objects deleted by a single call to _delete_batch
+    DELETE_BATCH_SIZE = 100
+
+    def delete_many(self, keys_or_prefix, concurrency=None):
+        concurrency = (concurrency or
+                       self._provider.config.default_transfer_concurrency)
+        if isinstance(keys_or_prefix, six.string_types):
+            keys = (obj.name for obj in
+                    self.iter_objects(prefix=keys_or_prefix or None))
+        else:
+            keys = (key.name if isinstance(key, BucketObject) else key
+                    for key in keys_or_prefix)
+        # Bounds the number of batches read ahead of the deletions
+        slots = threading.BoundedSemaphore(concurrency * 2)
+
+        def delete_batch(batch):
+            try:
+                return self._delete_batch(batch)
+            except Exception as e:
+                log.exception("Could not delete a batch of objects from %s",
+                              self.bucket.name)
+                return dict((key, str(e)) for key in batch)
+            finally:
+                slots.release()
+
+        failures = {}
+        futures = []
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                batch = list(itertools.islice(keys, self.DELETE_BATCH_SIZE))
+                if not batch:
+                    break
+                slots.acquire()
+                futures.append(executor.submit(delete_batch, batch))
+                # Collect finished batches so their results can be released
+                while futures and futures[0].done():
+                    failures.update(futures.pop(0).result())
+        for future in futures:
+            failures.update(future.result())
+        self._invalidate_listings()
+        return failures
+
+    def _delete_batch(self, keys):
+        """
+        Delete the objects named ``keys``, returning a dict mapping the name
+        of each object that could not be deleted to the reason. May be called
+        concurrently from several threads. Providers should override this
+        method to use a bulk delete operation where one is available.
+        """
+        failures = {}
+        for key in keys:
+            try:
+                obj = self.get(key)
+                if obj:
+                    obj.delete()
+            except Exception as e:
+                failures[key] = str(e)
+        return failures
+
 
 class BaseGatewayContainer(GatewayContainer, BasePageableObjectMixin):
 
@@ -922,6 +1758,9 @@ class BaseGatewayContainer(GatewayContainer, BasePageableObjectMixin):
 
 class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
 
+    READY_STATES = (NetworkState.AVAILABLE,)
+    READY_TERMINAL_STATES = (NetworkState.ERROR,)
+
     CB_DEFAULT_NETWORK_NAME = os.environ.get('CB_DEFAULT_NETWORK_NAME',
                                              'cloudbridge-net')
 
@@ -932,13 +1771,6 @@ class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
         return "<CB-{0}: {1} ({2})>".format(self.__class__.__name__,
                                             self.id, self.name)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [NetworkState.AVAILABLE],
-            terminal_states=[NetworkState.ERROR],
-            timeout=timeout,
-            interval=interval)
-
     def create_subnet(self, name, cidr_block, zone=None):
         return self._provider.networking.subnets.create(
             name=name, network=self, cidr_block=cidr_block, zone=zone)
@@ -952,6 +1784,9 @@ class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
 
 class BaseSubnet(BaseCloudResource, BaseObjectLifeCycleMixin, Subnet):
 
+    READY_STATES = (SubnetState.AVAILABLE,)
+    READY_TERMINAL_STATES = (SubnetState.ERROR,)
+
     CB_DEFAULT_SUBNET_NAME = os.environ.get('CB_DEFAULT_SUBNET_NAME',
                                             'cloudbridge-subnet')
 
@@ -968,13 +1803,6 @@ class BaseSubnet(BaseCloudResource, BaseObjectLifeCycleMixin, Subnet):
                 self._provider == other._provider and
                 self.id == other.id)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [SubnetState.AVAILABLE],
-            terminal_states=[SubnetState.ERROR],
-            timeout=timeout,
-            interval=interval)
-
 
 class BaseFloatingIPContainer(FloatingIPContainer, BasePageableObjectMixin):
 
@@ -987,10 +1815,8 @@ class BaseFloatingIPContainer(FloatingIPContainer, BasePageableObjectMixin):
         return self.__provider
 
     def find(self, **kwargs):
-        obj_list = self
         filters = ['name', 'public_ip']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(filters, kwargs)
 
     def delete(self, fip_id):
         floating_ip = self.get(fip_id)
@@ -1000,6 +1826,9 @@ class BaseFloatingIPContainer(FloatingIPContainer, BasePageableObjectMixin):
 
 class BaseFloatingIP(BaseCloudResource, BaseObjectLifeCycleMixin, FloatingIP):
 
+    READY_STATES = (FloatingIpState.AVAILABLE, FloatingIpState.IN_USE)
+    READY_TERMINAL_STATES = (FloatingIpState.ERROR,)
+
     def __init__(self, provider):
         super(BaseFloatingIP, self).__init__(provider)
 
@@ -1013,13 +1842,6 @@ class BaseFloatingIP(BaseCloudResource, BaseObjectLifeCycleMixin, FloatingIP):
         return (FloatingIpState.IN_USE if self.in_use
                 else FloatingIpState.AVAILABLE)
 
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [FloatingIpState.AVAILABLE, FloatingIpState.IN_USE],
-            terminal_states=[FloatingIpState.ERROR],
-            timeout=timeout,
-            interval=interval)
-
     def __repr__(self):
         return "<CB-{0}: {1} ({2})>".format(self.__class__.__name__,
                                             self.id, self.public_ip)
@@ -1053,6 +1875,9 @@ class BaseRouter(BaseCloudResource, Router):
 class BaseInternetGateway(BaseCloudResource, BaseObjectLifeCycleMixin,
                           InternetGateway):
 
+    READY_STATES = (GatewayState.AVAILABLE,)
+    READY_TERMINAL_STATES = (GatewayState.ERROR, GatewayState.UNKNOWN)
+
     CB_DEFAULT_INET_GATEWAY_NAME = os.environ.get(
         'CB_DEFAULT_INET_GATEWAY_NAME', 'cloudbridge-inetgateway')
 
@@ -1069,10 +1894,3 @@ class BaseInternetGateway(BaseCloudResource, BaseObjectLifeCycleMixin,
                 # pylint:disable=protected-access
                 self._provider == other._provider and
                 self.id == other.id)
-
-    def wait_till_ready(self, timeout=None, interval=None):
-        self.wait_for(
-            [GatewayState.AVAILABLE],
-            terminal_states=[GatewayState.ERROR, GatewayState.UNKNOWN],
-            timeout=timeout,
-            interval=interval)
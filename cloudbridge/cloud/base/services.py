@@ -2,8 +2,8 @@
 Base implementation for services available through a provider
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.interfaces.resources import Router
 from cloudbridge.cloud.interfaces.services import BucketService
 from cloudbridge.cloud.interfaces.services import CloudService
@@ -23,8 +23,9 @@ from cloudbridge.cloud.interfaces.services import VMFirewallService
 from cloudbridge.cloud.interfaces.services import VMTypeService
 from cloudbridge.cloud.interfaces.services import VolumeService
 
+from .cache import TTLCache
+from .resources import BaseInstance
 from .resources import BasePageableObjectMixin
-from .resources import ClientPagedResultList
 
 log = logging.getLogger(__name__)
 
@@ -120,18 +121,17 @@ class BaseVMFirewallService(
 class BaseVMTypeService(
         BasePageableObjectMixin, VMTypeService, BaseCloudService):
 
+    CACHE_FIND_INDEX = True
+
     def __init__(self, provider):
         super(BaseVMTypeService, self).__init__(provider)
 
     def get(self, vm_type_id):
-        vm_type = (t for t in self if t.id == vm_type_id)
-        return next(vm_type, None)
+        vm_type = self._find_index().find(id=vm_type_id)
+        return vm_type[0] if vm_type else None
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(['name'], kwargs)
 
 
 class BaseInstanceService(
@@ -140,18 +140,60 @@ class BaseInstanceService(
     def __init__(self, provider):
         super(BaseInstanceService, self).__init__(provider)
 
+    def _expand(self, results, expand):
+        """
+        Prefetch the related objects named in ``expand`` for the instances
+        in a page of ``results``, and return the results.
+        """
+        for name in expand or []:
+            if name not in BaseInstance.EXPANDABLE:
+                raise ValueError(
+                    "Cannot expand %s. Supported relations: %s"
+                    % (name, BaseInstance.EXPANDABLE))
+        if expand and results:
+            instances = list(results)
+            # pylint:disable=protected-access
+            type(instances[0])._expand_many(self.provider, instances, expand)
+        return results
+
 
 class BaseRegionService(
         BasePageableObjectMixin, RegionService, BaseCloudService):
 
+    CACHE_FIND_INDEX = True
+    # The most regions whose zones are fetched in parallel
+    ZONE_FETCH_CONCURRENCY = 20
+
     def __init__(self, provider):
         super(BaseRegionService, self).__init__(provider)
+        self._zone_cache = TTLCache(provider.config.metadata_cache_ttl)
+
+    def _with_zones(self, results, include_zones):
+        """
+        Attach their zones to the regions in a page of ``results``. The zones
+        of all regions are fetched in parallel, and reused for
+        ``config.metadata_cache_ttl`` seconds.
+        """
+        if not include_zones:
+            return results
+        zones = dict((region.id, self._zone_cache.get(region.id))
+                     for region in results)
+        missing = [region for region in results if zones[region.id] is None]
+        if missing:
+            workers = min(len(missing), self.ZONE_FETCH_CONCURRENCY)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # pylint:disable=protected-access
+                fetched = executor.map(lambda r: r._fetch_zones(), missing)
+                for region, region_zones in zip(missing, fetched):
+                    zones[region.id] = region_zones
+                    self._zone_cache.set(region.id, region_zones)
+        for region in results:
+            # pylint:disable=protected-access
+            region._zones = zones[region.id]
+        return results
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(['name'], kwargs)
 
 
 class BaseNetworkingService(NetworkingService, BaseCloudService):
@@ -185,10 +227,7 @@ class BaseSubnetService(
         super(BaseSubnetService, self).__init__(provider)
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(['name'], kwargs)
 
 
 class BaseRouterService(
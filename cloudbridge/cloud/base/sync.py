@@ -0,0 +1,234 @@
+"""
+Synchronization of a local directory or a bucket to a bucket.
+"""
+import collections
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cloudbridge.cloud.base.helpers as cb_helpers
+
+import six
+
+log = logging.getLogger(__name__)
+
+# Outcome of a ``sync`` call
+SyncResult = collections.namedtuple(
+    'SyncResult', ['transferred', 'deleted', 'skipped', 'failed'])
+
+# Format of BucketObject.last_modified
+LAST_MODIFIED_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _file_md5(path):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(1024 * 1024), b''):
+            md5.update(data)
+    return md5.hexdigest()
+
+
+class _Manifest(object):
+    """
+    Remembers the MD5 of local files by path, size and modification time so
+    that unchanged files are not hashed again on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path) as f:
+                    self._entries = json.load(f)
+            except (IOError, OSError, ValueError):
+                log.debug("Starting a new sync manifest at %s", path)
+
+    def md5(self, relpath, path, size, mtime):
+        with self._lock:
+            entry = self._entries.get(relpath)
+        if entry and entry['size'] == size and entry['mtime'] == mtime:
+            return entry['md5']
+        digest = _file_md5(path)
+        with self._lock:
+            self._entries[relpath] = {'size': size, 'mtime': mtime,
+                                      'md5': digest}
+        return digest
+
+    def save(self):
+        if self.path:
+            cb_helpers.atomic_write(
+                self.path, json.dumps(self._entries).encode('utf-8'))
+
+
+class _Source(object):
+    """
+    An item to synchronize: either a local file or a bucket object.
+    """
+
+    def __init__(self, key, size, last_modified, md5=None, path=None,
+                 relpath=None, mtime=None, obj=None):
+        self.key = key
+        self.size = size
+        self.last_modified = last_modified
+        self.md5 = md5
+        self.path = path
+        self.relpath = relpath
+        self.mtime = mtime
+        self.obj = obj
+
+
+def _local_sources(local_dir, prefix):
+    for dirpath, _, filenames in os.walk(local_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relpath = os.path.relpath(path, local_dir).replace(os.sep, '/')
+            stat = os.stat(path)
+            yield _Source(
+                prefix + relpath, stat.st_size,
+                datetime.datetime.utcfromtimestamp(stat.st_mtime).strftime(
+                    LAST_MODIFIED_FORMAT),
+                path=path, relpath=relpath, mtime=stat.st_mtime)
+
+
+def _bucket_sources(bucket, prefix):
+    for obj in bucket.objects.iter_objects(prefix=prefix or None):
+        # pylint:disable=protected-access
+        yield _Source(obj.name, obj.size, obj.last_modified,
+                      md5=obj._listing_md5(), obj=obj)
+
+
+def _is_unchanged(source, target, manifest):
+    if source.size != target.size:
+        return False
+    # pylint:disable=protected-access
+    target_md5 = target._listing_md5()
+    if target_md5:
+        source_md5 = source.md5
+        if source.path and not source_md5:
+            source_md5 = manifest.md5(source.relpath, source.path,
+                                      source.size, source.mtime)
+        if source_md5:
+            return source_md5 == target_md5
+    # Without checksums to compare, fall back to modification times
+    return source.last_modified <= target.last_modified
+
+
+def sync(source, target_bucket, prefix=None, delete=False, concurrency=None,
+         manifest=None):
+    """
+    Make the objects under ``prefix`` in ``target_bucket`` match ``source``,
+    transferring only what has changed.
+
+    The target is listed in a single paged pass. A source file or object is
+    transferred only if the target has no object of the same name, or if
+    the sizes differ, or if the MD5 checksums differ. Where a checksum is
+    not available (e.g., for objects uploaded in parts), an object counts
+    as unchanged if it is at least as recent as the source. Transfers are
+    made in parallel by up to ``concurrency`` threads.
+
+    Example:
+
+    .. code-block:: python
+
+        from cloudbridge.cloud.base.sync import sync
+
+        bucket = provider.storage.buckets.get('website')
+        result = sync('/srv/site', bucket, prefix='site/', delete=True,
+                      manifest='/var/cache/site.manifest')
+        print("Uploaded %d files" % len(result.transferred))
+
+    :type source: ``str`` or :class:`.Bucket`
+    :param source: A local directory, or a bucket (of any provider) whose
+                   objects under ``prefix`` are copied with
+                   :meth:`.BucketObject.copy_to`.
+
+    :type target_bucket: :class:`.Bucket`
+    :param target_bucket: The bucket to synchronize.
+
+    :type prefix: ``str``
+    :param prefix: The prefix under which files are stored in the target.
+                   When ``source`` is a directory, object names are the
+                   prefix followed by the path of each file relative to
+                   the directory.
+
+    :type delete: ``bool``
+    :param delete: Whether to delete objects under ``prefix`` in the target
+                   that do not exist in the source.
+
+    :type concurrency: ``int``
+    :param concurrency: The number of transfers made in parallel. If not
+                        specified, the ``default_transfer_concurrency``
+                        defined in the config of the target provider will
+                        apply.
+
+    :type manifest: ``str``
+    :param manifest: Path of a file in which to remember the checksums of
+                     local files, so that files whose size and modification
+                     time are unchanged are not hashed again.
+
+    :rtype: ``namedtuple``
+    :return: A ``SyncResult`` of the names of the objects ``transferred``,
+             ``deleted`` and ``skipped``, and a ``failed`` dict of the
+             reason each failed object could not be transferred or deleted.
+    """
+    prefix = prefix or ''
+    # pylint:disable=protected-access
+    concurrency = (concurrency or
+                   target_bucket._provider.config.default_transfer_concurrency)
+    manifest = _Manifest(manifest)
+    targets = dict((obj.name, obj) for obj in
+                   target_bucket.objects.iter_objects(prefix=prefix or None))
+    if isinstance(source, six.string_types):
+        sources = _local_sources(source, prefix)
+    else:
+        sources = _bucket_sources(source, prefix)
+
+    result = SyncResult([], [], [], {})
+    lock = threading.Lock()
+    # Bounds the number of pending transfers
+    slots = threading.BoundedSemaphore(concurrency * 2)
+
+    def transfer(item):
+        try:
+            target = targets.get(item.key)
+            if target and _is_unchanged(item, target, manifest):
+                with lock:
+                    result.skipped.append(item.key)
+                return
+            if item.path:
+                target_bucket.objects.create(item.key).upload_from_file(
+                    item.path)
+            else:
+                item.obj.copy_to(target_bucket, item.key)
+            with lock:
+                result.transferred.append(item.key)
+        except Exception as e:
+            log.exception("Could not sync %s", item.key)
+            with lock:
+                result.failed[item.key] = str(e)
+        finally:
+            slots.release()
+
+    seen = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for item in sources:
+            seen.add(item.key)
+            slots.acquire()
+            executor.submit(transfer, item)
+
+    if delete:
+        extra = [key for key in targets if key not in seen]
+        failures = target_bucket.objects.delete_many(extra, concurrency)
+        result.failed.update(failures)
+        result.deleted.extend(key for key in extra if key not in failures)
+    manifest.save()
+    log.debug("Synced %s to %s: %d transferred, %d deleted, %d skipped, %d "
+              "failed", source, target_bucket.name, len(result.transferred),
+              len(result.deleted), len(result.skipped), len(result.failed))
+    return result
@@ -1,13 +1,12 @@
 import importlib
-import inspect
 import logging
-import pkgutil
 from collections import defaultdict
 
-from cloudbridge.cloud import providers
 from cloudbridge.cloud.interfaces import CloudProvider
 from cloudbridge.cloud.interfaces import TestMockHelperMixin
 
+import six
+
 
 log = logging.getLogger(__name__)
 
@@ -18,6 +17,26 @@ class ProviderList(object):
     AZURE = 'azure'
 
 
+# The provider implementations within the ``cloudbridge.cloud.providers``
+# package, by provider id. A provider's module, and the cloud SDKs it
+# depends on, are only imported once its class is requested.
+PROVIDER_CLASSES = {
+    ProviderList.AWS: {
+        'class': 'cloudbridge.cloud.providers.aws.provider.AWSCloudProvider',
+        'mock_class':
+            'cloudbridge.cloud.providers.aws.provider.MockAWSCloudProvider'
+    },
+    ProviderList.OPENSTACK: {
+        'class': 'cloudbridge.cloud.providers.openstack.provider.'
+                 'OpenStackCloudProvider'
+    },
+    ProviderList.AZURE: {
+        'class': 'cloudbridge.cloud.providers.azure.provider.'
+                 'AzureCloudProvider'
+    }
+}
+
+
 class CloudProviderFactory(object):
 
     """
@@ -69,34 +88,34 @@ class CloudProviderFactory(object):
 
     def discover_providers(self):
         """
-        Discover all available providers within the
-        ``cloudbridge.cloud.providers`` package.
-        Note that this methods does not guard against a failed import.
+        Register all providers within the ``cloudbridge.cloud.providers``
+        package, as listed in ``PROVIDER_CLASSES``. Providers are registered
+        by class path, and their modules are only imported when their
+        classes are requested.
         """
-        for _, modname, _ in pkgutil.iter_modules(providers.__path__):
-            log.debug("Importing provider: %s", modname)
-            self._import_provider(modname)
+        for provider_id, impl in PROVIDER_CLASSES.items():
+            for kind, class_path in impl.items():
+                self.provider_list[provider_id].setdefault(kind, class_path)
 
-    def _import_provider(self, module_name):
+    def _load_provider(self, provider_id):
         """
-        Imports and registers providers from the given module name.
-        Raises an ImportError if the import does not succeed.
+        Import the classes of the given provider that are only registered by
+        class path, and return its implementations.
+        Note that this method does not guard against a failed import.
         """
-        log.debug("Importing providers from %s", module_name)
-        module = importlib.import_module(
-            "{0}.{1}".format(providers.__name__,
-                             module_name))
-        classes = inspect.getmembers(module, inspect.isclass)
-        for _, cls in classes:
-            log.debug("Registering the provider: %s", cls)
-            self.register_provider_class(cls)
+        impl = self.provider_list.get(provider_id)
+        if impl:
+            for kind, cls in list(impl.items()):
+                if isinstance(cls, six.string_types):
+                    module_name, _, class_name = cls.rpartition('.')
+                    log.debug("Importing provider class %s", cls)
+                    module = importlib.import_module(module_name)
+                    impl[kind] = getattr(module, class_name)
+        return impl
 
     def list_providers(self):
         """
-        Get a list of available providers.
-
-        It uses a simple automatic discovery system by iterating through all
-        submodules in cloudbridge.cloud.providers.
+        Get a list of available providers. This imports all of them.
 
         :rtype: dict
         :return: A dict of available providers and their implementations in the
@@ -109,6 +128,8 @@ class CloudProviderFactory(object):
         """
         if not self.provider_list:
             self.discover_providers()
+        for provider_id in list(self.provider_list):
+            self._load_provider(provider_id)
         log.debug("List of available providers: %s", self.provider_list)
         return self.provider_list
 
@@ -156,7 +177,9 @@ class CloudProviderFactory(object):
                  if the provider was not found.
         """
         log.debug("Returning a class for the %s provider", name)
-        impl = self.list_providers().get(name)
+        if not self.provider_list:
+            self.discover_providers()
+        impl = self._load_provider(name)
         if impl:
             if get_mock and impl.get("mock_class"):
                 log.debug("param get_mock set to True, returning "
@@ -78,3 +78,12 @@ class DuplicateResourceException(CloudBridgeBaseException):
     result in a DuplicateResourceException.
     """
     pass
+
+
+class TransferIntegrityException(CloudBridgeBaseException):
+    """
+    Marker interface for data transfer errors.
+    Thrown when the contents of a transferred object do not match the
+    checksum reported by the provider.
+    """
+    pass
@@ -102,6 +102,68 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractmethod
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        """
+        Wait for a collection of objects, such as a batch of newly launched
+        instances, to reach a set of desired target states.
+
+        This is the bulk counterpart of
+        :meth:`.ObjectLifeCycleMixin.wait_for`. Rather than refreshing each
+        object individually, pending objects are grouped by type and each
+        group is refreshed with a single batched call to the provider where
+        the provider supports it, which considerably reduces the number of
+        requests made while waiting. Unlike ``wait_for``, this method does
+        not raise a ``WaitStateException`` when some of the objects fail to
+        reach a target state; the outcome for each object is reported in the
+        returned result instead.
+
+        Example:
+
+        .. code-block:: python
+
+            instances = [provider.compute.instances.create(...)
+                         for _ in range(200)]
+            result = provider.wait_for_all(
+                instances, [InstanceState.RUNNING],
+                terminal_states=[InstanceState.DELETED, InstanceState.ERROR])
+            for inst in result.terminal + result.timed_out:
+                print("Instance %s failed to start: %s" % (inst, inst.state))
+
+        :type resources: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :param resources: The objects to wait for.
+
+        :type target_states: ``list`` of states
+        :param target_states: The list of target states to wait for.
+
+        :type terminal_states: ``list`` of states
+        :param terminal_states: A list of terminal states after which an
+                                object will not transition into a target state.
+
+        :type timeout: ``int`` or ``list`` of ``int``
+        :param timeout: The maximum length of time (in seconds) to wait for
+                        the objects. Either a single timeout for all of them,
+                        or a list with the timeout of each object, in the
+                        order of ``resources``. An object that times out is
+                        no longer polled, while the others continue to be.
+                        If no timeout is specified, the global
+                        default_wait_timeout defined in the provider config
+                        will apply.
+
+        :type interval: ``int``
+        :param interval: The frequency with which to poll the objects' states.
+                         If no interval is specified, the global
+                         default_wait_interval defined in the provider config
+                         will apply.
+
+        :rtype: ``tuple``
+        :return: A named tuple of three lists, ``ready``, ``terminal`` and
+                 ``timed_out``, which partition the supplied objects by the
+                 outcome of the wait.
+        """
+        pass
+
 #     @abstractproperty
 #     def account(self):
 #         """
@@ -558,6 +558,29 @@ class Instance(ObjectLifeCycleMixin, CloudResource):
         """
         pass
 
+    @abstractproperty
+    def subnet_id(self):
+        """
+        Get the ID of the subnet of this instance's primary network
+        interface.
+
+        :rtype: ``str``
+        :return: The subnet ID, or ``None`` if the instance is not attached
+                 to a subnet.
+        """
+        pass
+
+    @abstractproperty
+    def subnet(self):
+        """
+        Get the subnet of this instance's primary network interface.
+
+        :rtype: :class:`.Subnet`
+        :return: The subnet, or ``None`` if the instance is not attached to
+                 a subnet.
+        """
+        pass
+
     @abstractproperty
     def key_pair_name(self):
         """
@@ -2128,10 +2151,15 @@ class BucketObject(CloudResource):
         pass
 
     @abstractmethod
-    def iter_content(self):
+    def iter_content(self, chunk_size=None):
         """
         Returns this object's content as an iterable.
 
+        :type chunk_size: ``int``
+        :param chunk_size: The size, in bytes, of the chunks to read. If not
+                           specified, the ``default_read_chunk_size`` defined
+                           in the provider config will apply.
+
         :rtype: Iterable
         :return: An iterable of the file contents
 
@@ -2145,6 +2173,87 @@ class BucketObject(CloudResource):
         """
         pass
 
+    @abstractmethod
+    def download_to(self, target, concurrency=None, chunk_size=None):
+        """
+        Download the contents of this object to a local file or a file-like
+        object, fetching byte ranges of ``chunk_size`` bytes in parallel.
+
+        When ``target`` is a path, the file is preallocated and each range is
+        written at its offset as soon as it arrives. Progress is recorded in
+        a ``<target>.cbpart`` state file next to it, so that a download which
+        is interrupted resumes where it left off when ``download_to`` is
+        called again with the same arguments. When ``target`` is a file-like
+        object, ranges are fetched ahead in parallel but written in order.
+
+        Once complete, the contents are checked against the MD5 checksum
+        reported by the provider, if one is available, and a
+        ``TransferIntegrityException`` is raised if they differ.
+
+        Example:
+
+        .. code-block:: python
+
+            obj = provider.storage.buckets.get('data').objects.get('ref.tar')
+            obj.download_to('/data/ref.tar', concurrency=8)
+
+        :type target: ``str`` or ``file``
+        :param target: Path of the file to write to, or a file-like object
+                       opened in binary mode.
+
+        :type concurrency: ``int``
+        :param concurrency: The number of ranges to fetch in parallel. If not
+                            specified, the ``default_transfer_concurrency``
+                            defined in the provider config will apply.
+
+        :type chunk_size: ``int``
+        :param chunk_size: The size of each range in bytes. If not specified,
+                           the ``default_download_chunk_size`` defined in the
+                           provider config will apply.
+
+        :rtype: ``bool``
+        :return: ``True`` if successful.
+        """
+        pass
+
+    @abstractmethod
+    def copy_to(self, target_bucket, name=None, concurrency=None):
+        """
+        Copy this object to a bucket, which may belong to another provider.
+
+        If the target bucket belongs to the same provider as this object, the
+        copy is made by the provider without the content passing through the
+        client (S3 copies, Swift server side copies or Azure blob copies).
+        Otherwise, the content is streamed from ranged reads of this object
+        straight into a multipart upload, so only a few parts are ever held
+        in memory.
+
+        Example:
+
+        .. code-block:: python
+
+            target = os_provider.storage.buckets.get('datasets')
+            obj = aws_provider.storage.buckets.get('data').objects.get('a.tar')
+            copy = obj.copy_to(target, concurrency=8)
+
+        :type target_bucket: :class:`.Bucket`
+        :param target_bucket: The bucket to copy the object to.
+
+        :type name: ``str``
+        :param name: The name of the copy. Defaults to the name of this
+                     object.
+
+        :type concurrency: ``int``
+        :param concurrency: The number of parts to transfer in parallel when
+                            the content is streamed. If not specified, the
+                            ``default_transfer_concurrency`` defined in the
+                            config of the target provider will apply.
+
+        :rtype: :class:`.BucketObject`
+        :return: The copy.
+        """
+        pass
+
     @abstractmethod
     def upload(self, source_stream):
         """
@@ -2166,6 +2275,53 @@ class BucketObject(CloudResource):
         """
         pass
 
+    @abstractmethod
+    def upload_stream(self, fileobj, part_size=None, concurrency=None):
+        """
+        Set the contents of this object to the data read from a file-like
+        object, using the provider's multipart upload mechanism (S3 multipart
+        uploads, Azure block blobs or Swift static large objects).
+
+        The source is read in parts of ``part_size`` bytes, which are sent in
+        parallel by up to ``concurrency`` threads. At most ``concurrency``
+        parts are held in memory at any one time, so memory use is bounded
+        regardless of the size of the object. A part that fails to upload is
+        retried on its own, without restarting the whole upload.
+
+        Example:
+
+        .. code-block:: python
+
+            with open('/data/reference.tar', 'rb') as f:
+                obj.upload_stream(f, part_size=64 * 1024 * 1024,
+                                  concurrency=8)
+
+        :type fileobj: ``file``
+        :param fileobj: A file-like object, opened in binary mode, to read the
+                        contents from.
+
+        :type part_size: ``int``
+        :param part_size: The size of each part in bytes. If not specified,
+                          the ``default_upload_part_size`` defined in the
+                          provider config will apply. Providers limit the
+                          number of parts of an upload (10000 on AWS, 1000
+                          on OpenStack) and AWS requires parts of at least
+                          5 MiB, so large objects require larger parts.
+
+        :type concurrency: ``int``
+        :param concurrency: The number of parts to upload in parallel. If not
+                            specified, the ``default_transfer_concurrency``
+                            defined in the provider config will apply.
+
+        :rtype: ``bool``
+        :return: ``True`` if successful.
+
+        :raise InvalidValueException: If ``part_size`` is too small for the
+                                      provider, or the object needs more
+                                      parts than the provider allows.
+        """
+        pass
+
     @abstractmethod
     def delete(self):
         """
@@ -2243,7 +2399,8 @@ class Bucket(CloudResource):
 
         :type delete_contents: ``bool``
         :param delete_contents: If ``True``, all objects within the bucket
-                                will be deleted.
+                                will be deleted first, in bulk (see
+                                :meth:`.BucketContainer.delete_many`).
 
         :rtype: ``bool``
         :return: ``True`` if successful.
@@ -2290,6 +2447,104 @@ class BucketContainer(PageableObjectMixin):
         """
         pass
 
+    @abstractmethod
+    def list_prefixes(self, prefix=None, delimiter='/'):
+        """
+        List one level of a hierarchy of object names, as in a directory
+        listing. Object names are split on ``delimiter``: the names of the
+        objects directly under ``prefix`` are returned as objects, while all
+        deeper names are rolled up into their common prefixes. This is done
+        by the provider, so objects nested deeper are never enumerated.
+
+        Example:
+
+        .. code-block:: python
+
+            # Given objects a.txt, logs/1.txt and logs/2017/2.txt
+            listing = bucket.objects.list_prefixes()
+            print(listing.prefixes)  # ['logs/']
+            print(listing.objects)  # [<BucketObject: a.txt>]
+            listing = bucket.objects.list_prefixes(prefix='logs/')
+            print(listing.prefixes)  # ['logs/2017/']
+            print(listing.objects)  # [<BucketObject: logs/1.txt>]
+
+        :type prefix: ``str``
+        :param prefix: The "directory" to list. Should normally end with the
+                       delimiter.
+
+        :type delimiter: ``str``
+        :param delimiter: The character used to separate levels in object
+                          names.
+
+        :rtype: ``namedtuple``
+        :return: A tuple of ``prefixes``, a list of the common prefixes (each
+                 including its trailing delimiter), and ``objects``, a list of
+                 the :class:``.BucketObject`` directly under ``prefix``.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, keys_or_prefix, concurrency=None):
+        """
+        Delete several objects from this bucket, using the provider's bulk
+        delete operation where one is available (S3 multi-object delete or
+        the Swift bulk delete middleware).
+
+        Objects are deleted in batches by up to ``concurrency`` threads. When
+        a prefix is given, the objects to delete are read from a paged
+        listing as deletion progresses, so any number of objects can be
+        deleted without listing them all first.
+
+        Example:
+
+        .. code-block:: python
+
+            failures = bucket.objects.delete_many('logs/2016/')
+            for key, error in failures.items():
+                print("Could not delete %s: %s" % (key, error))
+
+        :type keys_or_prefix: ``str`` or ``list``
+        :param keys_or_prefix: A prefix, in which case all objects whose names
+                               start with it are deleted, or an iterable of
+                               object names or :class:``.BucketObject``.
+
+        :type concurrency: ``int``
+        :param concurrency: The number of batches to delete in parallel. If
+                            not specified, the
+                            ``default_transfer_concurrency`` defined in the
+                            provider config will apply.
+
+        :rtype: ``dict``
+        :return: The objects that could not be deleted, mapping each name to
+                 the reason for the failure. Empty if all objects were
+                 deleted.
+        """
+        pass
+
+    @abstractmethod
+    def iter_objects(self, prefix=None):
+        """
+        Iterate through the objects in this bucket, optionally restricted to
+        those whose names start with ``prefix``. Objects are fetched one page
+        at a time as iteration progresses, so that the first results are
+        available after a single request and memory use does not grow with
+        the number of objects in the bucket.
+
+        Example:
+
+        .. code-block:: python
+
+            for obj in bucket.objects.iter_objects(prefix='logs/2017/'):
+                print(obj.name, obj.size)
+
+        :type prefix: ``str``
+        :param prefix: Prefix criteria by which to filter listed objects.
+
+        :rtype: Iterator of :class:``.BucketObject``
+        :return: An iterator over the matching objects.
+        """
+        pass
+
     @abstractmethod
     def find(self, **kwargs):
         """
@@ -175,7 +175,7 @@ class InstanceService(PageableObjectMixin, CloudService):
         pass
 
     @abstractmethod
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, expand=None):
         """
         List available instances.
 
@@ -204,6 +204,17 @@ class InstanceService(PageableObjectMixin, CloudService):
                        in paging through very long lists of objects. It is
                        returned on each invocation of the list method.
 
+        :type  expand: ``list`` of ``str``
+        :param expand: Related objects to fetch along with the instances, out
+                       of ``vm_firewalls``, ``vm_type`` and ``subnet``. The
+                       related objects of all instances in the returned page
+                       are fetched together, in as few requests as the
+                       provider allows, instead of on first access of each
+                       instance's property. For example::
+
+                           instances = provider.compute.instances.list(
+                               expand=['vm_firewalls', 'vm_type'])
+
         :rtype: ``ResultList`` of :class:`.Instance`
         :return: A ResultList object containing a list of Instances
         """
@@ -1205,6 +1216,10 @@ class VMTypeService(PageableObjectMixin, CloudService):
 
         Supported attributes: name
 
+        Names are matched exactly. Pass ``glob=True`` to match the name as
+        a pattern that may contain the wildcards ``*`` and ``?``, e.g.
+        ``find(name='m5.*', glob=True)``.
+
         :rtype: ``object`` of :class:`.VMType`
         :return: an Instance object
         """
@@ -1242,10 +1257,17 @@ class RegionService(PageableObjectMixin, CloudService):
         pass
 
     @abstractmethod
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, include_zones=False):
         """
         List all regions.
 
+        :type  include_zones: ``bool``
+        :param include_zones: Whether to fetch the placement zones of the
+                              listed regions along with them. The zones of
+                              all regions are fetched in parallel and cached,
+                              so enumerating the placement options of every
+                              region takes a single round of requests.
+
         :rtype: ``list`` of :class:`.Region`
         :return:  list of region objects
         """
@@ -1258,6 +1280,10 @@ class RegionService(PageableObjectMixin, CloudService):
 
         Supported attributes: name
 
+        Names are matched exactly. Pass ``glob=True`` to match the name as
+        a pattern that may contain the wildcards ``*`` and ``?``, e.g.
+        ``find(name='us-east-*', glob=True)``.
+
         :rtype: ``object`` of :class:`.Region`
         :return: a Region object
         """
@@ -1,11 +1,8 @@
 """A set of AWS-specific helper methods used by the framework."""
 import logging as log
 
-from boto3.resources.params import create_request_parameters
-
 from botocore import xform_name
 from botocore.exceptions import ClientError
-from botocore.utils import merge_dicts
 
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.resources import ServerPagedResultList
@@ -50,6 +47,40 @@ def find_tag_value(tags, key):
     return None
 
 
+def batch_reload(cb_objects, boto_collection, ids_param, attr_name):
+    """
+    Reload the Boto resources wrapped by several CloudBridge objects with a
+    single (paginated) describe call, rather than calling ``reload()`` on
+    each one of them.
+
+    :type cb_objects: list of CloudBridge resources
+    :param cb_objects: The objects to refresh.
+
+    :type boto_collection: ``boto3.resources.collection.CollectionManager``
+    :param boto_collection: The collection to query, e.g. ``ec2.instances``.
+
+    :type ids_param: ``str``
+    :param ids_param: Name of the describe call's id filter parameter,
+                      e.g. ``InstanceIds``.
+
+    :type attr_name: ``str``
+    :param attr_name: Attribute under which each CloudBridge object holds its
+                      Boto resource, e.g. ``_ec2_instance``.
+    """
+    by_id = dict((obj.id, obj) for obj in cb_objects)
+    try:
+        for boto_obj in boto_collection.filter(**{ids_param: list(by_id)}):
+            obj = by_id.pop(boto_obj.id, None)
+            if obj:
+                setattr(obj, attr_name, boto_obj)
+    except ClientError as e:
+        # AWS rejects the whole request if any one of the ids no longer
+        # exists, so fall back to refreshing the stragglers one at a time.
+        log.debug("Batch reload failed, refreshing individually: %s", e)
+    for obj in by_id.values():
+        obj.refresh()
+
+
 class BotoGenericService(object):
     """
     Generic implementation of a Boto3 AWS service. Uses Boto3
@@ -66,7 +97,8 @@ class BotoGenericService(object):
 
         :type boto_conn: :class:`Boto3.Resource`
         :param boto_conn: Boto top level service resource (e.g. EC2, S3)
-                          connection.
+                          connection. Subclasses may leave this out and
+                          override the ``boto_conn`` property instead.
 
         :type boto_collection_name: ``str``
         :param boto_collection_name: Boto collection name that corresponds
@@ -74,14 +106,35 @@ class BotoGenericService(object):
         """
         self.provider = provider
         self.cb_resource = cb_resource
-        self.boto_conn = boto_conn
-        self.boto_collection_model = self._infer_collection_model(
-            boto_conn, boto_collection_name)
+        self._boto_conn = boto_conn
+        self.boto_collection_name = boto_collection_name
+        # The models are only inferred on first use, so that no connection
+        # is made when the service is created
+        self._boto_collection_model = None
+        self._boto_resource_name = None
+
+    @property
+    def boto_conn(self):
+        return self._boto_conn
+
+    @property
+    def boto_collection_model(self):
+        if not self._boto_collection_model:
+            self._boto_collection_model = self._infer_collection_model(
+                self.boto_conn, self.boto_collection_name)
+        return self._boto_collection_model
+
+    @property
+    def boto_collection(self):
         # Perform an empty filter to convert to a ResourceCollection
-        self.boto_collection = (getattr(self.boto_conn, boto_collection_name)
-                                .filter())
-        self.boto_resource = self._infer_boto_resource(
-            boto_conn, self.boto_collection_model)
+        return getattr(self.boto_conn, self.boto_collection_name).filter()
+
+    @property
+    def boto_resource(self):
+        if not self._boto_resource_name:
+            self._boto_resource_name = self._infer_boto_resource(
+                self.boto_conn, self.boto_collection_model)
+        return getattr(self.boto_conn, self._boto_resource_name)
 
     def _infer_collection_model(self, conn, collection_name):
         log.debug("Retrieving boto model for collection: %s", collection_name)
@@ -94,7 +147,7 @@ class BotoGenericService(object):
         resource_model = next(
             sr for sr in conn.meta.resource_model.subresources
             if sr.resource.model.name == collection_model.resource.model.name)
-        return getattr(self.boto_conn, resource_model.name)
+        return resource_model.name
 
     def get(self, resource_id):
         """
@@ -160,6 +213,9 @@ class BotoGenericService(object):
         protected members of ResourceCollection. This logic can be removed
         depending on issue: https://github.com/boto/boto3/issues/1268.
         """
+        from boto3.resources.params import create_request_parameters
+        from botocore.utils import merge_dicts
+
         # pylint:disable=protected-access
         cleaned_params = collection._params.copy()
         cleaned_params.pop('limit', None)
@@ -301,8 +357,12 @@ class BotoEC2Service(BotoGenericService):
                                     to the CloudBridge resource (e.g. key_pair)
         """
         super(BotoEC2Service, self).__init__(
-            provider, cb_resource, provider.ec2_conn,
-            boto_collection_name)
+            provider, cb_resource, None, boto_collection_name)
+
+    @property
+    def boto_conn(self):
+        # The connection of the calling thread, in thread-safe mode
+        return self.provider.ec2_conn
 
 
 class BotoS3Service(BotoGenericService):
@@ -323,5 +383,9 @@ class BotoS3Service(BotoGenericService):
                                     to the CloudBridge resource (e.g. key_pair)
         """
         super(BotoS3Service, self).__init__(
-            provider, cb_resource, provider.s3_conn,
-            boto_collection_name)
+            provider, cb_resource, None, boto_collection_name)
+
+    @property
+    def boto_conn(self):
+        # The connection of the calling thread, in thread-safe mode
+        return self.provider.s3_conn
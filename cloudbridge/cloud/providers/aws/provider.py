@@ -2,16 +2,9 @@
 import logging as log
 import os
 
-import boto3
-try:
-    # These are installed only for the case of a dev instance
-    from moto.packages.responses import responses
-    from moto import mock_ec2
-    from moto import mock_s3
-except ImportError:
-    log.debug('[aws provider] moto library not available!')
-
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.cache import ClientPool
+from cloudbridge.cloud.base.cache import metadata_cache
 from cloudbridge.cloud.interfaces import TestMockHelperMixin
 
 from .services import AWSComputeService
@@ -51,11 +44,8 @@ class AWSCloudProvider(BaseCloudProvider):
             'endpoint_url': self._get_config_value('s3_endpoint_url', None)
         }
 
-        # service connections, lazily initialized
-        self._session = None
-        self._ec2_conn = None
-        self._vpc_conn = None
-        self._s3_conn = None
+        # Service connections are lazily initialized, and kept in
+        # self._clients
 
         # Initialize provider services
         self._compute = AWSComputeService(self)
@@ -66,24 +56,15 @@ class AWSCloudProvider(BaseCloudProvider):
     @property
     def session(self):
         '''Get a low-level session object or create one if needed'''
-        if not self._session:
-            if self.config.debug_mode:
-                boto3.set_stream_logger(level=log.DEBUG)
-            self._session = boto3.session.Session(
-                region_name=self.region_name, **self.session_cfg)
-        return self._session
+        return self._clients.get('session', self._create_session)
 
     @property
     def ec2_conn(self):
-        if not self._ec2_conn:
-            self._ec2_conn = self._connect_ec2()
-        return self._ec2_conn
+        return self._clients.get('ec2_conn', self._connect_ec2)
 
     @property
     def s3_conn(self):
-        if not self._s3_conn:
-            self._s3_conn = self._connect_s3()
-        return self._s3_conn
+        return self._clients.get('s3_conn', self._connect_s3)
 
     @property
     def compute(self):
@@ -101,6 +82,20 @@ class AWSCloudProvider(BaseCloudProvider):
     def storage(self):
         return self._storage
 
+    def _create_session(self):
+        import boto3
+
+        if self.config.debug_mode:
+            boto3.set_stream_logger(level=log.DEBUG)
+        return boto3.session.Session(
+            region_name=self.region_name, **self.session_cfg)
+
+    def _boto_config(self):
+        '''Get the botocore configuration shared by all connections'''
+        from botocore.config import Config
+
+        return Config(max_pool_connections=self.config.http_pool_size)
+
     def _connect_ec2(self):
         """
         Get a boto ec2 connection object.
@@ -110,27 +105,59 @@ class AWSCloudProvider(BaseCloudProvider):
     def _conect_ec2_region(self, region_name=None):
         '''Get an EC2 resource object'''
         return self.session.resource(
-            'ec2', region_name=region_name, **self.ec2_cfg)
+            'ec2', region_name=region_name, config=self._boto_config(),
+            **self.ec2_cfg)
+
+    def _ec2_region_conn(self, region_name):
+        """
+        Get a pooled EC2 resource object for the given region.
+        """
+        if region_name == self.region_name:
+            return self.ec2_conn
+        # EC2 connections to other regions than region_name
+        return self._clients.get(
+            'ec2_region_conns',
+            lambda: ClientPool(self._connect_pooled_ec2_region)
+        ).get(region_name)
+
+    def _connect_pooled_ec2_region(self, region_name):
+        """
+        Get an EC2 resource object with a session of its own, as the pool
+        creates connections to several regions in parallel and boto3
+        sessions must not be shared across threads.
+        """
+        return self._create_session().resource(
+            'ec2', region_name=region_name, config=self._boto_config(),
+            **self.ec2_cfg)
 
     def _connect_s3(self):
         '''Get an S3 resource object'''
         return self.session.resource(
-            's3', region_name=self.region_name, **self.s3_cfg)
+            's3', region_name=self.region_name, config=self._boto_config(),
+            **self.s3_cfg)
 
 
 class MockAWSCloudProvider(AWSCloudProvider, TestMockHelperMixin):
 
     def __init__(self, config):
         super(MockAWSCloudProvider, self).__init__(config)
+        # Never persist mocked metadata where a real provider could find it
+        self.config.setdefault('cb_cache_dir', None)
 
     def setUpMock(self):
         """
         Let Moto take over all socket communications
         """
+        # Moto is installed only for the case of a dev instance
+        from moto import mock_ec2
+        from moto import mock_s3
+        from moto.packages.responses import responses
+
         self.ec2mock = mock_ec2()
         self.ec2mock.start()
         self.s3mock = mock_s3()
         self.s3mock.start()
+        metadata_cache.invalidate(self.AWS_INSTANCE_DATA_DEFAULT_URL)
         responses.add(
             responses.GET,
             self.AWS_INSTANCE_DATA_DEFAULT_URL,
@@ -171,3 +198,4 @@ class MockAWSCloudProvider(AWSCloudProvider, TestMockHelperMixin):
         """
         self.s3mock.stop()
         self.ec2mock.stop()
+        metadata_cache.invalidate(self.AWS_INSTANCE_DATA_DEFAULT_URL)
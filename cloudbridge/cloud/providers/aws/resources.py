@@ -7,7 +7,6 @@ import logging
 
 from botocore.exceptions import ClientError
 
-import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseAttachmentInfo
 from cloudbridge.cloud.base.resources import BaseBucket
 from cloudbridge.cloud.base.resources import BaseBucketContainer
@@ -32,6 +31,8 @@ from cloudbridge.cloud.base.resources import BaseVMFirewallRuleContainer
 from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import PrefixListing
+from cloudbridge.cloud.base.resources import ServerPagedResultList
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
@@ -44,6 +45,7 @@ from cloudbridge.cloud.interfaces.resources import TrafficDirection
 from cloudbridge.cloud.interfaces.resources import VolumeState
 
 from .helpers import BotoEC2Service
+from .helpers import batch_reload
 from .helpers import find_tag_value
 from .helpers import trim_empty_params
 
@@ -251,8 +253,8 @@ class AWSInstance(BaseInstance):
 
     @property
     def vm_type(self):
-        return self._provider.compute.vm_types.find(
-            name=self._ec2_instance.instance_type)[0]
+        return self._related('vm_type', lambda: self._provider.compute.
+                             vm_types.find(name=self.vm_type_id)[0])
 
     def reboot(self):
         self._ec2_instance.reboot()
@@ -270,10 +272,10 @@ class AWSInstance(BaseInstance):
 
     @property
     def vm_firewalls(self):
-        return [
+        return self._related('vm_firewalls', lambda: [
             self._provider.security.vm_firewalls.get(fw_id)
             for fw_id in self.vm_firewall_ids
-        ]
+        ])
 
     @property
     def vm_firewall_ids(self):
@@ -282,6 +284,27 @@ class AWSInstance(BaseInstance):
             self._ec2_instance.security_groups
         ]))
 
+    @property
+    def subnet_id(self):
+        return self._ec2_instance.subnet_id
+
+    @classmethod
+    def _get_vm_firewalls(cls, provider, fw_ids):
+        if not fw_ids:
+            return {}
+        groups = provider.ec2_conn.security_groups.filter(
+            GroupIds=list(fw_ids))
+        return dict((group.id, AWSVMFirewall(provider, group))
+                    for group in groups)
+
+    @classmethod
+    def _get_subnets(cls, provider, subnet_ids):
+        if not subnet_ids:
+            return {}
+        subnets = provider.ec2_conn.subnets.filter(SubnetIds=list(subnet_ids))
+        return dict((subnet.id, AWSSubnet(provider, subnet))
+                    for subnet in subnets)
+
     @property
     def key_pair_name(self):
         return self._ec2_instance.key_name
@@ -353,6 +376,11 @@ class AWSInstance(BaseInstance):
             # set the state to unknown
             self._ec2_instance.state = {'Name': InstanceState.UNKNOWN}
 
+    @classmethod
+    def _refresh_many(cls, provider, instances):
+        batch_reload(instances, provider.ec2_conn.instances, 'InstanceIds',
+                     '_ec2_instance')
+
     # pylint:disable=unused-argument
     def _wait_till_exists(self, timeout=None, interval=None):
         self._ec2_instance.wait_until_exists()
@@ -470,6 +498,11 @@ class AWSVolume(BaseVolume):
             # set the status to unknown
             self._volume.state = VolumeState.UNKNOWN
 
+    @classmethod
+    def _refresh_many(cls, provider, volumes):
+        batch_reload(volumes, provider.ec2_conn.volumes, 'VolumeIds',
+                     '_volume')
+
 
 class AWSSnapshot(BaseSnapshot):
 
@@ -539,6 +572,11 @@ class AWSSnapshot(BaseSnapshot):
             # set the status to unknown
             self._snapshot.state = SnapshotState.UNKNOWN
 
+    @classmethod
+    def _refresh_many(cls, provider, snapshots):
+        batch_reload(snapshots, provider.ec2_conn.snapshots, 'SnapshotIds',
+                     '_snapshot')
+
     def delete(self):
         self._snapshot.delete()
 
@@ -727,22 +765,30 @@ class AWSVMFirewallRule(BaseVMFirewallRule):
 class AWSBucketObject(BaseBucketObject):
 
     class BucketObjIterator():
-        CHUNK_SIZE = 4096
 
-        def __init__(self, body):
+        def __init__(self, body, chunk_size):
             self.body = body
+            self.chunk_size = chunk_size
 
         def __iter__(self):
             while True:
-                data = self.read(self.CHUNK_SIZE)
+                data = self.read(self.chunk_size)
                 if data:
                     yield data
                 else:
                     break
 
-        def read(self, length):
+        def read(self, length=None):
             return self.body.read(amt=length)
 
+        def readinto(self, buf):
+            # Older versions of botocore do not support readinto
+            if hasattr(self.body, 'readinto'):
+                return self.body.readinto(buf)
+            data = self.body.read(amt=len(buf))
+            buf[:len(data)] = data
+            return len(data)
+
         def close(self):
             return self.body.close()
 
@@ -760,14 +806,20 @@ class AWSBucketObject(BaseBucketObject):
 
     @property
     def size(self):
-        return self._obj.size
+        # Objects returned by a listing are ObjectSummaries, which have a size
+        # rather than a content length
+        if hasattr(self._obj, 'size'):
+            return self._obj.size
+        return self._obj.content_length
 
     @property
     def last_modified(self):
         return self._obj.last_modified.strftime("%Y-%m-%dT%H:%M:%S.%f")
 
-    def iter_content(self):
-        return self.BucketObjIterator(self._obj.get().get('Body'))
+    def iter_content(self, chunk_size=None):
+        return self.BucketObjIterator(
+            self._obj.get().get('Body'),
+            chunk_size or self._provider.config.default_read_chunk_size)
 
     def upload(self, data):
         self._obj.put(Body=data)
@@ -775,6 +827,63 @@ class AWSBucketObject(BaseBucketObject):
     def upload_from_file(self, path):
         self._obj.upload_file(path)
 
+    # S3 rejects multipart uploads with more parts than this
+    MAX_UPLOAD_PARTS = 10000
+    # S3 rejects multipart uploads with smaller parts, other than the last
+    MIN_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+
+    def upload_stream(self, fileobj, part_size=None, concurrency=None):
+        part_size = part_size or self._provider.config.default_upload_part_size
+        if part_size < self.MIN_UPLOAD_PART_SIZE:
+            raise InvalidValueException('part_size', part_size)
+        return super(AWSBucketObject, self).upload_stream(
+            fileobj, part_size=part_size, concurrency=concurrency)
+
+    def _start_multipart_upload(self):
+        return self._obj.meta.client.create_multipart_upload(
+            Bucket=self._obj.bucket_name, Key=self.id)['UploadId']
+
+    def _upload_part(self, upload, part_number, data):
+        if part_number > self.MAX_UPLOAD_PARTS:
+            raise InvalidValueException('part_number', part_number)
+        response = self._obj.meta.client.upload_part(
+            Bucket=self._obj.bucket_name, Key=self.id, UploadId=upload,
+            PartNumber=part_number, Body=data)
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+    def _complete_multipart_upload(self, upload, parts):
+        self._obj.meta.client.complete_multipart_upload(
+            Bucket=self._obj.bucket_name, Key=self.id, UploadId=upload,
+            MultipartUpload={'Parts': parts})
+
+    def _abort_multipart_upload(self, upload):
+        self._obj.meta.client.abort_multipart_upload(
+            Bucket=self._obj.bucket_name, Key=self.id, UploadId=upload)
+
+    def _read_range(self, start, end):
+        # Use the client directly, as resources are not thread safe
+        response = self._obj.meta.client.get_object(
+            Bucket=self._obj.bucket_name, Key=self.id,
+            Range='bytes={0}-{1}'.format(start, end))
+        return response['Body'].read()
+
+    def _server_side_copy(self, target_bucket, name):
+        # A managed copy, which copies large objects in parts with
+        # upload_part_copy
+        self._obj.meta.client.copy(
+            CopySource={'Bucket': self._obj.bucket_name, 'Key': self.id},
+            Bucket=target_bucket.name, Key=name)
+        return True
+
+    def _content_md5(self):
+        # The ETag of multipart uploads is not an MD5 of the content and
+        # contains a dash followed by the number of parts
+        etag = self._obj.e_tag.strip('"')
+        return None if '-' in etag else etag
+
+    def _listing_md5(self):
+        return self._content_md5()
+
     def delete(self):
         self._obj.delete()
 
@@ -805,6 +914,8 @@ class AWSBucket(BaseBucket):
         return self._object_container
 
     def delete(self, delete_contents=False):
+        if delete_contents:
+            self._delete_contents()
         self._bucket.delete()
 
 
@@ -823,25 +934,66 @@ class AWSBucketContainer(BaseBucketContainer):
         except ClientError:
             return None
 
-    def list(self, limit=None, marker=None, prefix=None):
-        if prefix:
-            # pylint:disable=protected-access
-            boto_objs = self.bucket._bucket.objects.filter(Prefix=prefix)
-        else:
-            # pylint:disable=protected-access
-            boto_objs = self.bucket._bucket.objects.all()
-        objects = [AWSBucketObject(self._provider, obj)
-                   for obj in boto_objs]
+    # The maximum number of keys returned by a list_objects_v2 request
+    ITER_PAGE_SIZE = 1000
 
-        return ClientPagedResultList(self._provider, objects,
-                                     limit=limit, marker=marker)
+    def list(self, limit=None, marker=None, prefix=None):
+        """
+        List objects in this bucket, one page of up to ``limit`` keys per
+        request. The ``marker`` of a truncated result is an S3 continuation
+        token. Use ``list_prefixes`` to list one level of a hierarchy of
+        object names.
+        """
+        # pylint:disable=protected-access
+        bucket = self.bucket._bucket
+        response = bucket.meta.client.list_objects_v2(**trim_empty_params({
+            'Bucket': bucket.name,
+            'MaxKeys': limit or self._provider.config.default_result_limit,
+            'ContinuationToken': marker,
+            'Prefix': prefix}))
+        return ServerPagedResultList(
+            is_truncated=response['IsTruncated'],
+            marker=response.get('NextContinuationToken'),
+            supports_total=False, data=self._to_objects(response))
+
+    def _to_objects(self, response):
+        objects = []
+        for item in response.get('Contents', []):
+            # Populate a summary from the listing, as boto3 collections do
+            summary = self._provider.s3_conn.ObjectSummary(
+                self.bucket.name, item['Key'])
+            summary.meta.data = item
+            objects.append(AWSBucketObject(self._provider, summary))
+        return objects
+
+    def list_prefixes(self, prefix=None, delimiter='/'):
+        # pylint:disable=protected-access
+        client = self.bucket._bucket.meta.client
+        paginator = client.get_paginator('list_objects_v2')
+        prefixes = []
+        objects = []
+        for page in paginator.paginate(**trim_empty_params({
+                'Bucket': self.bucket.name, 'Prefix': prefix,
+                'Delimiter': delimiter})):
+            prefixes.extend(p['Prefix']
+                            for p in page.get('CommonPrefixes', []))
+            objects.extend(self._to_objects(page))
+        return PrefixListing(prefixes, objects)
+
+    # The maximum number of keys accepted by a delete_objects request
+    DELETE_BATCH_SIZE = 1000
+
+    def _delete_batch(self, keys):
+        # pylint:disable=protected-access
+        response = self.bucket._bucket.meta.client.delete_objects(
+            Bucket=self.bucket.name,
+            Delete={'Objects': [{'Key': key} for key in keys],
+                    'Quiet': True})
+        return dict((error['Key'], error.get('Message', error.get('Code')))
+                    for error in response.get('Errors', []))
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches),
-                                     limit=None, marker=None)
+        return self._find(['name'], kwargs)
 
     def create(self, name):
         # pylint:disable=protected-access
@@ -863,14 +1015,9 @@ class AWSRegion(BaseRegion):
     def name(self):
         return self.id
 
-    @property
-    def zones(self):
-        if self.id == self._provider.region_name:  # optimisation
-            conn = self._provider.ec2_conn
-        else:
-            # pylint:disable=protected-access
-            conn = self._provider._conect_ec2_region(region_name=self.id)
-
+    def _fetch_zones(self):
+        # pylint:disable=protected-access
+        conn = self._provider._ec2_region_conn(self.id)
         zones = (conn.meta.client.describe_availability_zones()
                  .get('AvailabilityZones', []))
         return [AWSPlacementZone(self._provider, zone.get('ZoneName'),
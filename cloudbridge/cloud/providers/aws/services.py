@@ -5,7 +5,9 @@ import string
 from botocore.exceptions import ClientError
 
 import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.cache import metadata_cache
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import cached_listing
 from cloudbridge.cloud.base.services import BaseBucketService
 from cloudbridge.cloud.base.services import BaseComputeService
 from cloudbridge.cloud.base.services import BaseImageService
@@ -32,8 +34,6 @@ from cloudbridge.cloud.interfaces.resources import VMFirewall
 from cloudbridge.cloud.interfaces.resources import VMType
 from cloudbridge.cloud.interfaces.resources import Volume
 
-import requests
-
 from .helpers import BotoEC2Service
 from .helpers import BotoS3Service
 from .resources import AWSBucket
@@ -315,11 +315,7 @@ class AWSBucketService(BaseBucketService):
         return None
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches),
-                                     limit=None, marker=None)
+        return self._find(['name'], kwargs)
 
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
@@ -551,8 +547,8 @@ class AWSInstanceService(BaseInstanceService):
 
         return self.svc.find(filter_name='tag:Name', filter_value=name)
 
-    def list(self, limit=None, marker=None):
-        return self.svc.list(limit=limit, marker=marker)
+    def list(self, limit=None, marker=None, expand=None):
+        return self._expand(self.svc.list(limit=limit, marker=marker), expand)
 
 
 class AWSVMTypeService(BaseVMTypeService):
@@ -572,13 +568,18 @@ class AWSVMTypeService(BaseVMTypeService):
         file: https://raw.githubusercontent.com/powdahound/ec2instances.info/
         master/www/instances.json).
 
-        TODO: Needs a caching function with timeout
+        The document is cached in memory, shared by all provider instances in
+        the process, and on disk under ``config.cache_dir``. It is revalidated
+        once ``config.metadata_cache_ttl`` seconds have elapsed.
         """
-        r = requests.get(self.provider.config.get(
-            "aws_instance_info_url",
-            self.provider.AWS_INSTANCE_DATA_DEFAULT_URL))
-        return r.json()
-
+        return metadata_cache.get_json(
+            self.provider.config.get(
+                "aws_instance_info_url",
+                self.provider.AWS_INSTANCE_DATA_DEFAULT_URL),
+            ttl=self.provider.config.metadata_cache_ttl,
+            cache_dir=self.provider.config.cache_dir)
+
+    @cached_listing
     def list(self, limit=None, marker=None):
         vm_types = [AWSVMType(self.provider, vm_type)
                     for vm_type in self.instance_data]
@@ -600,7 +601,12 @@ class AWSRegionService(BaseRegionService):
         else:
             return None
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, include_zones=False):
+        return self._with_zones(self._list(limit=limit, marker=marker),
+                                include_zones)
+
+    @cached_listing
+    def _list(self, limit=None, marker=None):
         regions = [
             AWSRegion(self.provider, region) for region in
             self.provider.ec2_conn.meta.client.describe_regions()
@@ -1,16 +1,12 @@
 import datetime
 import logging
-from io import BytesIO
-
-from azure.common.credentials import ServicePrincipalCredentials
-from azure.mgmt.compute import ComputeManagementClient
-from azure.mgmt.network import NetworkManagementClient
-from azure.mgmt.resource import ResourceManagementClient
-from azure.mgmt.resource.subscriptions import SubscriptionClient
-from azure.mgmt.storage import StorageManagementClient
-from azure.storage.blob import BlobPermissions
-from azure.storage.blob import BlockBlobService
-from azure.storage.table import TableService
+import threading
+
+from azure.common import AzureMissingResourceHttpError
+
+import cloudbridge.cloud.base.helpers as cb_helpers
+from cloudbridge.cloud.base.cache import ClientStore
+from cloudbridge.cloud.base.cache import TTLCache
 
 from . import helpers as azure_helpers
 
@@ -73,20 +69,22 @@ class AzureClient(object):
     def __init__(self, config):
         self._config = config
         self.subscription_id = config.get('azure_subscription_id')
-        self._credentials = ServicePrincipalCredentials(
-            client_id=config.get('azure_client_id'),
-            secret=config.get('azure_secret'),
-            tenant=config.get('azure_tenant')
-        )
 
-        self._resource_client = None
-        self._storage_client = None
-        self._network_management_client = None
-        self._subscription_client = None
-        self._compute_client = None
+        # The SDK of each client is only imported when the client is first
+        # used, so that, e.g., object storage never loads the compute SDK.
+        # In thread-safe mode, each thread gets SDK clients of its own, built
+        # from the same credentials.
+        self._clients = ClientStore(
+            per_thread=config.get('azure_thread_safe', False))
+        self._credentials = None
+        self._credentials_lock = threading.Lock()
         self._access_key_result = None
-        self._block_blob_service = None
-        self._table_service = None
+        self._table_exists = False
+        self._table_lock = threading.Lock()
+        # Public keys by name, so that repeated lookups of the same key pair
+        # do not query the table each time
+        self._public_keys = TTLCache(
+            config.get('azure_public_key_cache_ttl', 30))
 
         log.debug("azure subscription : %s", self.subscription_id)
 
@@ -113,62 +111,134 @@ class AzureClient(object):
     def public_key_storage_table_name(self):
         return self._config.get('azure_public_key_storage_table_name')
 
+    @property
+    def credentials(self):
+        with self._credentials_lock:
+            if not self._credentials:
+                from azure.common.credentials import \
+                    ServicePrincipalCredentials
+
+                self._credentials = ServicePrincipalCredentials(
+                    client_id=self._config.get('azure_client_id'),
+                    secret=self._config.get('azure_secret'),
+                    tenant=self._config.get('azure_tenant')
+                )
+            return self._credentials
+
     @property
     def storage_client(self):
-        if not self._storage_client:
-            self._storage_client = \
-                StorageManagementClient(self._credentials,
-                                        self.subscription_id)
-        return self._storage_client
+        return self._clients.get('storage_client',
+                                 self._connect_storage_client)
 
     @property
     def subscription_client(self):
-        if not self._subscription_client:
-            self._subscription_client = SubscriptionClient(self._credentials)
-        return self._subscription_client
+        return self._clients.get('subscription_client',
+                                 self._connect_subscription_client)
 
     @property
     def resource_client(self):
-        if not self._resource_client:
-            self._resource_client = \
-                ResourceManagementClient(self._credentials,
-                                         self.subscription_id)
-        return self._resource_client
+        return self._clients.get('resource_client',
+                                 self._connect_resource_client)
 
     @property
     def compute_client(self):
-        if not self._compute_client:
-            self._compute_client = \
-                ComputeManagementClient(self._credentials,
-                                        self.subscription_id)
-        return self._compute_client
+        return self._clients.get('compute_client',
+                                 self._connect_compute_client)
 
     @property
     def network_management_client(self):
-        if not self._network_management_client:
-            self._network_management_client = NetworkManagementClient(
-                self._credentials, self.subscription_id)
-        return self._network_management_client
+        return self._clients.get('network_management_client',
+                                 self._connect_network_management_client)
 
     @property
     def blob_service(self):
-        if not self._block_blob_service:
-            self._block_blob_service = BlockBlobService(
-                self.storage_account,
-                self.access_key_result.keys[0].value)
-        return self._block_blob_service
+        return self._clients.get('blob_service', self._connect_blob_service)
 
     @property
     def table_service(self):
-        if not self._table_service:
-            self._table_service = TableService(
-                self.storage_account,
-                self.access_key_result.keys[0].value)
-        if not self._table_service. \
-                exists(table_name=self.public_key_storage_table_name):
-            self._table_service.create_table(
-                self.public_key_storage_table_name)
-        return self._table_service
+        table_service = self._clients.get('table_service',
+                                          self._connect_table_service)
+        if not self._table_exists:
+            self._ensure_table(table_service)
+        return table_service
+
+    def _connect_storage_client(self):
+        from azure.mgmt.storage import StorageManagementClient
+
+        return StorageManagementClient(self.credentials, self.subscription_id)
+
+    def _connect_subscription_client(self):
+        from azure.mgmt.resource.subscriptions import SubscriptionClient
+
+        return SubscriptionClient(self.credentials)
+
+    def _connect_resource_client(self):
+        from azure.mgmt.resource import ResourceManagementClient
+
+        return ResourceManagementClient(self.credentials,
+                                        self.subscription_id)
+
+    def _connect_compute_client(self):
+        from azure.mgmt.compute import ComputeManagementClient
+
+        return ComputeManagementClient(self.credentials, self.subscription_id)
+
+    def _connect_network_management_client(self):
+        from azure.mgmt.network import NetworkManagementClient
+
+        return NetworkManagementClient(self.credentials, self.subscription_id)
+
+    def _http_session(self):
+        return cb_helpers.http_session(
+            self._config.get('azure_http_pool_size', 10))
+
+    def _connect_blob_service(self):
+        from azure.storage.blob import BlockBlobService
+
+        return BlockBlobService(self.storage_account,
+                                self.access_key_result.keys[0].value,
+                                request_session=self._http_session())
+
+    def _connect_table_service(self):
+        from azure.storage.table import TableService
+
+        return TableService(self.storage_account,
+                            self.access_key_result.keys[0].value,
+                            request_session=self._http_session())
+
+    def _ensure_table(self, table_service=None):
+        """
+        Create the public key table if it does not exist, checking only
+        once per client. Return whether the table had to be created.
+        """
+        table_service = table_service or self._clients.get(
+            'table_service', self._connect_table_service)
+        with self._table_lock:
+            if self._table_exists:
+                return False
+            created = False
+            if not table_service. \
+                    exists(table_name=self.public_key_storage_table_name):
+                table_service.create_table(
+                    self.public_key_storage_table_name)
+                created = True
+            self._table_exists = True
+            return created
+
+    def _table_call(self, method, *args, **kwargs):
+        """
+        Call a method of the table service. Should the table have been
+        deleted since it was checked, recreate it and call again.
+        """
+        try:
+            return getattr(self.table_service, method)(*args, **kwargs)
+        except AzureMissingResourceHttpError:
+            self._table_exists = False
+            if not self._ensure_table():
+                raise
+            log.debug("Recreated table %s",
+                      self.public_key_storage_table_name)
+            return getattr(self.table_service, method)(*args, **kwargs)
 
     def get_resource_group(self, name):
         return self.resource_client.resource_groups.get(name)
@@ -250,8 +320,9 @@ class AzureClient(object):
     def delete_container(self, container_name):
         self.blob_service.delete_container(container_name)
 
-    def list_blobs(self, container_name, prefix=None):
-        return self.blob_service.list_blobs(container_name, prefix=prefix)
+    def list_blobs(self, container_name, prefix=None, delimiter=None):
+        return self.blob_service.list_blobs(container_name, prefix=prefix,
+                                            delimiter=delimiter)
 
     def get_blob(self, container_name, blob_name):
         return self.blob_service.get_blob_properties(container_name, blob_name)
@@ -264,10 +335,33 @@ class AzureClient(object):
         self.blob_service.create_blob_from_path(container_name,
                                                 blob_name, file_path)
 
+    def put_block(self, container_name, blob_name, block_id, data):
+        self.blob_service.put_block(container_name, blob_name, data,
+                                    block_id)
+
+    def put_block_list(self, container_name, blob_name, block_ids):
+        from azure.storage.blob.models import BlobBlock
+
+        self.blob_service.put_block_list(
+            container_name, blob_name,
+            [BlobBlock(id=block_id) for block_id in block_ids])
+
+    def copy_blob(self, container_name, blob_name, target_container_name,
+                  target_blob_name):
+        source_url = self.blob_service.make_blob_url(container_name,
+                                                     blob_name)
+        return self.blob_service.copy_blob(target_container_name,
+                                           target_blob_name, source_url)
+
+    def abort_copy_blob(self, container_name, blob_name, copy_id):
+        self.blob_service.abort_copy_blob(container_name, blob_name, copy_id)
+
     def delete_blob(self, container_name, blob_name):
         self.blob_service.delete_blob(container_name, blob_name)
 
     def get_blob_url(self, container_name, blob_name, expiry_time):
+        from azure.storage.blob import BlobPermissions
+
         expiry_date = datetime.datetime.now() + datetime.timedelta(
             seconds=expiry_time)
         sas = self.blob_service.generate_blob_shared_access_signature(
@@ -276,11 +370,10 @@ class AzureClient(object):
         return self.blob_service.make_blob_url(container_name, blob_name,
                                                sas_token=sas)
 
-    def get_blob_content(self, container_name, blob_name):
-        out_stream = BytesIO()
-        self.blob_service.get_blob_to_stream(container_name,
-                                             blob_name, out_stream)
-        return out_stream
+    def get_blob_range(self, container_name, blob_name, start, end):
+        return self.blob_service.get_blob_to_bytes(
+            container_name, blob_name, start_range=start,
+            end_range=end).content
 
     def create_empty_disk(self, disk_name, params):
         return self.compute_client.disks.create_or_update(
@@ -498,10 +591,31 @@ class AzureClient(object):
         return self.network_management_client.public_ip_addresses.list(
             self.resource_group)
 
-    def list_vm(self):
-        return self.compute_client.virtual_machines.list(
-            self.resource_group
-        )
+    def list_vm(self, instance_views=False):
+        """
+        List the VMs in the resource group.
+
+        If ``instance_views`` is set, the instance views (i.e., the power
+        states) of the VMs are expanded in the same request, provided that
+        the installed compute SDK supports this. Otherwise, the VMs are
+        returned without them, and their instance views must be fetched one
+        by one.
+        """
+        operations = self.compute_client.virtual_machines
+        if instance_views:
+            if azure_helpers.accepts_argument(operations.list, 'expand'):
+                return operations.list(self.resource_group,
+                                       expand='instanceView')
+            log.debug("The installed compute SDK cannot expand instance "
+                      "views in VM listings")
+        return operations.list(self.resource_group)
+
+    def get_vm_instance_view(self, vm_id):
+        url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
+                                             vm_id)
+        vm_name = url_params.get(VM_NAME)
+        return self.compute_client.virtual_machines.instance_view(
+            self.resource_group, vm_name)
 
     def restart_vm(self, vm_id):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
@@ -579,6 +693,10 @@ class AzureClient(object):
             network_interfaces.delete(self.resource_group,
                                       nic_name).wait()
 
+    def list_nics(self):
+        return self.network_management_client.network_interfaces.list(
+            self.resource_group)
+
     def get_nic(self, nic_id):
         nic_params = azure_helpers.\
             parse_url(NETWORK_INTERFACE_RESOURCE_ID, nic_id)
@@ -608,26 +726,33 @@ class AzureClient(object):
             ).result()
 
     def create_public_key(self, entity):
-        return self.table_service. \
-            insert_or_replace_entity(self.public_key_storage_table_name,
-                                     entity)
+        self._public_keys.invalidate(entity['Name'])
+        return self._table_call('insert_or_replace_entity',
+                                self.public_key_storage_table_name, entity)
 
     def get_public_key(self, name):
-        entities = self.table_service. \
-            query_entities(self.public_key_storage_table_name,
-                           "Name eq '{0}'".format(name), num_results=1)
-
-        return entities.items[0] if len(entities.items) > 0 else None
+        entity = self._public_keys.get(name)
+        if entity is None:
+            entities = self._table_call(
+                'query_entities', self.public_key_storage_table_name,
+                "Name eq '{0}'".format(name), num_results=1)
+            entity = entities.items[0] if len(entities.items) > 0 else None
+            if entity is not None:
+                self._public_keys.set(name, entity)
+        return entity
 
     def delete_public_key(self, entity):
-        self.table_service.delete_entity(self.public_key_storage_table_name,
-                                         entity.PartitionKey, entity.RowKey)
+        self._public_keys.invalidate(entity.Name)
+        self._table_call('delete_entity', self.public_key_storage_table_name,
+                         entity.PartitionKey, entity.RowKey)
 
     def list_public_keys(self, partition_key, limit=None, marker=None):
-        entities = self.table_service. \
-            query_entities(self.public_key_storage_table_name,
-                           "PartitionKey eq '{0}'".format(partition_key),
-                           marker=marker, num_results=limit)
+        entities = self._table_call(
+            'query_entities', self.public_key_storage_table_name,
+            "PartitionKey eq '{0}'".format(partition_key),
+            marker=marker, num_results=limit)
+        for entity in entities.items:
+            self._public_keys.set(entity.Name, entity)
         return (entities.items, entities.next_marker)
 
     def delete_route_table(self, route_table_name):
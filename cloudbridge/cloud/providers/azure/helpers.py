@@ -1,3 +1,5 @@
+import inspect
+
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 
 
@@ -39,3 +41,19 @@ def parse_url(template_url, original_url):
             resource_param.update({key[1:-1]: value})
 
     return resource_param
+
+
+def accepts_argument(func, name):
+    """
+    Return whether ``func`` (e.g., an SDK operation) has a parameter called
+    ``name``. Optional parameters are only added to operations in the SDK
+    versions whose API supports them.
+    """
+    try:
+        params = inspect.signature(func).parameters
+    except AttributeError:  # Python 2
+        # pylint:disable=deprecated-method
+        params = inspect.getargspec(func).args
+    except (TypeError, ValueError):
+        return False
+    return name in params
@@ -1,5 +1,6 @@
 import logging
 import os
+import threading
 
 from cloudbridge.cloud.base import BaseCloudProvider
 from cloudbridge.cloud.providers.azure.azure_client import AzureClient
@@ -52,6 +53,7 @@ class AzureCloudProvider(BaseCloudProvider):
             ('AZURE_PUBLIC_KEY_STORAGE_TABLE_NAME', 'cbcerts'))
 
         self._azure_client = None
+        self._azure_client_lock = threading.Lock()
 
         self._security = AzureSecurityService(self)
         self._storage = AzureStorageService(self)
@@ -76,27 +78,33 @@ class AzureCloudProvider(BaseCloudProvider):
 
     @property
     def azure_client(self):
-        if not self._azure_client:
-
-            # create a dict with both optional and mandatory configuration
-            # values to pass to the azureclient class, rather
-            # than passing the provider object and taking a dependency.
-
-            provider_config = {
-                'azure_subscription_id': self.subscription_id,
-                'azure_client_id': self.client_id,
-                'azure_secret': self.secret,
-                'azure_tenant': self.tenant,
-                'azure_region_name': self.region_name,
-                'azure_resource_group': self.resource_group,
-                'azure_storage_account': self.storage_account,
-                'azure_public_key_storage_table_name':
-                    self.public_key_storage_table_name
-            }
-
-            self._azure_client = AzureClient(provider_config)
-            self._initialize()
-        return self._azure_client
+        with self._azure_client_lock:
+            if not self._azure_client:
+
+                # create a dict with both optional and mandatory
+                # configuration values to pass to the azureclient class,
+                # rather than passing the provider object and taking a
+                # dependency.
+
+                provider_config = {
+                    'azure_subscription_id': self.subscription_id,
+                    'azure_client_id': self.client_id,
+                    'azure_secret': self.secret,
+                    'azure_tenant': self.tenant,
+                    'azure_region_name': self.region_name,
+                    'azure_resource_group': self.resource_group,
+                    'azure_storage_account': self.storage_account,
+                    'azure_public_key_storage_table_name':
+                        self.public_key_storage_table_name,
+                    'azure_public_key_cache_ttl':
+                    self.config.listing_cache_ttl,
+                    'azure_thread_safe': self.config.thread_safe,
+                    'azure_http_pool_size': self.config.http_pool_size
+                }
+
+                self._azure_client = AzureClient(provider_config)
+                self._initialize()
+            return self._azure_client
 
     def _initialize(self):
         """
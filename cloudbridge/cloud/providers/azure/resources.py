@@ -1,22 +1,27 @@
 """
 DataTypes used by this provider
 """
+import base64
+import binascii
 import collections
 import logging
+import threading
+import time
 import uuid
 
 from azure.common import AzureException
-from azure.mgmt.network.models import NetworkSecurityGroup
 
-import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseAttachmentInfo, \
     BaseBucket, BaseBucketContainer, BaseBucketObject, BaseFloatingIP, \
     BaseFloatingIPContainer, BaseGatewayContainer, BaseInstance, \
     BaseInternetGateway, BaseKeyPair, BaseLaunchConfig, \
     BaseMachineImage, BaseNetwork, BasePlacementZone, BaseRegion, BaseRouter, \
     BaseSnapshot, BaseSubnet, BaseVMFirewall, BaseVMFirewallRule, \
-    BaseVMFirewallRuleContainer, BaseVMType, BaseVolume, ClientPagedResultList
+    BaseVMFirewallRuleContainer, BaseVMType, BaseVolume, \
+    ClientPagedResultList, PrefixListing, RangedReader
 from cloudbridge.cloud.interfaces import InstanceState, VolumeState
+from cloudbridge.cloud.interfaces.exceptions import \
+    ProviderInternalException, WaitStateException
 from cloudbridge.cloud.interfaces.resources import Instance, \
     MachineImageState, NetworkState, RouterState, \
     SnapshotState, SubnetState, TrafficDirection
@@ -226,6 +231,7 @@ class AzureVMFirewallRule(BaseVMFirewallRule):
 
 
 class AzureBucketObject(BaseBucketObject):
+
     def __init__(self, provider, container, key):
         super(AzureBucketObject, self).__init__(provider)
         self._container = container
@@ -258,16 +264,21 @@ class AzureBucketObject(BaseBucketObject):
         return self._key.properties.last_modified. \
             strftime("%Y-%m-%dT%H:%M:%S.%f")
 
-    def iter_content(self):
+    def iter_content(self, chunk_size=None, prefetch=True):
         """
-        Returns this object's content as an
-        iterable.
+        Returns this object's content as an iterable, which fetches the blob
+        in ranges of ``chunk_size`` bytes as it is consumed. If ``prefetch``
+        is set, the next range is fetched in the background while the current
+        one is consumed.
+
+        As each range is a separate request, ranges default to the larger
+        ``default_download_chunk_size`` rather than
+        ``default_read_chunk_size``.
         """
-        content_stream = self._provider.azure_client. \
-            get_blob_content(self._container.name, self._key.name)
-        if content_stream:
-            content_stream.seek(0)
-        return content_stream
+        return RangedReader(
+            self,
+            chunk_size or self._provider.config.default_download_chunk_size,
+            prefetch=1 if prefetch else 0)
 
     def upload(self, data):
         """
@@ -294,6 +305,71 @@ class AzureBucketObject(BaseBucketObject):
             log.exception(azureEx)
             return False
 
+    def _start_multipart_upload(self):
+        # Uncommitted blocks are private to an upload and are garbage
+        # collected by Azure, so there is nothing to set up
+        return uuid.uuid4().hex[:8]
+
+    def _upload_part(self, upload, part_number, data):
+        # All block ids of a blob must be of the same length
+        block_id = '{0}-{1:06d}'.format(upload, part_number)
+        self._provider.azure_client.put_block(
+            self._container.name, self.name, block_id, data)
+        return block_id
+
+    def _complete_multipart_upload(self, upload, parts):
+        self._provider.azure_client.put_block_list(
+            self._container.name, self.name, parts)
+
+    def _read_range(self, start, end):
+        return self._provider.azure_client.get_blob_range(
+            self._container.name, self.name, start, end)
+
+    def _server_side_copy(self, target_bucket, name):
+        client = self._provider.azure_client
+        client.copy_blob(self._container.name, self.name, target_bucket.name,
+                         name)
+        # Copies run asynchronously, even within a storage account, so their
+        # status is polled as when waiting for an object's state
+        config = self._provider.config
+        strategy = config.polling_strategy
+        key = 'AzureBlobCopy'
+        intervals = strategy.intervals(key, config.default_wait_interval)
+        start_time = time.time()
+        end_time = start_time + config.default_wait_timeout
+        polls = 0
+        copy = client.get_blob(target_bucket.name, name).properties.copy
+        while copy.status == 'pending':
+            if time.time() > end_time:
+                strategy.record(key, polls, time.time() - start_time, False)
+                client.abort_copy_blob(target_bucket.name, name, copy.id)
+                raise WaitStateException(
+                    "Waited too long for the copy of {0} to {1}/{2}, which "
+                    "was aborted at {3}".format(self.name, target_bucket.name,
+                                                name, copy.progress))
+            time.sleep(min(next(intervals), max(end_time - time.time(), 0)))
+            polls += 1
+            copy = client.get_blob(target_bucket.name, name).properties.copy
+        strategy.record(key, polls, time.time() - start_time,
+                        copy.status == 'success')
+        if copy.status != 'success':
+            raise ProviderInternalException(
+                "Copy of {0} to {1}/{2} ended with status {3}: {4}".format(
+                    self.name, target_bucket.name, name, copy.status,
+                    copy.status_description))
+        return True
+
+    def _content_md5(self):
+        # Azure only stores an MD5 for blobs uploaded in a single request, or
+        # when one is explicitly set
+        content_md5 = self._key.properties.content_settings.content_md5
+        if not content_md5:
+            return None
+        return binascii.hexlify(base64.b64decode(content_md5)).decode('ascii')
+
+    def _listing_md5(self):
+        return self._content_md5()
+
     def delete(self):
         """
         Delete this object.
@@ -331,7 +407,8 @@ class AzureBucket(BaseBucket):
 
     def delete(self, delete_contents=True):
         """
-        Delete this bucket.
+        Delete this bucket. Azure deletes the contents of a container along
+        with it, so ``delete_contents`` makes no difference.
         """
         self._provider.azure_client.delete_container(self.name)
 
@@ -376,11 +453,31 @@ class AzureBucketContainer(BaseBucketContainer):
         return ClientPagedResultList(self._provider, objects,
                                      limit=limit, marker=marker)
 
+    def list_prefixes(self, prefix=None, delimiter='/'):
+        from azure.storage.blob.models import BlobPrefix
+
+        prefixes = []
+        objects = []
+        for item in self._provider.azure_client.list_blobs(
+                self.bucket.name, prefix=prefix, delimiter=delimiter):
+            if isinstance(item, BlobPrefix):
+                prefixes.append(item.name)
+            else:
+                objects.append(
+                    AzureBucketObject(self._provider, self.bucket, item))
+        return PrefixListing(prefixes, objects)
+
+    def _delete_batch(self, keys):
+        failures = {}
+        for key in keys:
+            try:
+                self._provider.azure_client.delete_blob(self.bucket.name, key)
+            except AzureException as e:
+                failures[key] = str(e)
+        return failures
+
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(['name'], kwargs)
 
     def create(self, name):
         self._provider.azure_client.create_blob_from_text(
@@ -990,8 +1087,7 @@ class AzureRegion(BaseRegion):
     def name(self):
         return self._azure_region.name
 
-    @property
-    def zones(self):
+    def _fetch_zones(self):
         """
             Access information about placement zones within this region.
             As Azure does not have this feature, mapping the region
@@ -1111,6 +1207,39 @@ class AzureSubnet(BaseSubnet):
             self._state = 'unknown'
 
 
+class AzureNetworkProfiles(object):
+    """
+    The NICs and public IPs of a resource group, shared by the instances of
+    one listing. Both are listed once, the first time any of the instances
+    needs them, so that reading the IPs of a whole listing of instances does
+    not cost a round trip per NIC and public IP.
+    """
+
+    def __init__(self, provider):
+        self._provider = provider
+        self._nics = None
+        self._public_ips = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._nics is None:
+                client = self._provider.azure_client
+                # Resource ids are not case sensitive
+                self._nics = dict((nic.id.lower(), nic)
+                                  for nic in client.list_nics())
+                self._public_ips = dict((ip.id.lower(), ip)
+                                        for ip in client.list_floating_ips())
+
+    def nic(self, nic_id):
+        self._load()
+        return self._nics.get(nic_id.lower())
+
+    def public_ip(self, public_ip_id):
+        self._load()
+        return self._public_ips.get(public_ip_id.lower())
+
+
 class AzureInstance(BaseInstance):
 
     INSTANCE_STATE_MAP = {
@@ -1131,12 +1260,24 @@ class AzureInstance(BaseInstance):
         'VM starting': InstanceState.CONFIGURING
     }
 
-    def __init__(self, provider, vm_instance):
+    def __init__(self, provider, vm_instance, network_profiles=None):
         super(AzureInstance, self).__init__(provider)
         self._vm = vm_instance
         self._update_state()
         if not self._vm.tags:
             self._vm.tags = {}
+        self._network_profiles = network_profiles
+        self._nic_cache = None
+        self._public_ip_cache = {}
+
+    def _invalidate_network(self):
+        """
+        Forget the NICs and public IPs resolved for this instance, and fetch
+        them individually from now on.
+        """
+        self._network_profiles = None
+        self._nic_cache = None
+        self._public_ip_cache = {}
 
     @property
     def _nic_ids(self):
@@ -1144,8 +1285,14 @@ class AzureInstance(BaseInstance):
 
     @property
     def _nics(self):
-        return (self._provider.azure_client.get_nic(nic_id)
-                for nic_id in self._nic_ids)
+        if self._nic_cache is None:
+            nics = []
+            for nic_id in self._nic_ids:
+                nic = (self._network_profiles.nic(nic_id)
+                       if self._network_profiles else None)
+                nics.append(nic or self._provider.azure_client.get_nic(nic_id))
+            self._nic_cache = nics
+        return self._nic_cache
 
     @property
     def _public_ip_ids(self):
@@ -1154,6 +1301,16 @@ class AzureInstance(BaseInstance):
                 for ip_config in nic.ip_configurations
                 if nic.ip_configurations and ip_config.public_ip_address)
 
+    def _public_ip(self, public_ip_id):
+        public_ip = self._public_ip_cache.get(public_ip_id)
+        if public_ip is None:
+            public_ip = (self._network_profiles.public_ip(public_ip_id)
+                         if self._network_profiles else None)
+            public_ip = (public_ip or self._provider.azure_client.
+                         get_floating_ip(public_ip_id))
+            self._public_ip_cache[public_ip_id] = public_ip
+        return public_ip
+
     @property
     def id(self):
         """
@@ -1190,7 +1347,7 @@ class AzureInstance(BaseInstance):
         """
         Get all the public IP addresses for this instance.
         """
-        return [self._provider.azure_client.get_floating_ip(pip).ip_address
+        return [self._public_ip(pip).ip_address
                 for pip in self._public_ip_ids]
 
     @property
@@ -1215,8 +1372,8 @@ class AzureInstance(BaseInstance):
         """
         Get the instance type.
         """
-        return self._provider.compute.vm_types.find(
-            name=self.vm_type_id)[0]
+        return self._related('vm_type', lambda: self._provider.compute.
+                             vm_types.find(name=self.vm_type_id)[0])
 
     def reboot(self):
         """
@@ -1267,8 +1424,9 @@ class AzureInstance(BaseInstance):
 
     @property
     def vm_firewalls(self):
-        return [self._provider.security.vm_firewalls.get(group_id)
-                for group_id in self.vm_firewall_ids]
+        return self._related('vm_firewalls', lambda: [
+            self._provider.security.vm_firewalls.get(group_id)
+            for group_id in self.vm_firewall_ids])
 
     @property
     def vm_firewall_ids(self):
@@ -1276,6 +1434,25 @@ class AzureInstance(BaseInstance):
                 for nic in self._nics
                 if nic.network_security_group]
 
+    @property
+    def subnet_id(self):
+        """
+        Get the subnet of the first IP configuration of the first NIC.
+        """
+        for nic in self._nics:
+            for ip_config in nic.ip_configurations or []:
+                if ip_config.subnet:
+                    return ip_config.subnet.id
+        return None
+
+    @classmethod
+    def _get_vm_firewalls(cls, provider, fw_ids):
+        if not fw_ids:
+            return {}
+        return dict((fw.id, AzureVMFirewall(provider, fw))
+                    for fw in provider.azure_client.list_vm_firewall()
+                    if fw.id in fw_ids)
+
     @property
     def key_pair_name(self):
         """
@@ -1298,8 +1475,8 @@ class AzureInstance(BaseInstance):
 
         self.assert_valid_resource_name(name)
 
-        if not self._state == 'VM generalized':
-            if not self._state == 'VM running':
+        if not self._current_state == 'VM generalized':
+            if not self._current_state == 'VM running':
                 self._provider.azure_client.start_vm(self.id)
 
             # if private_key_path:
@@ -1336,11 +1513,12 @@ class AzureInstance(BaseInstance):
         """
         floating_ip_id = floating_ip.id if isinstance(
             floating_ip, AzureFloatingIP) else floating_ip
-        nic = next(self._nics)
+        nic = self._nics[0]
         nic.ip_configurations[0].public_ip_address = {
             'id': floating_ip_id
         }
         self._provider.azure_client.update_nic(nic.id, nic)
+        self._invalidate_network()
 
     def remove_floating_ip(self, floating_ip):
         """
@@ -1348,11 +1526,12 @@ class AzureInstance(BaseInstance):
         """
         floating_ip_id = floating_ip.id if isinstance(
             floating_ip, AzureFloatingIP) else floating_ip
-        nic = next(self._nics)
+        nic = self._nics[0]
         for ip_config in nic.ip_configurations:
             if ip_config.public_ip_address.id == floating_ip_id:
                 nic.ip_configurations[0].public_ip_address = None
                 self._provider.azure_client.update_nic(nic.id, nic)
+                self._invalidate_network()
 
     def add_vm_firewall(self, fw):
         '''
@@ -1368,8 +1547,10 @@ class AzureInstance(BaseInstance):
         '''
         fw = (self._provider.security.vm_firewalls.get(fw)
               if isinstance(fw, str) else fw)
-        nic = next(self._nics)
+        nic = self._nics[0]
         if not nic.network_security_group:
+            from azure.mgmt.network.models import NetworkSecurityGroup
+
             nic.network_security_group = NetworkSecurityGroup()
             nic.network_security_group.id = fw.resource_id
         else:
@@ -1384,6 +1565,7 @@ class AzureInstance(BaseInstance):
             nic.network_security_group.id = new_fw.resource_id
 
         self._provider.azure_client.update_nic(nic.id, nic)
+        self._invalidate_network()
 
     def remove_vm_firewall(self, fw):
 
@@ -1399,42 +1581,58 @@ class AzureInstance(BaseInstance):
         else we are ignoring.
         '''
 
-        nic = next(self._nics)
+        nic = self._nics[0]
         fw = (self._provider.security.vm_firewalls.get(fw)
               if isinstance(fw, str) else fw)
         if nic.network_security_group and \
                 nic.network_security_group.id == fw.resource_id:
             nic.network_security_group = None
             self._provider.azure_client.update_nic(nic.id, nic)
+            self._invalidate_network()
 
     def _update_state(self):
         """
         Azure python sdk list operation does not return the current
-        staus of the instance. We have to explicity call the get method
-        for each instance to get the instance status(instance_view).
-        This is the limitation with azure rest api
+        staus of the instance (instance_view), unless the SDK is recent
+        enough for listings to expand it. Otherwise, the state is left
+        unresolved here and the instance view is fetched lazily, the first
+        time the state is actually read.
         :return:
         """
         if not self._vm.instance_view:
-            self.refresh()
-        if self._vm.instance_view and len(
-                self._vm.instance_view.statuses) > 1:
+            self._state = None
+        elif len(self._vm.instance_view.statuses) > 1:
             self._state = \
                 self._vm.instance_view.statuses[1].display_status
         else:
             self._state = \
                 self._vm.provisioning_state
 
+    @property
+    def _current_state(self):
+        if self._state is None:
+            try:
+                self._vm.instance_view = self._provider.azure_client. \
+                    get_vm_instance_view(self.id)
+                self._update_state()
+            except (CloudError, ValueError) as cloudError:
+                log.exception(cloudError.message)
+                self._state = 'unknown'
+            if self._state is None:
+                self._state = self._vm.provisioning_state
+        return self._state
+
     @property
     def state(self):
         return AzureInstance.INSTANCE_STATE_MAP.get(
-            self._state, InstanceState.UNKNOWN)
+            self._current_state, InstanceState.UNKNOWN)
 
     def refresh(self):
         """
         Refreshes the state of this instance by re-querying the cloud provider
         for its latest state.
         """
+        self._invalidate_network()
         try:
             self._vm = self._provider.azure_client.get_vm(self.id)
             if not self._vm.tags:
@@ -1446,6 +1644,22 @@ class AzureInstance(BaseInstance):
             # set the state to unknown
             self._state = 'unknown'
 
+    @classmethod
+    def _refresh_many(cls, provider, instances):
+        vms = dict((vm.id, vm) for vm in
+                   provider.azure_client.list_vm(instance_views=True))
+        for instance in instances:
+            vm = vms.get(instance.id)
+            # pylint:disable=protected-access
+            instance._invalidate_network()
+            if vm:
+                instance._vm = vm
+                if not instance._vm.tags:
+                    instance._vm.tags = {}
+                instance._update_state()
+            else:
+                instance._state = 'unknown'
+
 
 class AzureLaunchConfig(BaseLaunchConfig):
 
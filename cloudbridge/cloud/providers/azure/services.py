@@ -3,11 +3,10 @@ import logging
 import uuid
 
 from azure.common import AzureException
-from azure.mgmt.compute.models import DiskCreateOption
 
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import ClientPagedResultList, \
-    ServerPagedResultList
+    ServerPagedResultList, cached_listing
 from cloudbridge.cloud.base.services import BaseBucketService, \
     BaseComputeService, \
     BaseImageService, BaseInstanceService, BaseKeyPairService, \
@@ -26,6 +25,7 @@ from . import helpers as azure_helpers
 from .resources import AzureBucket, \
     AzureInstance, AzureKeyPair, \
     AzureLaunchConfig, AzureMachineImage, AzureNetwork, \
+    AzureNetworkProfiles, \
     AzureRegion, AzureRouter, AzureSnapshot, AzureSubnet, \
     AzureVMFirewall, AzureVMType, AzureVolume
 
@@ -302,6 +302,8 @@ class AzureVolumeService(BaseVolumeService):
         """
         Creates a new volume.
         """
+        from azure.mgmt.compute.models import DiskCreateOption
+
         AzureVolume.assert_valid_resource_name(name)
         zone_id = zone.id if isinstance(zone, PlacementZone) else zone
         snapshot = (self.provider.storage.snapshots.get(snapshot)
@@ -386,6 +388,8 @@ class AzureSnapshotService(BaseSnapshotService):
         """
         Creates a new snapshot of a given volume.
         """
+        from azure.mgmt.compute.models import DiskCreateOption
+
         AzureSnapshot.assert_valid_resource_name(name)
         volume = (self.provider.storage.volumes.get(volume)
                   if isinstance(volume, str) else volume)
@@ -602,6 +606,7 @@ class AzureInstanceService(BaseInstanceService):
 
     def _create_storage_profile(self, image, launch_config, instance_name,
                                 zone_id):
+        from azure.mgmt.compute.models import DiskCreateOption
 
         storage_profile = {
             'image_reference': {
@@ -631,6 +636,8 @@ class AzureInstanceService(BaseInstanceService):
         are requested (source is None and destination is VOLUME), they will be
         created and the relevant volume ids included in the mapping.
         """
+        from azure.mgmt.compute.models import DiskCreateOption
+
         data_disks = []
         root_disk_size = None
 
@@ -696,12 +703,18 @@ class AzureInstanceService(BaseInstanceService):
     def create_launch_config(self):
         return AzureLaunchConfig(self.provider)
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, expand=None):
         """
         List all instances.
         """
-        instances = [AzureInstance(self.provider, inst)
-                     for inst in self.provider.azure_client.list_vm()]
+        return self._expand(self._list(limit=limit, marker=marker), expand)
+
+    def _list(self, limit=None, marker=None):
+        profiles = AzureNetworkProfiles(self.provider)
+        instances = [AzureInstance(self.provider, inst,
+                                   network_profiles=profiles)
+                     for inst in self.provider.azure_client.list_vm(
+                         instance_views=True)]
         return ClientPagedResultList(self.provider, instances,
                                      limit=limit, marker=marker)
 
@@ -727,9 +740,12 @@ class AzureInstanceService(BaseInstanceService):
                             " Supported attributes: %s" % (kwargs, 'name'))
 
         filtr = {'Name': name}
-        instances = [AzureInstance(self.provider, inst)
+        profiles = AzureNetworkProfiles(self.provider)
+        instances = [AzureInstance(self.provider, inst,
+                                   network_profiles=profiles)
                      for inst in azure_helpers.filter_by_tag(
-                self.provider.azure_client.list_vm(), filtr)]
+                self.provider.azure_client.list_vm(instance_views=True),
+                filtr)]
         return ClientPagedResultList(self.provider, instances)
 
 
@@ -763,6 +779,7 @@ class AzureImageService(BaseImageService):
                 self.provider.azure_client.list_images(), filters)]
         return ClientPagedResultList(self.provider, cb_images)
 
+    @cached_listing
     def list(self, limit=None, marker=None):
         """
         List all images.
@@ -787,6 +804,7 @@ class AzureVMTypeService(BaseVMTypeService):
         r = self.provider.azure_client.list_vm_types()
         return r
 
+    @cached_listing
     def list(self, limit=None, marker=None):
         vm_types = [AzureVMType(self.provider, vm_type)
                     for vm_type in self.instance_data]
@@ -890,7 +908,12 @@ class AzureRegionService(BaseRegionService):
                 break
         return region
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, include_zones=False):
+        return self._with_zones(self._list(limit=limit, marker=marker),
+                                include_zones)
+
+    @cached_listing
+    def _list(self, limit=None, marker=None):
         regions = [AzureRegion(self.provider, region)
                    for region in self.provider.azure_client.list_locations()]
         return ClientPagedResultList(self.provider, regions,
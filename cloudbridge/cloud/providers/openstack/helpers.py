@@ -1,6 +1,7 @@
 """
 Helper functions
 """
+import importlib
 import itertools
 import logging as log
 
@@ -38,3 +39,13 @@ def to_server_paged_list(provider, objects, limit=None):
     for obj in itertools.islice(objects, limit):
         results.append(obj)
     return results
+
+
+def sdk_exception(module_name, class_name):
+    """
+    Get an exception class of one of the OpenStack SDKs, importing its module
+    on first use. Used in ``except`` clauses, which are only evaluated once
+    an exception is raised, so that importing this provider does not load
+    the SDKs themselves.
+    """
+    return getattr(importlib.import_module(module_name), class_name)
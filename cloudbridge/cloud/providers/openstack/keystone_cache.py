@@ -0,0 +1,163 @@
+"""
+Process-wide caches of Keystone versions and sessions, shared by all
+OpenStack providers so that each set of credentials authenticates once.
+"""
+import base64
+import errno
+import hashlib
+import logging
+import os
+import threading
+
+import cloudbridge.cloud.base.helpers as cb_helpers
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_versions = {}
+_sessions = {}
+# Serialises the authentication of each set of credentials
+_session_locks = {}
+
+
+def keystone_version(auth_url):
+    """
+    Return the numeric version (2 or 3) of the Keystone server at
+    ``auth_url``, discovering it only once per process.
+    """
+    with _lock:
+        version = _versions.get(auth_url)
+    if version is None:
+        from keystoneclient import client as keystone_client
+
+        ks_version = keystone_client.Client(auth_url=auth_url).version
+        version = 3 if ks_version == 'v3' else 2
+        with _lock:
+            _versions[auth_url] = version
+    return version
+
+
+def session_key(auth_url, username, password, project_name,
+                user_domain_name=None, project_domain_name=None):
+    """
+    Return the key under which the session for a set of credentials is
+    cached. The password is only included as a digest.
+    """
+    digest = hashlib.sha256((password or '').encode('utf-8')).hexdigest()
+    return (auth_url, username, digest, project_name, user_domain_name,
+            project_domain_name)
+
+
+class TokenStore(object):
+    """
+    Keeps the Keystone tokens of a set of credentials on disk, encrypted
+    with a key derived from the password, so that short-lived processes can
+    reuse an unexpired token instead of authenticating again.
+
+    The file is named after the user and project alone. The password only
+    ever reaches the disk through the key derivation, so that the name of
+    the file cannot be used to check guesses of it.
+    """
+    SALT_SIZE = 16
+    KDF_ITERATIONS = 100000
+
+    def __init__(self, cache_dir, auth_url, username, password, project_name,
+                 user_domain_name=None, project_domain_name=None):
+        identity = (auth_url, username, project_name, user_domain_name,
+                    project_domain_name)
+        self.path = os.path.join(cache_dir, 'keystone', hashlib.sha256(
+            repr(identity).encode('utf-8')).hexdigest())
+        self._password = (password or '').encode('utf-8')
+
+    def _fernet(self, salt):
+        from cryptography.fernet import Fernet
+
+        key = hashlib.pbkdf2_hmac('sha256', self._password, salt,
+                                  self.KDF_ITERATIONS)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def load(self):
+        """
+        Return the stored auth state, or ``None`` if there is none or it
+        cannot be decrypted.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            salt, token = data[:self.SALT_SIZE], data[self.SALT_SIZE:]
+            return self._fernet(salt).decrypt(token).decode('utf-8')
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            log.debug("Ignoring unreadable Keystone token cache %s: %s",
+                      self.path, e)
+            return None
+
+    def save(self, state):
+        salt = os.urandom(self.SALT_SIZE)
+        try:
+            try:
+                os.makedirs(os.path.dirname(self.path), 0o700)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            cb_helpers.atomic_write(
+                self.path,
+                salt + self._fernet(salt).encrypt(state.encode('utf-8')))
+        except Exception as e:
+            log.warning("Cannot persist Keystone token to %s: %s",
+                        self.path, e)
+
+
+def get_session(key, make_auth, token_store=None, pool_size=None):
+    """
+    Return the Keystone session cached under ``key``, creating it with the
+    auth plugin returned by ``make_auth`` if there is none. The session
+    reauthenticates by itself once its token is about to expire.
+
+    :type token_store: :class:`TokenStore`
+    :param token_store: If given, a new session starts from the token kept
+                        in the store, if it has not expired, and the token
+                        in use is stored for other processes.
+
+    :type pool_size: ``int``
+    :param pool_size: If given, the maximum number of keep-alive connections
+                      that a new session keeps open to each host.
+    """
+    with _lock:
+        sess = _sessions.get(key)
+        if sess is not None:
+            return sess
+        session_lock = _session_locks.setdefault(key, threading.Lock())
+    with session_lock:
+        with _lock:
+            sess = _sessions.get(key)
+        if sess is None:
+            from keystoneauth1 import session
+
+            auth = make_auth()
+            state = token_store.load() if token_store else None
+            if state:
+                auth.set_auth_state(state)
+            http = cb_helpers.http_session(pool_size) if pool_size else None
+            sess = session.Session(auth=auth, session=http)
+            if token_store:
+                # Authenticate now, which is a no-op while a stored token is
+                # valid, so that a fresh token can be stored
+                sess.get_token()
+                new_state = auth.get_auth_state()
+                if new_state and new_state != state:
+                    token_store.save(new_state)
+            with _lock:
+                _sessions[key] = sess
+    return sess
+
+
+def clear():
+    """
+    Forget all cached Keystone versions and sessions.
+    """
+    with _lock:
+        _versions.clear()
+        _sessions.clear()
+        _session_locks.clear()
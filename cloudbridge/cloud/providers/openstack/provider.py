@@ -3,23 +3,10 @@
 import inspect
 import os
 
-from cinderclient import client as cinder_client
-
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.cache import ClientPool
 
-from keystoneauth1 import session
-
-from keystoneclient import client as keystone_client
-
-from neutronclient.v2_0 import client as neutron_client
-
-from novaclient import client as nova_client
-from novaclient import shell as nova_shell
-
-from openstack import connection
-
-from swiftclient import client as swift_client
-
+from . import keystone_cache
 from .services import OpenStackComputeService
 from .services import OpenStackNetworkingService
 from .services import OpenStackSecurityService
@@ -51,17 +38,12 @@ class OpenStackCloudProvider(BaseCloudProvider):
             os.environ.get('OS_PROJECT_DOMAIN_NAME', None))
         self.user_domain_name = self._get_config_value(
             'os_user_domain_name', os.environ.get('OS_USER_DOMAIN_NAME', None))
+        self._token_cache = str(self._get_config_value(
+            'os_token_cache', os.environ.get('OS_TOKEN_CACHE', False))
+        ).lower() in ('true', '1', 'yes')
 
-        # Service connections, lazily initialized
-        self._nova = None
-        self._keystone = None
-        self._glance = None
-        self._cinder = None
-        self._swift = None
-        self._neutron = None
-        self._os_conn = None
-
-        # Additional cached variables
+        # Service connections are lazily initialized, and kept in
+        # self._clients. All of them share the Keystone session.
         self._cached_keystone_session = None
 
         # Initialize provider services
@@ -72,58 +54,74 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     @property
     def nova(self):
-        if not self._nova:
-            self._nova = self._connect_nova()
-        return self._nova
+        return self._clients.get('nova', self._connect_nova)
 
     @property
     def keystone(self):
-        if not self._keystone:
-            self._keystone = self._connect_keystone()
-        return self._keystone
+        return self._clients.get('keystone', self._connect_keystone)
 
     @property
     def _keystone_version(self):
         """
-        Return the numeric version of remote Keystone server.
+        Return the numeric version of remote Keystone server. The version of
+        each Keystone server is only discovered once per process.
 
         :rtype: ``int``
         :return: Keystone version as an int (currently, 2 or 3).
         """
-        ks_version = keystone_client.Client(auth_url=self.auth_url).version
-        if ks_version == 'v3':
-            return 3
-        return 2
+        return keystone_cache.keystone_version(self.auth_url)
 
     @property
     def _keystone_session(self):
         """
         Connect to Keystone and return a session object.
 
+        Sessions are shared by all providers in the process, and all of their
+        threads, that use the same credentials, and reuse their token until
+        it expires. Their HTTP connection pools hold up to
+        ``config.http_pool_size`` connections to each host. If
+        ``os_token_cache`` (or the ``OS_TOKEN_CACHE`` environment variable)
+        is set, tokens are also kept, encrypted, under ``config.cache_dir``
+        so that other processes can reuse them.
+
         :rtype: :class:`keystoneauth1.session.Session`
         :return: A Keystone session object.
         """
         if self._cached_keystone_session:
             return self._cached_keystone_session
 
+        key = keystone_cache.session_key(
+            self.auth_url, self.username, self.password, self.project_name,
+            self.user_domain_name, self.project_domain_name)
+        token_store = None
+        if self._token_cache and self.config.cache_dir:
+            token_store = keystone_cache.TokenStore(
+                self.config.cache_dir, self.auth_url, self.username,
+                self.password, self.project_name, self.user_domain_name,
+                self.project_domain_name)
+        self._cached_keystone_session = keystone_cache.get_session(
+            key, self._keystone_auth, token_store,
+            pool_size=self.config.http_pool_size)
+        return self._cached_keystone_session
+
+    def _keystone_auth(self):
         if self._keystone_version == 3:
             from keystoneauth1.identity import v3
-            auth = v3.Password(auth_url=self.auth_url,
+            return v3.Password(auth_url=self.auth_url,
                                username=self.username,
                                password=self.password,
                                user_domain_name=self.user_domain_name,
                                project_domain_name=self.project_domain_name,
                                project_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
         else:
             from keystoneauth1.identity import v2
-            auth = v2.Password(self.auth_url, username=self.username,
+            return v2.Password(self.auth_url, username=self.username,
                                password=self.password,
                                tenant_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
-        return self._cached_keystone_session
 
     def _connect_openstack(self):
+        from openstack import connection
+
         return connection.Connection(
             region_name=self.region_name,
             user_agent='cloudbridge',
@@ -143,27 +141,28 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     @property
     def cinder(self):
-        if not self._cinder:
-            self._cinder = self._connect_cinder()
-        return self._cinder
+        return self._clients.get('cinder', self._connect_cinder)
 
     @property
     def swift(self):
-        if not self._swift:
-            self._swift = self._connect_swift()
-        return self._swift
+        return self._clients.get('swift', self._connect_swift)
+
+    @property
+    def _thread_swift(self):
+        """
+        A swift connection private to the calling thread, for use by the
+        parts of parallel transfers. It is reused by all transfers made
+        by the thread, so that its connections are kept alive.
+        """
+        return self._thread_clients.get('swift', self._connect_swift)
 
     @property
     def neutron(self):
-        if not self._neutron:
-            self._neutron = self._connect_neutron()
-        return self._neutron
+        return self._clients.get('neutron', self._connect_neutron)
 
     @property
     def os_conn(self):
-        if not self._os_conn:
-            self._os_conn = self._connect_openstack()
-        return self._os_conn
+        return self._clients.get('os_conn', self._connect_openstack)
 
     @property
     def compute(self):
@@ -184,10 +183,19 @@ class OpenStackCloudProvider(BaseCloudProvider):
     def _connect_nova(self):
         return self._connect_nova_region(self.region_name)
 
+    def _nova_region(self, region_name):
+        """Get a pooled Nova client for the given region."""
+        if region_name == self.region_name:
+            return self.nova
+        # Nova clients for other regions than region_name
+        return self._clients.get(
+            'nova_region_clients',
+            lambda: ClientPool(self._connect_nova_region)).get(region_name)
+
     def _connect_nova_region(self, region_name):
         """Get an OpenStack Nova (compute) client object."""
-        # Force reauthentication with Keystone
-        self._cached_keystone_session = None
+        from novaclient import client as nova_client
+        from novaclient import shell as nova_shell
 
         api_version = self._get_config_value(
             'os_compute_api_version',
@@ -209,6 +217,8 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     def _connect_keystone(self):
         """Get an OpenStack Keystone (identity) client object."""
+        from keystoneclient import client as keystone_client
+
         if self._keystone_version == 3:
             return keystone_client.Client(session=self._keystone_session,
                                           auth_url=self.auth_url)
@@ -230,6 +240,8 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     def _connect_cinder(self):
         """Get an OpenStack Cinder (block storage) client object."""
+        from cinderclient import client as cinder_client
+
         api_version = self._get_config_value(
             'os_volume_api_version',
             os.environ.get('OS_VOLUME_API_VERSION', 2))
@@ -298,6 +310,8 @@ class OpenStackCloudProvider(BaseCloudProvider):
         :return: A Swift client connection using the auth credentials held by
             the OpenStackCloudProvider instance
         """
+        from swiftclient import client as swift_client
+
         clean_options = self._clean_options(options,
                                             swift_client.Connection.__init__)
         storage_url = self._get_config_value(
@@ -314,6 +328,8 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     def _connect_neutron(self):
         """Get an OpenStack Neutron (networking) client object cloud."""
+        from neutronclient.v2_0 import client as neutron_client
+
         return neutron_client.Client(auth_url=self.auth_url,
                                      session=self._keystone_session,
                                      region_name=self.region_name)
@@ -1,10 +1,13 @@
 """
 DataTypes used by this provider
 """
+import collections
 import inspect
 import ipaddress
+import json
 import logging
 import os
+import time
 
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseAttachmentInfo
@@ -30,6 +33,7 @@ from cloudbridge.cloud.base.resources import BaseVMFirewallRuleContainer
 from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import PrefixListing
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
@@ -42,17 +46,9 @@ from cloudbridge.cloud.interfaces.resources import TrafficDirection
 from cloudbridge.cloud.interfaces.resources import VolumeState
 from cloudbridge.cloud.providers.openstack import helpers as oshelpers
 
-from keystoneclient.v3.regions import Region
-
-from neutronclient.common.exceptions import PortNotFoundClient
-
-import novaclient.exceptions as novaex
-
-from openstack.exceptions import HttpException
-from openstack.exceptions import ResourceNotFound
-
-import swiftclient
-from swiftclient.service import SwiftService, SwiftUploadObject
+import six
+from six.moves.urllib.parse import quote
+from six.moves.urllib.parse import unquote
 
 
 ONE_GIG = 1048576000  # in bytes
@@ -327,9 +323,10 @@ class OpenStackInstance(BaseInstance):
         """
         Get the VM type object.
         """
-        flavor = self._provider.nova.flavors.get(
-            self._os_instance.flavor.get('id'))
-        return OpenStackVMType(self._provider, flavor)
+        return self._related('vm_type', lambda: OpenStackVMType(
+            self._provider,
+            self._provider.nova.flavors.get(self._os_instance.flavor.get('id'))
+        ))
 
     def reboot(self):
         """
@@ -368,17 +365,80 @@ class OpenStackInstance(BaseInstance):
 
     @property
     def vm_firewalls(self):
-        return [
-            self._provider.security.vm_firewalls.get(group.id)
-            for group in self._os_instance.list_security_group()
-        ]
+        def fetch():
+            # The same single, batched request as for an expanded listing
+            fw_ids = self.vm_firewall_ids
+            firewalls = self._get_vm_firewalls(self._provider, set(fw_ids))
+            return [firewalls[fw_id] for fw_id in fw_ids
+                    if firewalls.get(fw_id)]
+        return self._related('vm_firewalls', fetch)
+
+    @property
+    def _ports(self):
+        ports = self._related('ports', lambda: None)
+        if ports is None:
+            ports = self._provider.neutron.list_ports(
+                device_id=self.id).get('ports', [])
+            # Several properties read the ports, so they are kept until the
+            # instance is refreshed
+            self._set_related('ports', ports)
+        return ports
 
     @property
     def vm_firewall_ids(self):
         """
         Get the VM firewall IDs associated with this instance.
         """
-        return [fw.id for fw in self.vm_firewalls]
+        fw_ids = []
+        for port in self._ports:
+            for fw_id in port.get('security_groups', []):
+                if fw_id not in fw_ids:
+                    fw_ids.append(fw_id)
+        return fw_ids
+
+    @property
+    def subnet_id(self):
+        """
+        Get the subnet of the first fixed IP of this instance's ports.
+        """
+        for port in self._ports:
+            for fixed_ip in port.get('fixed_ips', []):
+                return fixed_ip.get('subnet_id')
+        return None
+
+    @classmethod
+    def _expand_many(cls, provider, instances, expand):
+        if 'vm_firewalls' in expand or 'subnet' in expand:
+            # Firewall and subnet ids are read from the instances' ports,
+            # which are all listed at once
+            ports = collections.defaultdict(list)
+            response = provider.neutron.list_ports(
+                device_id=[inst.id for inst in instances])
+            for port in response.get('ports', []):
+                ports[port['device_id']].append(port)
+            for inst in instances:
+                # pylint:disable=protected-access
+                inst._set_related('ports', ports.get(inst.id, []))
+        super(OpenStackInstance, cls)._expand_many(provider, instances, expand)
+
+    @classmethod
+    def _get_vm_firewalls(cls, provider, fw_ids):
+        if not fw_ids:
+            return {}
+        # Older SDKs may not pass the id filter on, hence the check
+        return dict((fw.id, OpenStackVMFirewall(provider, fw))
+                    for fw in provider.os_conn.network.security_groups(
+                        id=list(fw_ids))
+                    if fw.id in fw_ids)
+
+    @classmethod
+    def _get_subnets(cls, provider, subnet_ids):
+        if not subnet_ids:
+            return {}
+        subnets = provider.neutron.list_subnets(
+            id=list(subnet_ids)).get('subnets', [])
+        return dict((subnet['id'], OpenStackSubnet(provider, subnet))
+                    for subnet in subnets)
 
     @property
     def key_pair_name(self):
@@ -430,6 +490,7 @@ class OpenStackInstance(BaseInstance):
         """
         log.debug("Adding firewall: %s", firewall)
         self._os_instance.add_security_group(firewall.id)
+        self._clear_related()
 
     def remove_vm_firewall(self, firewall):
         """
@@ -437,6 +498,7 @@ class OpenStackInstance(BaseInstance):
         """
         log.debug("Removing firewall: %s", firewall)
         self._os_instance.remove_security_group(firewall.id)
+        self._clear_related()
 
     @property
     def state(self):
@@ -450,6 +512,7 @@ class OpenStackInstance(BaseInstance):
         """
         instance = self._provider.compute.instances.get(
             self.id)
+        self._clear_related()
         if instance:
             # pylint:disable=protected-access
             self._os_instance = instance._os_instance
@@ -458,6 +521,21 @@ class OpenStackInstance(BaseInstance):
             # set the status to unknown
             self._os_instance.status = 'unknown'
 
+    @classmethod
+    def _refresh_many(cls, provider, instances):
+        # Nova only allows non-admin users to filter server listings by a
+        # single id, so fetch the project's servers in one paged listing and
+        # pick out the ones of interest.
+        servers = dict((server.id, server)
+                       for server in provider.nova.servers.list(limit=-1))
+        for instance in instances:
+            server = servers.get(instance.id)
+            if server:
+                # pylint:disable=protected-access
+                instance._os_instance = server
+            else:
+                instance._os_instance.status = 'unknown'
+
 
 class OpenStackRegion(BaseRegion):
 
@@ -467,16 +545,17 @@ class OpenStackRegion(BaseRegion):
 
     @property
     def id(self):
-        return (self._os_region.id if type(self._os_region) == Region else
-                self._os_region)
+        return (self._os_region if isinstance(self._os_region,
+                                              six.string_types)
+                else self._os_region.id)
 
     @property
     def name(self):
-        return (self._os_region.id if type(self._os_region) == Region else
-                self._os_region)
+        return (self._os_region if isinstance(self._os_region,
+                                              six.string_types)
+                else self._os_region.id)
 
-    @property
-    def zones(self):
+    def _fetch_zones(self):
         # ``detailed`` param must be set to ``False`` because the (default)
         # ``True`` value requires Admin privileges
         if self.name == self._provider.region_name:  # optimisation
@@ -484,9 +563,10 @@ class OpenStackRegion(BaseRegion):
         else:
             try:
                 # pylint:disable=protected-access
-                region_nova = self._provider._connect_nova_region(self.name)
+                region_nova = self._provider._nova_region(self.name)
                 zones = region_nova.availability_zones.list(detailed=False)
-            except novaex.EndpointNotFound:
+            except oshelpers.sdk_exception('novaclient.exceptions',
+                                           'EndpointNotFound'):
                 # This region may not have a compute endpoint. If so just
                 # return an empty list
                 zones = []
@@ -626,6 +706,18 @@ class OpenStackVolume(BaseVolume):
             # set the status to unknown
             self._volume.status = 'unknown'
 
+    @classmethod
+    def _refresh_many(cls, provider, volumes):
+        os_volumes = dict((vol.id, vol)
+                          for vol in provider.cinder.volumes.list())
+        for volume in volumes:
+            os_volume = os_volumes.get(volume.id)
+            if os_volume:
+                # pylint:disable=protected-access
+                volume._volume = os_volume
+            else:
+                volume._volume.status = 'unknown'
+
 
 class OpenStackSnapshot(BaseSnapshot):
 
@@ -834,7 +926,9 @@ class OpenStackNetwork(BaseNetwork):
             for port in ports:
                 try:
                     self._provider.neutron.delete_port(port.get('id'))
-                except PortNotFoundClient:
+                except oshelpers.sdk_exception(
+                        'neutronclient.common.exceptions',
+                        'PortNotFoundClient'):
                     # Ports could have already been deleted if instances
                     # are terminated etc. so exceptions can be safely ignored
                     pass
@@ -932,7 +1026,8 @@ class OpenStackFloatingIPContainer(BaseFloatingIPContainer):
         try:
             return OpenStackFloatingIP(
                 self._provider, self._provider.os_conn.network.get_ip(fip_id))
-        except ResourceNotFound:
+        except oshelpers.sdk_exception('openstack.exceptions',
+                                       'ResourceNotFound'):
             return None
 
     def list(self, limit=None, marker=None):
@@ -1190,7 +1285,8 @@ class OpenStackVMFirewallRuleContainer(BaseVMFirewallRuleContainer):
                 remote_group_id=src_dest_fw_id)
             self.firewall.refresh()
             return OpenStackVMFirewallRule(self.firewall, rule.to_dict())
-        except HttpException as e:
+        except oshelpers.sdk_exception('openstack.exceptions',
+                                       'HttpException') as e:
             self.firewall.refresh()
             # 409=Conflict, raised for duplicate rule
             if e.http_status == 409:
@@ -1263,6 +1359,11 @@ class OpenStackBucketObject(BaseBucketObject):
         self.cbcontainer = cbcontainer
         self._obj = obj
 
+    @property
+    def _thread_swift(self):
+        # pylint:disable=protected-access
+        return self._provider._thread_swift
+
     @property
     def id(self):
         return self._obj.get("name")
@@ -1280,10 +1381,12 @@ class OpenStackBucketObject(BaseBucketObject):
     def last_modified(self):
         return self._obj.get("last_modified")
 
-    def iter_content(self):
+    def iter_content(self, chunk_size=None):
         """Returns this object's content as an iterable."""
         _, content = self._provider.swift.get_object(
-            self.cbcontainer.name, self.name, resp_chunk_size=65536)
+            self.cbcontainer.name, self.name,
+            resp_chunk_size=chunk_size or
+            self._provider.config.default_read_chunk_size)
         return content
 
     def upload(self, data):
@@ -1291,7 +1394,8 @@ class OpenStackBucketObject(BaseBucketObject):
         Set the contents of this object to the data read from the source
         string.
 
-        .. warning:: Will fail if the data is larger than 5 Gig.
+        .. warning:: Will fail if the data is larger than 5 Gig. Use
+                     :meth:`upload_stream` for larger objects.
         """
         self._provider.swift.put_object(self.cbcontainer.name, self.name,
                                         data)
@@ -1315,6 +1419,9 @@ class OpenStackBucketObject(BaseBucketObject):
 
         .. seealso:: https://github.com/gvlproject/cloudbridge/issues/35#issuecomment-297629661 # noqa
         """
+        from swiftclient import service as swift_service
+        from swiftclient.service import SwiftService, SwiftUploadObject
+
         upload_options = {}
         if 'segment_size' not in upload_options:
             if os.path.getsize(path) >= FIVE_GIG:
@@ -1322,7 +1429,7 @@ class OpenStackBucketObject(BaseBucketObject):
 
         # remap the swift service's connection factory method
         # pylint:disable=protected-access
-        swiftclient.service.get_conn = self._provider._connect_swift
+        swift_service.get_conn = self._provider._connect_swift
 
         result = True
         with SwiftService() as swift:
@@ -1333,6 +1440,69 @@ class OpenStackBucketObject(BaseBucketObject):
                 result = result and up_res['success']
         return result
 
+    def _start_multipart_upload(self):
+        """
+        Uploads are stored as a Static Large Object (SLO), whose segments are
+        kept in a ``<container>_segments`` container, as done by the swift
+        command line client.
+        """
+        segment_container = self.cbcontainer.name + '_segments'
+        self._provider.swift.put_container(segment_container)
+        return {'container': segment_container,
+                'prefix': '{0}/slo/{1}/'.format(self.name, time.time())}
+
+    # Swift rejects SLO manifests with more segments than this, by default
+    MAX_UPLOAD_PARTS = 1000
+
+    def _upload_part(self, upload, part_number, data):
+        if part_number > self.MAX_UPLOAD_PARTS:
+            raise InvalidValueException('part_number', part_number)
+        segment = '{0}{1:08d}'.format(upload['prefix'], part_number)
+        etag = self._thread_swift.put_object(upload['container'], segment,
+                                             data)
+        return {'path': '/{0}/{1}'.format(upload['container'], segment),
+                'etag': etag, 'size_bytes': len(data)}
+
+    def _complete_multipart_upload(self, upload, parts):
+        self._provider.swift.put_object(
+            self.cbcontainer.name, self.name, json.dumps(parts),
+            query_string='multipart-manifest=put')
+
+    def _abort_multipart_upload(self, upload):
+        _, segments = self._provider.swift.get_container(
+            upload['container'], prefix=upload['prefix'], full_listing=True)
+        for segment in segments:
+            self._provider.swift.delete_object(upload['container'],
+                                               segment['name'])
+
+    def _read_range(self, start, end):
+        _, content = self._thread_swift.get_object(
+            self.cbcontainer.name, self.name,
+            headers={'Range': 'bytes={0}-{1}'.format(start, end)})
+        return content
+
+    def _server_side_copy(self, target_bucket, name):
+        source = '/{0}/{1}'.format(self.cbcontainer.name, self.name)
+        self._provider.swift.put_object(
+            target_bucket.name, name, None,
+            headers={'X-Copy-From': quote(source.encode('utf-8'))})
+        return True
+
+    def _content_md5(self):
+        # The ETag of large objects is computed from their segments
+        headers = self._provider.swift.head_object(self.cbcontainer.name,
+                                                   self.name)
+        if ('x-static-large-object' in headers or
+                'x-object-manifest' in headers):
+            return None
+        return headers.get('etag', '').strip('"') or None
+
+    def _listing_md5(self):
+        # Listings flag static large objects with their ETag, if at all
+        if 'slo_etag' in self._obj:
+            return None
+        return self._obj.get('hash')
+
     def delete(self):
         """
         Delete this object.
@@ -1344,10 +1514,12 @@ class OpenStackBucketObject(BaseBucketObject):
               ``swiftclient.service.get_conn`` factory method to
               ``self._provider._connect_swift``
         """
+        from swiftclient import service as swift_service
+        from swiftclient.service import SwiftService
 
         # remap the swift service's connection factory method
         # pylint:disable=protected-access
-        swiftclient.service.get_conn = self._provider._connect_swift
+        swift_service.get_conn = self._provider._connect_swift
 
         result = True
         with SwiftService() as swift:
@@ -1389,6 +1561,8 @@ class OpenStackBucket(BaseBucket):
         return self._object_container
 
     def delete(self, delete_contents=False):
+        if delete_contents:
+            self._delete_contents()
         self._provider.swift.delete_container(self.name)
 
 
@@ -1396,6 +1570,12 @@ class OpenStackBucketContainer(BaseBucketContainer):
 
     def __init__(self, provider, bucket):
         super(OpenStackBucketContainer, self).__init__(provider, bucket)
+        self._bulk_delete = None
+
+    @property
+    def _thread_swift(self):
+        # pylint:disable=protected-access
+        return self._provider._thread_swift
 
     def get(self, name):
         """
@@ -1413,6 +1593,10 @@ class OpenStackBucketContainer(BaseBucketContainer):
         else:
             return None
 
+    # Swift returns up to 10000 objects per listing by default, and one more
+    # than the limit is requested to detect further pages
+    ITER_PAGE_SIZE = 9999
+
     def list(self, limit=None, marker=None, prefix=None):
         """
         List all objects within this bucket.
@@ -1432,11 +1616,66 @@ class OpenStackBucketContainer(BaseBucketContainer):
             cb_objects,
             limit)
 
+    def list_prefixes(self, prefix=None, delimiter='/'):
+        _, object_list = self._provider.swift.get_container(
+            self.bucket.name, prefix=prefix, delimiter=delimiter,
+            full_listing=True)
+        prefixes = []
+        objects = []
+        for obj in object_list:
+            # Common prefixes are returned as pseudo-directory entries
+            if 'subdir' in obj:
+                prefixes.append(obj['subdir'])
+            else:
+                objects.append(
+                    OpenStackBucketObject(self._provider, self.bucket, obj))
+        return PrefixListing(prefixes, objects)
+
+    # The bulk delete middleware accepts up to 10,000 objects per request by
+    # default
+    DELETE_BATCH_SIZE = 1000
+
+    def _supports_bulk_delete(self):
+        if self._bulk_delete is None:
+            try:
+                self._bulk_delete = ('bulk_delete' in
+                                     self._provider.swift.get_capabilities())
+            except oshelpers.sdk_exception('swiftclient',
+                                           'ClientException'):
+                self._bulk_delete = False
+        return self._bulk_delete
+
+    def _delete_batch(self, keys):
+        failures = {}
+        if not self._supports_bulk_delete():
+            for key in keys:
+                try:
+                    self._thread_swift.delete_object(self.bucket.name, key)
+                except oshelpers.sdk_exception('swiftclient',
+                                               'ClientException') as e:
+                    if e.http_status != 404:
+                        failures[key] = str(e)
+            return failures
+
+        paths = [quote('/{0}/{1}'.format(self.bucket.name, key)
+                       .encode('utf-8')) for key in keys]
+        _, body = self._thread_swift.post_account(
+            headers={'Accept': 'application/json',
+                     'Content-Type': 'text/plain'},
+            query_string='bulk-delete', data='\n'.join(paths))
+        result = json.loads(body)
+        for path, status in result.get('Errors', []):
+            # Errors are reported against the /<container>/<object> path
+            failures[unquote(path).split('/', 2)[2]] = status
+        if not result.get('Response Status', '').startswith('2') and \
+                not failures:
+            reason = result.get('Response Body') or result.get(
+                'Response Status')
+            failures = dict((key, reason) for key in keys)
+        return failures
+
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(['name'], kwargs)
 
     def create(self, object_name):
         self._provider.swift.put_object(self.bucket.name, object_name, None)
@@ -5,11 +5,10 @@ import fnmatch
 import logging
 import re
 
-from cinderclient.exceptions import NotFound as CinderNotFound
-
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseLaunchConfig
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import cached_listing
 from cloudbridge.cloud.base.services import BaseBucketService
 from cloudbridge.cloud.base.services import BaseComputeService
 from cloudbridge.cloud.base.services import BaseImageService
@@ -38,12 +37,6 @@ from cloudbridge.cloud.interfaces.resources import VMType
 from cloudbridge.cloud.interfaces.resources import Volume
 from cloudbridge.cloud.providers.openstack import helpers as oshelpers
 
-from neutronclient.common.exceptions import NeutronClientException
-
-from novaclient.exceptions import NotFound as NovaNotFound
-
-from openstack.exceptions import ResourceNotFound
-
 from .resources import OpenStackBucket
 from .resources import OpenStackInstance
 from .resources import OpenStackInternetGateway
@@ -134,7 +127,7 @@ class OpenStackKeyPairService(BaseKeyPairService):
         try:
             return OpenStackKeyPair(
                 self.provider, self.provider.nova.keypairs.get(key_pair_id))
-        except NovaNotFound:
+        except oshelpers.sdk_exception('novaclient.exceptions', 'NotFound'):
             log.debug("KeyPair %s was not found.", key_pair_id)
             return None
 
@@ -198,7 +191,8 @@ class OpenStackVMFirewallService(BaseVMFirewallService):
             return OpenStackVMFirewall(
                 self.provider,
                 self.provider.os_conn.network.get_security_group(firewall_id))
-        except ResourceNotFound:
+        except oshelpers.sdk_exception('openstack.exceptions',
+                                       'ResourceNotFound'):
             log.debug("Firewall %s not found.", firewall_id)
             return None
 
@@ -256,7 +250,8 @@ class OpenStackImageService(BaseImageService):
         try:
             return OpenStackMachineImage(
                 self.provider, self.provider.os_conn.image.get_image(image_id))
-        except ResourceNotFound:
+        except oshelpers.sdk_exception('openstack.exceptions',
+                                       'ResourceNotFound'):
             log.debug("ResourceNotFound exception raised, %s not found",
                       image_id)
             return None
@@ -347,7 +342,7 @@ class OpenStackVolumeService(BaseVolumeService):
         try:
             return OpenStackVolume(
                 self.provider, self.provider.cinder.volumes.get(volume_id))
-        except CinderNotFound:
+        except oshelpers.sdk_exception('cinderclient.exceptions', 'NotFound'):
             log.debug("Volume %s was not found.", volume_id)
             return None
 
@@ -415,7 +410,7 @@ class OpenStackSnapshotService(BaseSnapshotService):
             return OpenStackSnapshot(
                 self.provider,
                 self.provider.cinder.volume_snapshots.get(snapshot_id))
-        except CinderNotFound:
+        except oshelpers.sdk_exception('cinderclient.exceptions', 'NotFound'):
             log.debug("Snapshot %s was not found.", snapshot_id)
             return None
 
@@ -537,7 +532,12 @@ class OpenStackRegionService(BaseRegionService):
         region = (r for r in self if r.id == region_id)
         return next(region, None)
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, include_zones=False):
+        return self._with_zones(self._list(limit=limit, marker=marker),
+                                include_zones)
+
+    @cached_listing
+    def _list(self, limit=None, marker=None):
         # pylint:disable=protected-access
         if self.provider._keystone_version == 3:
             os_regions = [OpenStackRegion(self.provider, region)
@@ -747,7 +747,7 @@ class OpenStackInstanceService(BaseInstanceService):
                 marker=None)]
         return oshelpers.to_server_paged_list(self.provider, cb_insts)
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, expand=None):
         """
         List all instances.
         """
@@ -756,7 +756,9 @@ class OpenStackInstanceService(BaseInstanceService):
             for inst in self.provider.nova.servers.list(
                 limit=oshelpers.os_result_limit(self.provider, limit),
                 marker=marker)]
-        return oshelpers.to_server_paged_list(self.provider, cb_insts, limit)
+        return self._expand(
+            oshelpers.to_server_paged_list(self.provider, cb_insts, limit),
+            expand)
 
     def get(self, instance_id):
         """
@@ -765,7 +767,7 @@ class OpenStackInstanceService(BaseInstanceService):
         try:
             os_instance = self.provider.nova.servers.get(instance_id)
             return OpenStackInstance(self.provider, os_instance)
-        except NovaNotFound:
+        except oshelpers.sdk_exception('novaclient.exceptions', 'NotFound'):
             log.debug("Instance %s was not found.", instance_id)
             return None
 
@@ -892,7 +894,8 @@ class OpenStackSubnetService(BaseSubnetService):
                         OpenStackInternetGateway.CB_DEFAULT_INET_GATEWAY_NAME)
             router.attach_gateway(gteway)
             return sn
-        except NeutronClientException:
+        except oshelpers.sdk_exception('neutronclient.common.exceptions',
+                                       'NeutronClientException'):
             return None
 
     def delete(self, subnet):
@@ -923,10 +926,7 @@ class OpenStackRouterService(BaseRouterService):
                                      marker=marker)
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return self._find(['name'], kwargs)
 
     def create(self, name, network):
         """
@@ -21,7 +21,8 @@ with open(os.path.join('cloudbridge', '__init__.py')) as f:
 REQS_BASE = [
     'bunch>=1.0.1',
     'six>=1.10.0',
-    'retrying>=1.3.3'
+    'retrying>=1.3.3',
+    'futures>=3.0.5; python_version<"3"'
 ]
 REQS_AWS = ['boto3']
 REQS_AZURE = ['msrest>=0.4.7',
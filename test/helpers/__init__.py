@@ -77,6 +77,16 @@ def skipIfNoService(services):
     return wrap
 
 
+def skipUnlessBenchmarks(func):
+    """
+    A decorator for skipping benchmarks unless the CB_RUN_BENCHMARKS
+    environment variable is set.
+    """
+    return unittest.skipUnless(
+        parse_bool(os.environ.get('CB_RUN_BENCHMARKS')),
+        "Skipping benchmark because CB_RUN_BENCHMARKS is not set")(func)
+
+
 TEST_DATA_CONFIG = {
     "AWSCloudProvider": {
         # Match the ami value with entry in custom_amis.json for use with moto
@@ -0,0 +1,111 @@
+import sys
+import unittest
+from test import helpers
+from test.helpers import ProviderTestBase
+
+from cloudbridge.cloud.base.resources import BaseObjectLifeCycleMixin
+from cloudbridge.cloud.interfaces import VolumeState
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
+from cloudbridge.cloud.interfaces.resources import Region
+
+try:
+    import asyncio
+    from cloudbridge.cloud.aio import AsyncCloudProvider
+    from cloudbridge.cloud.aio import AsyncResource
+    from cloudbridge.cloud.aio import StopAsyncIteration
+except ImportError:  # Python 2
+    asyncio = None
+
+
+@unittest.skipIf(asyncio is None or sys.version_info < (3, 5),
+                 "The asyncio facade requires Python 3.5 or later")
+class CloudAsyncProviderTestCase(ProviderTestBase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        super(CloudAsyncProviderTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        # The test provider is not in thread-safe mode
+        self.aprovider = AsyncCloudProvider(self.provider, max_workers=1,
+                                            loop=self.loop)
+
+    def tearDown(self):
+        self.aprovider.close()
+        self.loop.close()
+        super(CloudAsyncProviderTestCase, self).tearDown()
+
+    def _run(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def _collect(self, aiterable):
+        items = []
+        aiterator = aiterable.__aiter__()
+        while True:
+            try:
+                items.append(self._run(aiterator.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_list_and_iterate(self):
+        regions = self.provider.compute.regions.list()
+        aregions = self._run(self.aprovider.compute.regions.list())
+        self.assertListEqual(aregions, regions)
+        self.assertEqual(aregions.is_truncated, regions.is_truncated)
+        self.assertIsInstance(aregions[0].wrapped, Region)
+
+        self.assertListEqual(self._collect(self.aprovider.compute.regions),
+                             list(self.provider.compute.regions))
+        region = self._run(self.aprovider.compute.regions.get(regions[0].id))
+        self.assertEqual(region.name, regions[0].name)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_wait_till_ready(self):
+        name = "cb_asyncvol-{0}".format(helpers.get_uuid())
+        vol = self._run(self.aprovider.storage.volumes.create(
+            name, 1,
+            helpers.get_provider_test_data(self.provider, "placement")))
+
+        with helpers.cleanup_action(lambda: vol.wrapped.delete()):
+            self.assertTrue(self._run(vol.wait_till_ready()))
+            self.assertEqual(self._run(vol.aget('state')),
+                             VolumeState.AVAILABLE)
+            with self.assertRaises(WaitStateException):
+                self._run(vol.wait_for(
+                    [VolumeState.ERROR],
+                    terminal_states=[VolumeState.AVAILABLE]))
+            with self.assertRaises(WaitStateException):
+                self._run(vol.wait_for([VolumeState.ERROR], timeout=0,
+                                       interval=0))
+
+    def test_wait_till_ready_override(self):
+        class Waiter(BaseObjectLifeCycleMixin):
+            READY_STATES = ('ready',)
+
+            state = 'pending'
+
+            def refresh(self):
+                pass
+
+            def wait_till_ready(self, timeout=None, interval=None):
+                # e.g., a waiter of the provider's SDK
+                self.state = 'ready'
+                return 'waited'
+
+        resource = AsyncResource(self.aprovider, Waiter())
+        self.assertEqual(self._run(resource.wait_till_ready()), 'waited')
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_stream_object_content(self):
+        name = "cbtestasync-{0}".format(helpers.get_uuid())
+        bucket = self._run(self.aprovider.storage.buckets.create(name))
+
+        with helpers.cleanup_action(lambda: bucket.wrapped.delete()):
+            obj = self._run(bucket.objects.create("async.txt"))
+            with helpers.cleanup_action(lambda: obj.wrapped.delete()):
+                content = b"0123456789" * 1000
+                self._run(obj.upload(content))
+                self.assertListEqual(self._collect(bucket.objects), [obj])
+                chunks = self._collect(obj.iter_content(chunk_size=1024))
+                self.assertEqual(b"".join(chunks), content)
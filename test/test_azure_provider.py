@@ -0,0 +1,365 @@
+"""
+Tests of the Azure provider's use of its SDK clients, which are stubbed so
+that these run offline. They are skipped if the Azure SDK is not installed.
+"""
+import collections
+import io
+import os
+import re
+import unittest
+
+from cloudbridge.cloud.interfaces import InstanceState
+from cloudbridge.cloud.interfaces.exceptions import \
+    ProviderInternalException
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
+
+try:
+    from azure.common import AzureMissingResourceHttpError
+    from cloudbridge.cloud.providers.azure import AzureCloudProvider
+    from cloudbridge.cloud.providers.azure.azure_client import AzureClient
+    from cloudbridge.cloud.providers.azure.resources import \
+        AzureBucketObject
+except ImportError:
+    AzureCloudProvider = None
+
+RESOURCE_GROUP = 'cloudbridge'
+RESOURCE_ID = ('/subscriptions/sub/resourceGroups/' + RESOURCE_GROUP +
+               '/providers/{0}/{1}')
+
+
+class Stub(object):
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+def stub_vm(name):
+    nic_id = RESOURCE_ID.format('Microsoft.Network/networkInterfaces',
+                                name + '-nic')
+    return Stub(
+        id=RESOURCE_ID.format('Microsoft.Compute/virtualMachines', name),
+        name=name, tags={'Name': name}, provisioning_state='Succeeded',
+        instance_view=None,
+        network_profile=Stub(network_interfaces=[Stub(id=nic_id)]))
+
+
+def stub_nic(vm_name, index):
+    nic_id = RESOURCE_ID.format('Microsoft.Network/networkInterfaces',
+                                vm_name + '-nic')
+    public_ip = Stub(id=stub_public_ip(vm_name + '-ip', index).id)
+    return Stub(id=nic_id, network_security_group=None, ip_configurations=[
+        Stub(private_ip_address='10.0.0.{0}'.format(index),
+             public_ip_address=public_ip, subnet=None)])
+
+
+def stub_public_ip(name, index):
+    return Stub(id=RESOURCE_ID.format('Microsoft.Network/publicIPAddresses',
+                                      name),
+                ip_address='192.0.2.{0}'.format(index))
+
+
+def stub_instance_view():
+    return Stub(statuses=[Stub(display_status='Provisioning succeeded'),
+                          Stub(display_status='VM running')])
+
+
+class StubAzureClient(object):
+    """
+    Stands in for :class:`AzureClient`, counting the calls made to it.
+    """
+
+    def __init__(self, vms=(), copy_statuses=(), nics=(), public_ips=()):
+        self.vms = list(vms)
+        self.nics = dict((nic.id, nic) for nic in nics)
+        self.public_ips = dict((ip.id, ip) for ip in public_ips)
+        # The status of a blob copy at each successive poll
+        self.copy_statuses = list(copy_statuses)
+        self.calls = collections.Counter()
+
+    def list_vm(self, instance_views=False):
+        self.calls['list_vm'] += 1
+        for vm in self.vms:
+            vm.instance_view = stub_instance_view() if instance_views else None
+        return self.vms
+
+    def get_vm(self, vm_id):
+        self.calls['get_vm'] += 1
+        return next(vm for vm in self.vms if vm.id == vm_id)
+
+    def list_nics(self):
+        self.calls['list_nics'] += 1
+        return list(self.nics.values())
+
+    def get_nic(self, nic_id):
+        self.calls['get_nic'] += 1
+        return self.nics[nic_id]
+
+    def update_nic(self, nic_id, params):
+        self.calls['update_nic'] += 1
+        for ip_config in params.ip_configurations:
+            if isinstance(ip_config.public_ip_address, dict):
+                ip_config.public_ip_address = Stub(
+                    **ip_config.public_ip_address)
+        self.nics[nic_id] = params
+
+    def list_floating_ips(self):
+        self.calls['list_floating_ips'] += 1
+        return list(self.public_ips.values())
+
+    def get_floating_ip(self, public_ip_id):
+        self.calls['get_floating_ip'] += 1
+        return self.public_ips[public_ip_id]
+
+    def get_vm_instance_view(self, vm_id):
+        self.calls['get_vm_instance_view'] += 1
+        return stub_instance_view()
+
+    def copy_blob(self, container_name, blob_name, target_container_name,
+                  target_blob_name):
+        self.calls['copy_blob'] += 1
+
+    def get_blob(self, container_name, blob_name):
+        status = (self.copy_statuses.pop(0) if len(self.copy_statuses) > 1
+                  else self.copy_statuses[0])
+        copy = Stub(id='copy', status=status, progress='1/2',
+                    status_description=status)
+        return Stub(properties=Stub(copy=copy))
+
+    def abort_copy_blob(self, container_name, blob_name, copy_id):
+        self.calls['abort_copy_blob'] += 1
+
+    def get_blob_range(self, container_name, blob_name, start, end):
+        self.calls['get_blob_range'] += 1
+        return self.content[start:end + 1]
+
+
+class StubTableService(object):
+    """
+    Stands in for the SDK's ``TableService``, holding the public key table
+    in memory and counting the queries made of it.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.calls = collections.Counter()
+
+    def _table(self, table_name):
+        if table_name not in self.tables:
+            raise AzureMissingResourceHttpError('Table not found', 404)
+        return self.tables[table_name]
+
+    def exists(self, table_name):
+        self.calls['exists'] += 1
+        return table_name in self.tables
+
+    def create_table(self, table_name):
+        self.calls['create_table'] += 1
+        self.tables[table_name] = {}
+
+    def insert_or_replace_entity(self, table_name, entity):
+        self._table(table_name)[entity['RowKey']] = Stub(**entity)
+
+    def query_entities(self, table_name, filter, num_results=None,
+                       marker=None):
+        self.calls['query_entities'] += 1
+        field, value = re.match(r"(\w+) eq '(.*)'", filter).groups()
+        items = [entity for entity in self._table(table_name).values()
+                 if getattr(entity, field) == value][:num_results]
+        return Stub(items=items, next_marker=None)
+
+    def delete_entity(self, table_name, partition_key, row_key):
+        if self._table(table_name).pop(row_key, None) is None:
+            raise AzureMissingResourceHttpError('Entity not found', 404)
+
+
+@unittest.skipIf(AzureCloudProvider is None, "The Azure SDK is not installed")
+class AzureProviderTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        self.provider = AzureCloudProvider({
+            'azure_subscription_id': 'sub',
+            'azure_client_id': 'client-000000000000',
+            'azure_secret': 'secret',
+            'azure_tenant': 'tenant',
+            'azure_resource_group': RESOURCE_GROUP,
+            'default_wait_interval': 0})
+
+    def _stub_client(self, **kwargs):
+        client = StubAzureClient(**kwargs)
+        # pylint:disable=protected-access
+        self.provider._azure_client = client
+        return client
+
+    def test_instance_listing_includes_states(self):
+        client = self._stub_client(
+            vms=[stub_vm('vm{0}'.format(i)) for i in range(5)])
+        instances = self.provider.compute.instances.list()
+        self.assertListEqual([inst.state for inst in instances],
+                             [InstanceState.RUNNING] * 5)
+        # One listing for all instances, and no request per instance
+        self.assertEqual(client.calls['list_vm'], 1)
+        self.assertEqual(client.calls['get_vm_instance_view'], 0)
+
+    def _stub_network(self, count):
+        names = ['vm{0}'.format(i) for i in range(count)]
+        return self._stub_client(
+            vms=[stub_vm(name) for name in names],
+            nics=[stub_nic(name, i) for i, name in enumerate(names)],
+            public_ips=[stub_public_ip(name + '-ip', i)
+                        for i, name in enumerate(names)])
+
+    def test_instance_network_profiles(self):
+        client = self._stub_network(5)
+        instances = self.provider.compute.instances.list()
+        for _ in range(2):
+            self.assertListEqual(
+                [inst.public_ips for inst in instances],
+                [['192.0.2.{0}'.format(i)] for i in range(5)])
+            self.assertListEqual(
+                [inst.private_ips for inst in instances],
+                [['10.0.0.{0}'.format(i)] for i in range(5)])
+        # The NICs and public IPs of the listing are listed once, and not
+        # fetched per instance
+        self.assertEqual(client.calls['list_nics'], 1)
+        self.assertEqual(client.calls['list_floating_ips'], 1)
+        self.assertEqual(client.calls['get_nic'], 0)
+        self.assertEqual(client.calls['get_floating_ip'], 0)
+
+    def test_instance_network_invalidation(self):
+        client = self._stub_network(1)
+        inst = self.provider.compute.instances.list()[0]
+        self.assertListEqual(inst.public_ips, ['192.0.2.0'])
+
+        # A refreshed instance fetches its NIC and public IP again, once
+        inst.refresh()
+        for _ in range(2):
+            self.assertListEqual(inst.public_ips, ['192.0.2.0'])
+        self.assertEqual(client.calls['get_nic'], 1)
+        self.assertEqual(client.calls['get_floating_ip'], 1)
+
+        other_ip = stub_public_ip('other-ip', 9)
+        client.public_ips[other_ip.id] = other_ip
+        inst.add_floating_ip(other_ip.id)
+        self.assertListEqual(inst.public_ips, ['192.0.2.9'])
+        self.assertEqual(client.calls['get_nic'], 2)
+        self.assertEqual(client.calls['get_floating_ip'], 2)
+
+        fw_id = RESOURCE_ID.format('Microsoft.Network/networkSecurityGroups',
+                                   'fw')
+        self.assertListEqual(inst.vm_firewall_ids, [])
+        inst.add_vm_firewall(Stub(resource_id=fw_id))
+        self.assertListEqual(inst.vm_firewall_ids, [fw_id])
+        self.assertEqual(client.calls['update_nic'], 2)
+        self.assertEqual(client.calls['get_nic'], 3)
+
+    def test_list_vm_expands_instance_views(self):
+        class Operations(object):
+
+            def __init__(self):
+                self.calls = []
+
+            def list(self, resource_group_name, filter=None, expand=None,
+                     **kwargs):
+                self.calls.append((resource_group_name, expand))
+                return []
+
+        class LegacyOperations(Operations):
+
+            def list(self, resource_group_name, custom_headers=None,
+                     raw=False, **operation_config):
+                self.calls.append((resource_group_name, None))
+                return []
+
+        for operations, expand in [(Operations(), 'instanceView'),
+                                   (LegacyOperations(), None)]:
+            client = AzureClient({'azure_resource_group': RESOURCE_GROUP})
+            # pylint:disable=protected-access
+            client._clients.get('compute_client', lambda: Stub(
+                virtual_machines=operations))
+            client.list_vm(instance_views=True)
+            client.list_vm()
+            self.assertListEqual(operations.calls, [(RESOURCE_GROUP, expand),
+                                                    (RESOURCE_GROUP, None)])
+
+    def test_save_content_ranges(self):
+        size = 3 * 1024 * 1024
+        bucket = Stub(name='bucket')
+        obj = AzureBucketObject(self.provider, bucket, Stub(
+            name='obj', properties=Stub(content_length=size)))
+        self.provider.config['default_read_chunk_size'] = 1024
+        self.provider.config['default_download_chunk_size'] = 1024 * 1024
+        client = self._stub_client()
+        client.content = os.urandom(size)
+        target = io.BytesIO()
+        obj.save_content(target)
+        self.assertEqual(target.getvalue(), client.content)
+        # Ranges are not as small as the read buffer
+        self.assertEqual(client.calls['get_blob_range'], 3)
+
+    def test_server_side_copy(self):
+        bucket = Stub(name='bucket')
+        obj = AzureBucketObject(self.provider, bucket, Stub(name='obj'))
+        # pylint:disable=protected-access
+        self._stub_client(copy_statuses=['pending', 'success'])
+        self.assertTrue(obj._server_side_copy(bucket, 'copy'))
+
+        self._stub_client(copy_statuses=['pending', 'aborted'])
+        with self.assertRaises(ProviderInternalException):
+            obj._server_side_copy(bucket, 'copy')
+
+        # A copy that stays pending is aborted once the wait times out
+        self.provider.config['default_wait_timeout'] = 0
+        client = self._stub_client(copy_statuses=['pending'])
+        with self.assertRaises(WaitStateException):
+            obj._server_side_copy(bucket, 'copy')
+        self.assertEqual(client.calls['abort_copy_blob'], 1)
+
+    def _table_client(self):
+        client = AzureClient({'azure_resource_group': RESOURCE_GROUP,
+                              'azure_public_key_storage_table_name': 'keys'})
+        table_service = StubTableService()
+        # pylint:disable=protected-access
+        client._clients.get('table_service', lambda: table_service)
+        return client, table_service
+
+    def test_table_call_recreates_table(self):
+        client, table_service = self._table_client()
+        entity = {'PartitionKey': 'cb', 'RowKey': '1', 'Name': 'key'}
+        client.create_public_key(entity)
+        client.list_public_keys('cb')
+        # The table is checked, and created, once
+        self.assertEqual(table_service.calls['exists'], 1)
+        self.assertEqual(table_service.calls['create_table'], 1)
+
+        # A table deleted behind the client's back is recreated
+        del table_service.tables['keys']
+        self.assertListEqual(client.list_public_keys('cb')[0], [])
+        self.assertEqual(table_service.calls['create_table'], 2)
+        client.create_public_key(entity)
+        self.assertEqual(len(client.list_public_keys('cb')[0]), 1)
+
+        # A missing entity is not mistaken for a missing table
+        with self.assertRaises(AzureMissingResourceHttpError):
+            client._table_call('delete_entity', 'keys', 'cb', '2')
+        self.assertEqual(table_service.calls['create_table'], 2)
+
+    def test_public_key_cache(self):
+        client, table_service = self._table_client()
+        entity = {'PartitionKey': 'cb', 'RowKey': '1', 'Name': 'key',
+                  'Key': 'ssh-rsa old'}
+        client.create_public_key(entity)
+        self.assertEqual(client.get_public_key('key').Key, 'ssh-rsa old')
+        self.assertEqual(client.get_public_key('key').Key, 'ssh-rsa old')
+        self.assertEqual(table_service.calls['query_entities'], 1)
+
+        # Replacing a key drops the cached entity
+        client.create_public_key(dict(entity, Key='ssh-rsa new'))
+        self.assertEqual(client.get_public_key('key').Key, 'ssh-rsa new')
+        self.assertEqual(table_service.calls['query_entities'], 2)
+
+        # As does deleting it
+        client.delete_public_key(client.get_public_key('key'))
+        self.assertIsNone(client.get_public_key('key'))
+        self.assertEqual(table_service.calls['query_entities'], 3)
@@ -0,0 +1,187 @@
+"""
+Benchmarks for performance sensitive code paths. These are skipped unless
+the CB_RUN_BENCHMARKS environment variable is set, e.g.::
+
+    CB_RUN_BENCHMARKS=True nosetests -s test/test_benchmarks.py
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+import unittest
+import uuid
+from io import BytesIO
+from test import helpers
+from test.helpers import ProviderTestBase
+
+from cloudbridge.cloud.base.resources import BasePageableObjectMixin
+from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.base.resources import cached_listing
+
+
+class SyntheticObject(object):
+
+    def __init__(self, objid):
+        self.id = objid
+
+
+class SyntheticService(BasePageableObjectMixin):
+
+    def __init__(self, provider, count):
+        self._provider = provider
+        self.count = count
+
+    @cached_listing
+    def list(self, limit=None, marker=None):
+        objects = [SyntheticObject(i) for i in range(self.count)]
+        return ClientPagedResultList(self._provider, objects,
+                                     limit=limit, marker=marker)
+
+
+class SyntheticServerPagedService(BasePageableObjectMixin):
+    """
+    A server-paged listing where each page takes ``latency`` seconds to
+    fetch.
+    """
+
+    def __init__(self, provider, count, latency):
+        self._provider = provider
+        self.count = count
+        self.latency = latency
+
+    def list(self, limit=None, marker=None):
+        time.sleep(self.latency)
+        start = marker or 0
+        end = min(start + (limit or 100), self.count)
+        return ServerPagedResultList(
+            is_truncated=end < self.count, marker=end, supports_total=False,
+            data=[SyntheticObject(i) for i in range(start, end)])
+
+
+class BenchmarkTestCase(ProviderTestBase):
+
+    def _report(self, label, size, elapsed):
+        print("{0}: {1}: {2:.1f} MB/s".format(
+            self.provider.PROVIDER_ID, label,
+            size / (1024.0 * 1024.0) / max(elapsed, 1e-9)))
+
+    @helpers.skipUnlessBenchmarks
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_object_read_throughput(self):
+        name = "cbtestbenchmark-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("benchmark.bin")
+            with helpers.cleanup_action(lambda: obj.delete()):
+                size = 64 * 1024 * 1024
+                obj.upload(os.urandom(size))
+                obj = test_bucket.objects.get("benchmark.bin")
+
+                # Reading in small chunks, as save_content used to
+                start = time.time()
+                shutil.copyfileobj(obj.iter_content(chunk_size=4096),
+                                   BytesIO(), 4096)
+                self._report("4 KiB chunks", size, time.time() - start)
+
+                start = time.time()
+                obj.save_content(BytesIO())
+                self._report("save_content", size, time.time() - start)
+
+    @helpers.skipUnlessBenchmarks
+    def test_client_paging(self):
+        service = SyntheticService(self.provider, 100000)
+        start = time.time()
+        results = service.list(limit=100)
+        pages = 1
+        while results.is_truncated:
+            results = service.list(limit=100, marker=results.marker)
+            pages += 1
+        elapsed = time.time() - start
+        print("Paged through 100k objects ({0} pages) in {1:.2f}s".format(
+            pages, elapsed))
+
+    @helpers.skipUnlessBenchmarks
+    def test_page_prefetch(self):
+        service = SyntheticServerPagedService(self.provider, 20000, 0.02)
+
+        def consume():
+            start = time.time()
+            for _ in service:
+                # Time spent processing each object
+                time.sleep(0.0002)
+            return time.time() - start
+
+        self.provider.config['cb_page_prefetch'] = 0
+        try:
+            sequential = consume()
+            self.provider.config['cb_page_prefetch'] = 2
+            prefetched = consume()
+        finally:
+            del self.provider.config['cb_page_prefetch']
+        print("Iterated over 20k objects ({0} pages) in {1:.2f}s, and in "
+              "{2:.2f}s with prefetching".format(200, sequential, prefetched))
+        self.assertLess(prefetched, sequential)
+
+
+class StartupBenchmarkTestCase(unittest.TestCase):
+
+    # Budget, in seconds, for importing the factory and a single provider
+    IMPORT_TIME_BUDGET = 1.0
+    # Budget, in MB, for the memory that importing a provider adds to the
+    # peak RSS of a bare interpreter
+    IMPORT_RSS_BUDGET = 32
+
+    def _peak_rss(self, code):
+        """
+        Return the peak RSS, in MB, of a new interpreter running ``code``.
+        """
+        code += ("\nimport resource, sys\n"
+                 "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+                 "print(rss / (1024.0 if sys.platform == 'darwin' else 1))")
+        output = subprocess.check_output([sys.executable, '-c', code])
+        return float(output) / 1024.0
+
+    @helpers.skipUnlessBenchmarks
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     "-X importtime requires Python 3.7 or later")
+    def test_provider_import_time(self):
+        code = ("from cloudbridge.cloud.factory import CloudProviderFactory\n"
+                "CloudProviderFactory().get_provider_class('aws')")
+        proc = subprocess.Popen([sys.executable, '-X', 'importtime',
+                                 '-c', code], stderr=subprocess.PIPE)
+        _, err = proc.communicate()
+        self.assertEqual(proc.returncode, 0, err)
+        # Lines are "import time: <self us> | <cumulative us> | <module>",
+        # with nested imports indented below the module importing them
+        cumulative = {}
+        imported = []
+        for line in err.decode('utf-8').splitlines():
+            fields = line.split('|')
+            if len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            imported.append(fields[2].strip())
+            if not fields[2].startswith('  '):
+                cumulative[fields[2].strip()] = int(fields[1]) / 1e6
+        for name, elapsed in sorted(cumulative.items(),
+                                    key=lambda item: -item[1])[:10]:
+            print("{0}: {1:.3f}s".format(name, elapsed))
+        total = sum(cumulative.values())
+        print("Total import time: {0:.3f}s".format(total))
+        self.assertFalse([name for name in imported
+                          if name.startswith(('azure', 'novaclient',
+                                              'swiftclient'))])
+        self.assertLess(total, self.IMPORT_TIME_BUDGET)
+
+    @helpers.skipUnlessBenchmarks
+    @unittest.skipIf(sys.platform == 'win32',
+                     "The resource module is not available on Windows")
+    def test_provider_import_rss(self):
+        baseline = self._peak_rss("pass")
+        for name in ['cloudbridge.cloud.base',
+                     'cloudbridge.cloud.providers.aws']:
+            rss = self._peak_rss("import " + name) - baseline
+            print("{0}: {1:.1f} MB".format(name, rss))
+            self.assertLess(rss, self.IMPORT_RSS_BUDGET)
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 import unittest
 from test import helpers
 
@@ -124,3 +126,18 @@ class CloudFactoryTestCase(unittest.TestCase):
         factory.register_provider_class(DummyClass)
         self.assertTrue(DummyClass not in
                         factory.get_all_provider_classes(get_mock=False))
+
+    def test_get_provider_class_imports_only_requested_provider(self):
+        """
+        Getting the class of a provider should not import any other provider
+        """
+        code = ("import sys\n"
+                "from cloudbridge.cloud.factory import CloudProviderFactory\n"
+                "CloudProviderFactory().get_provider_class('aws')\n"
+                "print(' '.join(sys.modules))")
+        modules = subprocess.check_output(
+            [sys.executable, '-c', code]).decode('utf-8').split()
+        self.assertIn('cloudbridge.cloud.providers.aws.provider', modules)
+        for name in ['cloudbridge.cloud.providers.azure',
+                     'cloudbridge.cloud.providers.openstack']:
+            self.assertNotIn(name, modules)
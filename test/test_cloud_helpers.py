@@ -1,8 +1,26 @@
 import itertools
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 from test.helpers import ProviderTestBase
 
+from cloudbridge.cloud.base.cache import ClientPool
+from cloudbridge.cloud.base.cache import ClientStore
+from cloudbridge.cloud.base.cache import MetadataCache
+from cloudbridge.cloud.base.cache import TTLCache
+from cloudbridge.cloud.base.polling import AdaptivePollingStrategy
+from cloudbridge.cloud.base.polling import \
+    ExponentialBackoffPollingStrategy
+from cloudbridge.cloud.base.polling import FixedPollingStrategy
+from cloudbridge.cloud.base.resources import BasePageableObjectMixin
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import ListingIndex
 from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.base.resources import cached_listing
 
 
 class DummyResult(object):
@@ -15,6 +33,40 @@ class DummyResult(object):
         return "%s (%s)" % (self.id, self.name)
 
 
+class DummyService(BasePageableObjectMixin):
+
+    def __init__(self, provider, objects):
+        self._provider = provider
+        self.objects = objects
+        self.fetches = 0
+
+    @cached_listing
+    def list(self, limit=None, marker=None):
+        self.fetches += 1
+        return ClientPagedResultList(self._provider, self.objects,
+                                     limit=limit, marker=marker)
+
+
+class DummyServerPagedService(BasePageableObjectMixin):
+
+    def __init__(self, provider, objects, fail_at=None):
+        self._provider = provider
+        self.objects = objects
+        self.fail_at = fail_at
+        self.markers = []
+
+    def list(self, limit=1, marker=None):
+        self.markers.append(marker)
+        start = marker or 0
+        if start == self.fail_at:
+            raise ValueError("Page %s failed" % start)
+        data = self.objects[start:start + limit]
+        end = start + len(data)
+        return ServerPagedResultList(is_truncated=end < len(self.objects),
+                                     marker=end, supports_total=False,
+                                     data=data)
+
+
 class CloudHelpersTestCase(ProviderTestBase):
 
     _multiprocess_can_split_ = True
@@ -58,6 +110,60 @@ class CloudHelpersTestCase(ProviderTestBase):
         self.assertFalse(results.supports_server_paging, "Client paged result"
                          " lists should return False for server paging.")
 
+    def test_client_paged_result_list_unknown_marker(self):
+        results = ClientPagedResultList(self.provider, self.objects, 2, 99)
+        self.assertListEqual(results, [])
+        self.assertFalse(results.is_truncated)
+
+    def test_cached_listing(self):
+        service = DummyService(self.provider, self.objects)
+        results = service.list(limit=1)
+        pages = [list(results)]
+        while results.is_truncated:
+            results = service.list(limit=1, marker=results.marker)
+            pages.append(list(results))
+        self.assertListEqual(pages, [[obj] for obj in self.objects])
+        # Subsequent pages are served from the first listing
+        self.assertEqual(service.fetches, 1)
+        # Listings are refreshed for each first page
+        service.list(limit=1)
+        self.assertEqual(service.fetches, 2)
+
+    def test_listing_index(self):
+        objects = self.objects + [DummyResult(5, "T*")]
+        index = ListingIndex(objects)
+        self.assertListEqual(index.find(id=2), [objects[1]])
+        self.assertListEqual(index.find(name="Two", id=3), [])
+        # Names are matched exactly unless globs are enabled
+        self.assertListEqual(index.find(name="T*"), [objects[4]])
+        self.assertListEqual(index.find(globs=True, name="T*"),
+                             [objects[1], objects[2], objects[4]])
+        self.assertListEqual(index.find(globs=True, name="?o*"),
+                             [objects[3]])
+        self.assertListEqual(index.find(), objects)
+
+    def test_indexed_find(self):
+        service = DummyService(self.provider, self.objects)
+        self.assertListEqual(service._find(['name'], {'name': 'Three'}),
+                             [self.objects[2]])
+        # Empty filters are ignored
+        self.assertListEqual(service._find(['name'], {'name': None}).data,
+                             self.objects)
+        self.assertListEqual(
+            service._find(['name'], {'name': 'T*', 'glob': True}).data,
+            [self.objects[1], self.objects[2]])
+        with self.assertRaises(TypeError):
+            service._find(['name'], {'id': 1})
+
+        service.CACHE_FIND_INDEX = True
+        service._find(['name'], {'name': 'One'})
+        fetches = service.fetches
+        service._find(['name'], {'name': 'Two'})
+        self.assertEqual(service.fetches, fetches)
+        service._invalidate_listings()
+        service._find(['name'], {'name': 'Two'})
+        self.assertEqual(service.fetches, fetches + 1)
+
     def test_server_paged_result_list(self):
 
         objects = list(itertools.islice(self.objects, 2))
@@ -74,3 +180,213 @@ class CloudHelpersTestCase(ProviderTestBase):
                         " lists should return True for server paging.")
         with self.assertRaises(NotImplementedError):
             results.data
+
+    def test_page_prefetch(self):
+        objects = [DummyResult(i, str(i)) for i in range(10)]
+        service = DummyServerPagedService(self.provider, objects)
+        self.provider.config['cb_page_prefetch'] = 2
+        try:
+            self.assertListEqual(list(service), objects)
+            self.assertListEqual(service.markers, [None] + list(range(1, 10)))
+
+            # Fetching stays at most 2 pages ahead of the page being consumed
+            service.markers = []
+            results = iter(service)
+            next(results)
+            deadline = time.time() + 30
+            while len(service.markers) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            self.assertListEqual(service.markers, [None, 1, 2])
+            results.close()
+
+            # Errors are raised to the consumer
+            service = DummyServerPagedService(self.provider, objects,
+                                              fail_at=5)
+            with self.assertRaises(ValueError):
+                list(service)
+        finally:
+            del self.provider.config['cb_page_prefetch']
+
+    def test_page_prefetch_abandoned(self):
+        """
+        A prefetching iterator that is never finished should not keep the
+        interpreter from exiting.
+        """
+        code = (
+            "from cloudbridge.cloud.base.provider import BaseConfiguration\n"
+            "from cloudbridge.cloud.base.resources import "
+            "BasePageableObjectMixin, ServerPagedResultList\n"
+            "class Provider(object):\n"
+            "    config = BaseConfiguration({'cb_page_prefetch': 2})\n"
+            "class Service(BasePageableObjectMixin):\n"
+            "    _provider = Provider()\n"
+            "    def list(self, limit=1, marker=None):\n"
+            "        start = marker or 0\n"
+            "        return ServerPagedResultList(True, start + 1, False,\n"
+            "                                     data=[start])\n"
+            "results = iter(Service())\n"
+            "next(results)\n")
+        proc = subprocess.Popen([sys.executable, '-c', code])
+        deadline = time.time() + 30
+        while proc.poll() is None and time.time() < deadline:
+            time.sleep(0.1)
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+            self.fail("The interpreter hung at exit on an abandoned iterator")
+        self.assertEqual(proc.returncode, 0)
+
+    def test_ttl_cache(self):
+        cache = TTLCache(ttl=60)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIn('a', cache)
+        cache.set('b', 2, ttl=-1)
+        self.assertIsNone(cache.get('b'))
+        self.assertNotIn('b', cache)
+        cache.invalidate('a')
+        self.assertIsNone(cache.get('a'))
+
+    def test_client_pool(self):
+        created = []
+
+        def factory(key):
+            created.append(key)
+            return object()
+
+        pool = ClientPool(factory, idle_timeout=60)
+        self.assertIs(pool.get('east'), pool.get('east'))
+        pool.get('west')
+        self.assertListEqual(created, ['east', 'west'])
+        # Idle clients are dropped and created again on demand
+        pool.idle_timeout = -1
+        pool.get('east')
+        self.assertEqual(len(pool), 1)
+        self.assertListEqual(created, ['east', 'west', 'east'])
+
+    def test_client_pool_creates_clients_in_parallel(self):
+        lock = threading.Lock()
+        creating = []
+        overlaps = []
+
+        def factory(key):
+            with lock:
+                creating.append(key)
+                overlaps.append(len(creating))
+            time.sleep(0.1)
+            with lock:
+                creating.remove(key)
+            return object()
+
+        pool = ClientPool(factory)
+        results = []
+        threads = [threading.Thread(target=lambda k=key: results.append(
+            (k, pool.get(k)))) for key in ['east', 'west', 'east', 'west']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Each client is created once, while other keys are not held up
+        self.assertEqual(len(overlaps), 2)
+        self.assertEqual(max(overlaps), 2)
+        self.assertEqual(len(set(id(client) for _, client in results)), 2)
+        self.assertEqual(len(pool), 2)
+
+    def test_client_store(self):
+        def clients_of(store):
+            # A client that requires another one, e.g., a session
+            return (store.get('client', lambda: (
+                object(), store.get('session', object))))
+
+        shared = ClientStore()
+        per_thread = ClientStore(per_thread=True)
+        results = []
+
+        def worker():
+            results.append((clients_of(shared), clients_of(per_thread)))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        worker()
+        self.assertEqual(len(set(id(r[0]) for r in results)), 1)
+        self.assertEqual(len(set(id(r[1]) for r in results)), 5)
+        # Each thread reuses its own clients
+        self.assertIs(clients_of(per_thread), results[-1][1])
+        per_thread.clear()
+        self.assertIsNot(clients_of(per_thread), results[-1][1])
+
+    def test_deferred_imports(self):
+        """
+        Importing the base classes and a provider should not load the SDKs
+        that are only needed once a client or helper is used.
+        """
+        code = ("import sys\n"
+                "import cloudbridge.cloud.providers.aws\n"
+                "print(' '.join(sys.modules))")
+        modules = subprocess.check_output(
+            [sys.executable, '-c', code]).decode('utf-8').split()
+        for name in ['cryptography', 'moto', 'boto3.session']:
+            self.assertNotIn(name, modules)
+
+        # The other providers are skipped if their SDKs are not installed
+        for provider, sdks in [
+                ('openstack', ['openstack.connection', 'novaclient.client',
+                               'cinderclient.client', 'neutronclient',
+                               'swiftclient', 'keystoneclient']),
+                ('azure', ['azure.mgmt', 'azure.storage'])]:
+            code = ("import sys\n"
+                    "try:\n"
+                    "    import cloudbridge.cloud.providers.{0}.provider\n"
+                    "except ImportError:\n"
+                    "    sys.exit()\n"
+                    "print(' '.join(sys.modules))").format(provider)
+            modules = subprocess.check_output(
+                [sys.executable, '-c', code]).decode('utf-8').split()
+            for name in sdks:
+                self.assertFalse(
+                    [module for module in modules
+                     if module == name or module.startswith(name + '.')],
+                    "Importing the {0} provider loaded {1}".format(
+                        provider, name))
+
+    def test_metadata_cache_uses_disk_copy(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        url = 'http://example.invalid/metadata.json'
+        data_path, meta_path = MetadataCache._paths(url, cache_dir)
+        with open(data_path, 'w') as f:
+            json.dump([{'instance_type': 't2.nano'}], f)
+        with open(meta_path, 'w') as f:
+            json.dump({'fetched': time.time(), 'etag': '"abc"'}, f)
+
+        cache = MetadataCache()
+        # The on-disk copy is fresh so the (unresolvable) URL is never hit
+        data = cache.get_json(url, ttl=60, cache_dir=cache_dir)
+        self.assertEqual(data, [{'instance_type': 't2.nano'}])
+        # Subsequent calls are served from memory
+        shutil.rmtree(cache_dir)
+        self.assertIs(cache.get_json(url, ttl=60, cache_dir=cache_dir), data)
+
+    def test_polling_strategies(self):
+        fixed = FixedPollingStrategy()
+        self.assertListEqual(
+            list(itertools.islice(fixed.intervals('Dummy', 5), 3)),
+            [5, 5, 5])
+
+        backoff = ExponentialBackoffPollingStrategy(max_interval=8)
+        delays = list(itertools.islice(backoff.intervals('Dummy', 1), 10))
+        for attempt, delay in enumerate(delays):
+            self.assertTrue(0 <= delay <= min(8, 2 ** attempt))
+
+        adaptive = AdaptivePollingStrategy()
+        adaptive.record('Dummy', 4, 100, True)
+        # Failed waits do not affect the learned schedule
+        adaptive.record('Dummy', 4, 1000, False)
+        self.assertEqual(adaptive.expected_duration('Dummy'), 100)
+        self.assertEqual(next(adaptive.intervals('Dummy', 5)), 80)
+        self.assertDictEqual(adaptive.stats['Dummy'],
+                             {'waits': 2, 'polls': 8, 'last_polls': 4})
@@ -150,6 +150,20 @@ class CloudComputeServiceTestCase(ProviderTestBase):
             self.assertEqual(len(find_zone), 1,
                              "Instance's placement zone could not be "
                              " found in zones list")
+            self.assertEqual(test_instance.subnet_id, subnet.id)
+            self.assertEqual(test_instance.subnet, subnet)
+
+            # Related objects prefetched by list() match the lazy ones
+            expanded = [inst for inst in self.provider.compute.instances.list(
+                limit=200, expand=['vm_firewalls', 'vm_type', 'subnet'])
+                if inst.id == test_instance.id]
+            self.assertEqual(len(expanded), 1,
+                             "Instance not found in the expanded listing")
+            self.assertListEqual(expanded[0].vm_firewalls, [fw])
+            self.assertEqual(expanded[0].vm_type, vm_type)
+            self.assertEqual(expanded[0].subnet, subnet)
+            with self.assertRaises(ValueError):
+                self.provider.compute.instances.list(expand=['image'])
 
     @helpers.skipIfNoService(['compute.instances', 'compute.images',
                               'compute.vm_types'])
@@ -40,3 +40,64 @@ class CloudObjectLifeCycleTestCase(ProviderTestBase):
             # Hitting the timeout should raise an exception
             with self.assertRaises(WaitStateException):
                 test_vol.wait_for([VolumeState.ERROR], timeout=0, interval=0)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_wait_for_all(self):
+        """
+        Test waiting on several objects at once by using volumes.
+        """
+        name = "cb_waitforall-{0}".format(helpers.get_uuid())
+        test_vols = [self.provider.storage.volumes.create(
+            "{0}-{1}".format(name, i), 1,
+            helpers.get_provider_test_data(self.provider, "placement"))
+            for i in range(2)]
+
+        def cleanup_vols():
+            for vol in test_vols:
+                vol.delete()
+
+        with helpers.cleanup_action(cleanup_vols):
+            result = self.provider.wait_for_all(
+                test_vols, [VolumeState.AVAILABLE],
+                terminal_states=[VolumeState.ERROR])
+            self.assertListEqual(result.ready, test_vols)
+            self.assertListEqual(result.terminal, [])
+            self.assertListEqual(result.timed_out, [])
+
+            # Objects in a terminal state are reported, not raised
+            result = self.provider.wait_for_all(
+                test_vols, [VolumeState.ERROR],
+                terminal_states=[VolumeState.AVAILABLE])
+            self.assertListEqual(result.terminal, test_vols)
+
+            # Objects that do not reach a target state in time are reported
+            result = self.provider.wait_for_all(
+                test_vols, [VolumeState.ERROR], timeout=0, interval=0)
+            self.assertListEqual(result.timed_out, test_vols)
+
+    def test_wait_for_all_timeouts(self):
+        """
+        Test that each object is waited for until its own timeout.
+        """
+        class Resource(object):
+
+            def __init__(self, ready_after):
+                self.ready_after = ready_after
+                self.refreshes = 0
+
+            @property
+            def state(self):
+                return ('ready' if self.refreshes >= self.ready_after
+                        else 'pending')
+
+            def refresh(self):
+                self.refreshes += 1
+
+        never, soon = Resource(float('inf')), Resource(2)
+        result = self.provider.wait_for_all(
+            [never, soon], ['ready'], timeout=[0, 60], interval=0)
+        self.assertListEqual(result.ready, [soon])
+        self.assertListEqual(result.timed_out, [never])
+        # Once timed out, an object is no longer polled
+        self.assertEqual(never.refreshes, 0)
+        self.assertEqual(soon.refreshes, 2)
@@ -1,5 +1,6 @@
 import filecmp
 import os
+import shutil
 import tempfile
 import uuid
 from datetime import datetime
@@ -9,8 +10,10 @@ from test.helpers import ProviderTestBase
 from test.helpers import standard_interface_tests as sit
 from unittest import skip
 
+from cloudbridge.cloud.base.sync import sync
 from cloudbridge.cloud.factory import ProviderList
 from cloudbridge.cloud.interfaces.exceptions import InvalidNameException
+from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 from cloudbridge.cloud.interfaces.provider import TestMockHelperMixin
 from cloudbridge.cloud.interfaces.resources import Bucket
 from cloudbridge.cloud.interfaces.resources import BucketObject
@@ -133,6 +136,13 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                     'with and without a prefix, are expected to be equal, '
                     'but its detected otherwise.')
 
+                iter_objs = list(test_bucket.objects.iter_objects(
+                    prefix=obj_name_prefix))
+                self.assertListEqual(iter_objs, [obj])
+                self.assertListEqual(
+                    list(test_bucket.objects.iter_objects(prefix="nomatch")),
+                    [])
+
             sit.check_delete(self, test_bucket.objects, obj)
 
     @helpers.skipIfNoService(['storage.buckets'])
@@ -230,3 +240,214 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                             self.assertTrue(
                                 filecmp.cmp(six_gig_file, download_file),
                                 "Uploaded file != downloaded")
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_upload_stream_multipart(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj_name = "hello_upload_stream.bin"
+            obj = test_bucket.objects.create(obj_name)
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                # S3 requires all but the last part to be at least 5MB
+                part_size = 5 * 1024 * 1024
+                content = os.urandom(part_size * 2 + 1024)
+                self.assertTrue(obj.upload_stream(
+                    BytesIO(content), part_size=part_size, concurrency=2))
+                target_stream = BytesIO()
+                test_bucket.objects.get(obj_name).save_content(target_stream)
+                self.assertEqual(target_stream.getvalue(), content)
+
+                if self.provider.PROVIDER_ID == ProviderList.AWS:
+                    # Parts are checked against S3's minimum size upfront
+                    with self.assertRaises(InvalidValueException):
+                        obj.upload_stream(BytesIO(content), part_size=1024)
+
+                # Objects smaller than a part are uploaded in one go
+                obj.upload_stream(BytesIO(b"Hello World"))
+                target_stream = BytesIO()
+                test_bucket.objects.get(obj_name).save_content(target_stream)
+                self.assertEqual(target_stream.getvalue(), b"Hello World")
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_download_to(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj_name = "hello_download_to.bin"
+            obj = test_bucket.objects.create(obj_name)
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                content = os.urandom(100 * 1024 + 17)
+                obj.upload(content)
+                obj = test_bucket.objects.get(obj_name)
+
+                target_stream = BytesIO()
+                self.assertTrue(obj.download_to(
+                    target_stream, concurrency=3, chunk_size=16 * 1024))
+                self.assertEqual(target_stream.getvalue(), content)
+
+                fd, path = tempfile.mkstemp()
+                os.close(fd)
+                with helpers.cleanup_action(lambda: os.remove(path)):
+                    self.assertTrue(obj.download_to(
+                        path, concurrency=3, chunk_size=16 * 1024))
+                    with open(path, 'rb') as f:
+                        self.assertEqual(f.read(), content)
+                    self.assertFalse(os.path.exists(path + '.cbpart'))
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_list_prefixes(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj_names = ["a.txt", "logs/1.txt", "logs/2017/2.txt"]
+            objs = [test_bucket.objects.create(obj_name)
+                    for obj_name in obj_names]
+
+            def cleanup_objs():
+                for obj in objs:
+                    obj.delete()
+
+            with helpers.cleanup_action(cleanup_objs):
+                for obj in objs:
+                    obj.upload("dummy content")
+
+                listing = test_bucket.objects.list_prefixes()
+                self.assertListEqual(listing.prefixes, ["logs/"])
+                self.assertListEqual([o.name for o in listing.objects],
+                                     ["a.txt"])
+
+                listing = test_bucket.objects.list_prefixes(prefix="logs/")
+                self.assertListEqual(listing.prefixes, ["logs/2017/"])
+                self.assertListEqual([o.name for o in listing.objects],
+                                     ["logs/1.txt"])
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_iter_objects(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(
+                lambda: test_bucket.delete(delete_contents=True)):
+            names = ["logs/{0}.txt".format(i) for i in range(3)]
+            for obj_name in names + ["other.txt"]:
+                test_bucket.objects.create(obj_name).upload("dummy content")
+
+            container = test_bucket.objects
+            list_objects = container.list
+            limits = []
+
+            def list_counted(*args, **kwargs):
+                limits.append(kwargs.get('limit'))
+                return list_objects(*args, **kwargs)
+
+            container.list = list_counted
+            self.assertListEqual(
+                sorted(o.name for o in container.iter_objects(prefix="logs/")),
+                names)
+            # Pages are as large as the provider allows, rather than of
+            # default_result_limit (1 in tests) objects
+            if container.ITER_PAGE_SIZE:
+                self.assertListEqual(limits, [container.ITER_PAGE_SIZE])
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_delete_many(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(
+                lambda: test_bucket.delete(delete_contents=True)):
+            for i in range(5):
+                test_bucket.objects.create(
+                    "logs/{0}.txt".format(i)).upload("dummy content")
+            keep = test_bucket.objects.create("keep.txt")
+            keep.upload("dummy content")
+            other = test_bucket.objects.create("other.txt")
+            other.upload("dummy content")
+
+            self.assertDictEqual(test_bucket.objects.delete_many("logs/"), {})
+            self.assertListEqual(
+                sorted(o.name for o in test_bucket.objects),
+                ["keep.txt", "other.txt"])
+
+            self.assertDictEqual(
+                test_bucket.objects.delete_many(["other.txt"]), {})
+            self.assertListEqual(list(test_bucket.objects), [keep])
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_copy_to(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(
+                lambda: test_bucket.delete(delete_contents=True)):
+            content = os.urandom(64 * 1024)
+            obj = test_bucket.objects.create("original.bin")
+            obj.upload(content)
+            obj = test_bucket.objects.get("original.bin")
+
+            obj_copy = obj.copy_to(test_bucket, "copy.bin")
+            self.assertEqual(obj_copy.name, "copy.bin")
+            target_stream = BytesIO()
+            obj_copy.save_content(target_stream)
+            self.assertEqual(target_stream.getvalue(), content)
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_copy_to_other_provider(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(
+                lambda: test_bucket.delete(delete_contents=True)):
+            content = os.urandom(64 * 1024)
+            obj = test_bucket.objects.create("original.bin")
+            obj.upload(content)
+            obj = test_bucket.objects.get("original.bin")
+
+            # Objects are only copied on the server within a provider, so
+            # the content is streamed to a bucket of another one
+            other_bucket = self.create_provider_instance().storage.buckets \
+                .get(name)
+            obj_copy = obj.copy_to(other_bucket, "copy.bin")
+            self.assertEqual(obj_copy.name, "copy.bin")
+            target_stream = BytesIO()
+            obj_copy.save_content(target_stream)
+            self.assertEqual(target_stream.getvalue(), content)
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_sync(self):
+        name = "cbtestbucketobjs-{0}".format(uuid.uuid4())
+        test_bucket = self.provider.storage.buckets.create(name)
+        local_dir = tempfile.mkdtemp()
+
+        def cleanup():
+            shutil.rmtree(local_dir)
+            test_bucket.delete(delete_contents=True)
+
+        with helpers.cleanup_action(cleanup):
+            os.mkdir(os.path.join(local_dir, "sub"))
+            for file_name in ["a.txt", "b.txt", os.path.join("sub", "c.txt")]:
+                with open(os.path.join(local_dir, file_name), 'w') as f:
+                    f.write(file_name)
+            test_bucket.objects.create("site/stale.txt").upload("stale")
+
+            result = sync(local_dir, test_bucket, prefix="site/",
+                          delete=True)
+            self.assertListEqual(
+                sorted(result.transferred),
+                ["site/a.txt", "site/b.txt", "site/sub/c.txt"])
+            self.assertListEqual(result.deleted, ["site/stale.txt"])
+            self.assertDictEqual(result.failed, {})
+
+            # Only changes are transferred on subsequent runs
+            with open(os.path.join(local_dir, "a.txt"), 'w') as f:
+                f.write("changed")
+            result = sync(local_dir, test_bucket, prefix="site/")
+            self.assertListEqual(result.transferred, ["site/a.txt"])
+            self.assertListEqual(sorted(result.skipped),
+                                 ["site/b.txt", "site/sub/c.txt"])
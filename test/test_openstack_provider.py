@@ -0,0 +1,200 @@
+"""
+Tests of the OpenStack provider's Keystone caches and object uploads, with
+stubbed auth plugins and clients so that these run offline. The Keystone
+tests are skipped if the OpenStack SDKs are not installed.
+"""
+import collections
+import os
+import shutil
+import tempfile
+import unittest
+
+from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
+from cloudbridge.cloud.providers.openstack.resources import \
+    OpenStackBucketObject
+from cloudbridge.cloud.providers.openstack.resources import \
+    OpenStackInstance
+
+try:
+    import keystoneauth1  # noqa
+    from keystoneclient import client as keystone_client
+    from cloudbridge.cloud.providers.openstack import keystone_cache
+except ImportError:
+    keystone_cache = None
+
+
+class Stub(object):
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+class StubProvider(object):
+    """
+    Stands in for the OpenStack provider's Neutron clients, counting the
+    requests made through them.
+    """
+
+    def __init__(self, ports, firewall_ids):
+        self.ports = ports
+        self.firewall_ids = firewall_ids
+        self.calls = collections.Counter()
+        self.neutron = Stub(list_ports=self.list_ports)
+        self.os_conn = Stub(network=Stub(
+            security_groups=self.security_groups))
+
+    def list_ports(self, device_id=None):
+        self.calls['list_ports'] += 1
+        # Neutron takes a single id, or a list of them
+        device_ids = device_id if isinstance(device_id, list) else [device_id]
+        return {'ports': [port for port in self.ports
+                          if port['device_id'] in device_ids]}
+
+    def security_groups(self, id=None):
+        self.calls['security_groups'] += 1
+        return [Stub(id=fw_id) for fw_id in self.firewall_ids
+                if fw_id in id]
+
+
+class StubAuth(object):
+    """
+    Stands in for a Keystone auth plugin, issuing a new token whenever it
+    has none.
+    """
+
+    def __init__(self):
+        self.state = None
+        self.authentications = 0
+
+    def set_auth_state(self, state):
+        self.state = state
+
+    def get_auth_state(self):
+        return self.state
+
+    def get_headers(self, session, **kwargs):
+        if self.state is None:
+            self.authentications += 1
+            self.state = 'token-{0}'.format(self.authentications)
+        return {'X-Auth-Token': self.state}
+
+
+@unittest.skipIf(keystone_cache is None, "The OpenStack SDK is not installed")
+class KeystoneCacheTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        keystone_cache.clear()
+        self.addCleanup(keystone_cache.clear)
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.credentials = ('http://keystone.invalid/v3', 'user', 'secret',
+                            'project')
+        self.key = keystone_cache.session_key(*self.credentials)
+
+    def _token_store(self, password='secret'):
+        auth_url, username, _, project_name = self.credentials
+        return keystone_cache.TokenStore(self.cache_dir, auth_url, username,
+                                         password, project_name)
+
+    def test_token_store(self):
+        store = self._token_store()
+        self.assertIsNone(store.load())
+        store.save('auth-state')
+        self.assertEqual(store.load(), 'auth-state')
+        # The token is encrypted with the password
+        with open(store.path, 'rb') as f:
+            self.assertNotIn(b'auth-state', f.read())
+        # The file name does not depend on the password, and nothing but
+        # the encrypted token reveals it
+        wrong = self._token_store('wrong')
+        self.assertEqual(wrong.path, store.path)
+        self.assertIsNone(wrong.load())
+        self.assertNotIn(self.key[2], store.path)
+
+        with open(store.path, 'wb') as f:
+            f.write(os.urandom(64))
+        self.assertIsNone(store.load())
+
+    def test_get_session(self):
+        auths = []
+
+        def make_auth():
+            auths.append(StubAuth())
+            return auths[-1]
+
+        sess = keystone_cache.get_session(self.key, make_auth)
+        self.assertIs(keystone_cache.get_session(self.key, make_auth), sess)
+        self.assertEqual(len(auths), 1)
+        other_key = keystone_cache.session_key(
+            'http://keystone.invalid/v3', 'user', 'secret', 'other')
+        self.assertIsNot(keystone_cache.get_session(other_key, make_auth),
+                         sess)
+        self.assertEqual(len(auths), 2)
+
+    def test_get_session_reuses_stored_token(self):
+        store = self._token_store()
+        auth = StubAuth()
+        keystone_cache.get_session(self.key, lambda: auth, store)
+        self.assertEqual(auth.authentications, 1)
+        self.assertEqual(store.load(), 'token-1')
+
+        # Another process starts from the stored token
+        keystone_cache.clear()
+        auth = StubAuth()
+        sess = keystone_cache.get_session(self.key, lambda: auth, store)
+        self.assertEqual(sess.get_token(), 'token-1')
+        self.assertEqual(auth.authentications, 0)
+
+    def test_keystone_version(self):
+        discoveries = []
+
+        def discover(auth_url):
+            discoveries.append(auth_url)
+            return type('Client', (object,), {'version': 'v3'})()
+
+        original = keystone_client.Client
+        keystone_client.Client = discover
+        self.addCleanup(setattr, keystone_client, 'Client', original)
+        url = 'http://keystone.invalid/v3'
+        self.assertEqual(keystone_cache.keystone_version(url), 3)
+        self.assertEqual(keystone_cache.keystone_version(url), 3)
+        self.assertListEqual(discoveries, [url])
+
+
+class OpenStackBucketObjectTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_upload_part_limit(self):
+        obj = OpenStackBucketObject(None, None, {'name': 'obj'})
+        upload = {'container': 'bucket_segments', 'prefix': 'obj/slo/0/'}
+        # pylint:disable=protected-access
+        with self.assertRaises(InvalidValueException):
+            obj._upload_part(upload, obj.MAX_UPLOAD_PARTS + 1, b'data')
+
+
+class OpenStackInstanceTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_vm_firewalls(self):
+        provider = StubProvider(
+            ports=[{'device_id': 'vm', 'security_groups': ['fw2', 'fw1']},
+                   {'device_id': 'vm', 'security_groups': ['fw1']}],
+            firewall_ids=['fw1', 'fw2', 'fw3'])
+        inst = OpenStackInstance(provider, Stub(id='vm'))
+        self.assertListEqual(inst.vm_firewall_ids, ['fw2', 'fw1'])
+        firewalls = inst.vm_firewalls
+        self.assertListEqual([fw.id for fw in firewalls], ['fw2', 'fw1'])
+        # The ports are listed once, and the firewalls in a single request
+        self.assertEqual(provider.calls['list_ports'], 1)
+        self.assertEqual(provider.calls['security_groups'], 1)
+
+        # An expanded listing agrees
+        expanded = OpenStackInstance(provider, Stub(id='vm'))
+        # pylint:disable=protected-access
+        OpenStackInstance._expand_many(provider, [expanded], ['vm_firewalls'])
+        self.assertListEqual([fw.id for fw in expanded.vm_firewalls],
+                             [fw.id for fw in firewalls])
@@ -67,3 +67,24 @@ class CloudRegionServiceTestCase(ProviderTestBase):
                     zone_find_count += 1
         # zone info cannot be repeated between regions
         self.assertEqual(zone_find_count, 1)
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_list_regions_with_zones(self):
+        """
+        Zones fetched along with a region listing should match those of the
+        region
+        """
+        current_id = self.provider.compute.regions.current.id
+        regions = self.provider.compute.regions.list(include_zones=True)
+        current = [region for region in regions if region.id == current_id]
+        while not current and regions.is_truncated:
+            regions = self.provider.compute.regions.list(
+                include_zones=True, marker=regions.marker)
+            current = [region for region in regions
+                       if region.id == current_id]
+        self.assertEqual(len(current), 1,
+                         "Current region %s not listed" % current_id)
+        self.assertListEqual(
+            sorted(zone.id for zone in current[0].zones),
+            sorted(zone.id for zone in
+                   self.provider.compute.regions.current.zones))